@@ -0,0 +1,203 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""In-process ICMP echo prober.
+
+Echo requests to many IPv4 targets are sent from one socket and the
+replies are matched by identifier and sequence number, so a check does
+not need to fork a ping process.
+"""
+
+import random
+import socket
+import struct
+import threading
+import time
+
+from oslo_log import log as logging
+
+from tacker._i18n import _
+from tacker.common import exceptions
+
+
+LOG = logging.getLogger(__name__)
+
+ICMP_ECHO_REPLY = 0
+ICMP_ECHO_REQUEST = 8
+_HEADER = struct.Struct('!BBHHH')
+_PAYLOAD = b'tacker-icmp-probe'.ljust(32, b'\0')
+
+
+class IcmpUnavailable(exceptions.TackerException):
+    message = _("ICMP socket is unavailable: %(reason)s")
+
+
+def _checksum(data):
+    if len(data) % 2:
+        data += b'\0'
+    total = sum(struct.unpack('!%dH' % (len(data) // 2), data))
+    total = (total >> 16) + (total & 0xffff)
+    total += total >> 16
+    return ~total & 0xffff
+
+
+def _echo_request(ident, seq):
+    header = _HEADER.pack(ICMP_ECHO_REQUEST, 0, 0, ident, seq)
+    checksum = _checksum(header + _PAYLOAD)
+    return _HEADER.pack(ICMP_ECHO_REQUEST, 0, checksum, ident,
+                        seq) + _PAYLOAD
+
+
+def _open_socket():
+    """Open an ICMP socket, returning (socket, is_raw).
+
+    Unprivileged ICMP datagram sockets (net.ipv4.ping_group_range) are
+    preferred, raw sockets need CAP_NET_RAW.
+    """
+    error = None
+    for sock_type in (socket.SOCK_DGRAM, socket.SOCK_RAW):
+        try:
+            sock = socket.socket(socket.AF_INET, sock_type,
+                                 socket.IPPROTO_ICMP)
+            return sock, sock_type == socket.SOCK_RAW
+        except (socket.error, OSError) as e:
+            error = e
+    raise IcmpUnavailable(reason=error)
+
+
+class _EchoSession(object):
+
+    def __init__(self, sock, raw, targets):
+        self._sock = sock
+        self._raw = raw
+        # the kernel rewrites the identifier of datagram ICMP sockets,
+        # it is only used to filter replies on raw sockets
+        self._ident = random.randint(0, 0xffff)
+        self._sent = {}     # (target, seq) => send time
+        self.rtts = dict((target, None) for target in targets)
+
+    def _pending(self):
+        return [target for target, rtt in self.rtts.items() if rtt is None]
+
+    def send(self, seq):
+        packet = _echo_request(self._ident, seq)
+        for target in self._pending():
+            try:
+                self._sock.sendto(packet, (target, 0))
+                self._sent[(target, seq)] = time.time()
+            except (socket.error, OSError) as e:
+                LOG.debug('Cannot send echo request to %(target)s: %(e)s',
+                          {'target': target, 'e': e})
+
+    def _parse(self, data):
+        if self._raw:
+            data = data[(struct.unpack('!B', data[:1])[0] & 0x0f) * 4:]
+        if len(data) < _HEADER.size:
+            return None
+        icmp_type, _code, _csum, ident, seq = _HEADER.unpack(
+            data[:_HEADER.size])
+        if icmp_type != ICMP_ECHO_REPLY:
+            return None
+        if self._raw and ident != self._ident:
+            return None
+        return seq
+
+    def receive(self, deadline):
+        while self._pending():
+            now = time.time()
+            if now >= deadline:
+                return
+            self._sock.settimeout(deadline - now)
+            try:
+                data, addr = self._sock.recvfrom(1024)
+            except socket.timeout:
+                return
+            seq = self._parse(data)
+            sent_at = self._sent.pop((addr[0], seq), None)
+            if sent_at is not None and self.rtts.get(addr[0]) is None:
+                self.rtts[addr[0]] = time.time() - sent_at
+
+
+def ping(targets, count=1, timeout=1, interval=0):
+    """Ping IPv4 targets in one pass.
+
+    Up to `count` echo requests are sent to every target, `interval`
+    seconds apart, and replies are awaited for `timeout` seconds after the
+    last one. Targets that answered are not sent further requests.
+
+    :param targets: list of IPv4 addresses
+    :return: dict of target => round trip time in seconds, or None if the
+        target did not reply.
+    :raises IcmpUnavailable: if no ICMP socket may be opened
+    """
+    sock, raw = _open_socket()
+    try:
+        session = _EchoSession(sock, raw, targets)
+        for seq in range(1, int(count) + 1):
+            if seq > 1:
+                session.receive(time.time() + float(interval))
+            session.send(seq)
+        session.receive(time.time() + float(timeout))
+        return session.rtts
+    finally:
+        sock.close()
+
+
+class _Request(object):
+
+    def __init__(self, target):
+        self.target = target
+        self.rtt = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class BatchPinger(object):
+    """Coalesces concurrent single target pings into batched passes.
+
+    The first caller waits `window` seconds for other callers using the
+    same parameters, then pings all of their targets with one socket.
+    """
+
+    def __init__(self, window=0.05):
+        self._window = window
+        self._lock = threading.Lock()
+        self._batches = {}   # (count, timeout, interval) => [_Request]
+
+    def ping(self, target, count=1, timeout=1, interval=0):
+        """Ping one target, returning its round trip time or None."""
+        key = (int(count), float(timeout), float(interval))
+        request = _Request(target)
+        with self._lock:
+            batch = self._batches.setdefault(key, [])
+            batch.append(request)
+            leader = len(batch) == 1
+
+        if leader:
+            time.sleep(self._window)
+            with self._lock:
+                batch = self._batches.pop(key)
+            try:
+                rtts = ping(set(r.target for r in batch), *key)
+                for r in batch:
+                    r.rtt = rtts[r.target]
+            except Exception as e:
+                for r in batch:
+                    r.error = e
+            finally:
+                for r in batch:
+                    r.done.set()
+
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.rtt
@@ -0,0 +1,44 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import webob
+import webob.dec
+
+from tacker.common import metrics
+from tacker import policy
+from tacker import wsgi
+
+
+class Metrics(object):
+    """Exports the metrics of this process in Prometheus text format.
+
+    Reading them needs the get_metrics policy, admin only by default.
+    """
+
+    CONTENT_TYPE = 'text/plain'
+
+    @classmethod
+    def factory(cls, global_config, **local_config):
+        return cls()
+
+    @webob.dec.wsgify(RequestClass=wsgi.Request)
+    def __call__(self, req):
+        if req.path_info not in ('', '/'):
+            return webob.exc.HTTPNotFound()
+        policy.init()
+        if not policy.check(req.context, 'get_metrics', {}):
+            return webob.exc.HTTPForbidden()
+        response = webob.Response()
+        response.content_type = self.CONTENT_TYPE
+        response.charset = 'utf-8'
+        response.text = metrics.REGISTRY.render()
+        return response
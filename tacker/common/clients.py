@@ -10,31 +10,124 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
+import hashlib
+import threading
+
 from heatclient import client as heatclient
+from oslo_config import cfg
+import requests
+from requests import adapters
+
 from tacker.vnfm import keystone
 
 
+OPTS = [
+    cfg.IntOpt('cache_size',
+               default=64, min=1,
+               help=_("Maximum number of VIM credentials whose keystone "
+                      "session and clients are kept for reuse")),
+    cfg.IntOpt('connection_pool_size',
+               default=10, min=1,
+               help=_("Maximum number of HTTP connections kept open per "
+                      "host by each cached session")),
+]
+cfg.CONF.register_opts(OPTS, 'openstack_clients')
+
+
+def config_opts():
+    return [('openstack_clients', OPTS)]
+
+
+class _CachedClients(object):
+    """Keystone client of one set of VIM credentials and its clients.
+
+    The keystone session reuses its token until it is about to expire,
+    then gets a new one, and keeps the HTTP connections open.
+    """
+
+    def __init__(self, auth_attr, version):
+        pool_size = cfg.CONF.openstack_clients.connection_pool_size
+        http = requests.Session()
+        for prefix in ('http://', 'https://'):
+            http.mount(prefix, adapters.HTTPAdapter(
+                pool_connections=pool_size, pool_maxsize=pool_size))
+        self.keystone = keystone.Keystone().initialize_client(
+            version, http_session=http, **auth_attr)
+        self.heat = {}   # region_name => heat client
+
+
+_cache = collections.OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cache_key(auth_attr, version):
+    # the password may be bytes once decrypted
+    credentials = repr(sorted(auth_attr.items()))
+    return (auth_attr['auth_url'], version,
+            hashlib.sha256(credentials.encode('utf-8')).hexdigest())
+
+
+def _get_cached(auth_attr, version=None):
+    if version is None:
+        version = auth_attr['auth_url'].rpartition('/')[2]
+    if auth_attr.get('token'):
+        # the token of a request, e.g. for mistral, is not reused by
+        # later requests and would only evict the shared VIM sessions
+        return _CachedClients(dict(auth_attr), version)
+    key = _cache_key(auth_attr, version)
+    with _cache_lock:
+        cached = _cache.pop(key, None)
+        if cached is None:
+            # the keystone client authenticates lazily, at its first request
+            cached = _CachedClients(dict(auth_attr), version)
+        _cache[key] = cached
+        while len(_cache) > cfg.CONF.openstack_clients.cache_size:
+            _cache.popitem(last=False)
+    return cached
+
+
+def get_keystone_client(auth_attr, version=None):
+    """Return the shared keystone client of a set of VIM credentials.
+
+    A client authenticated by a token is not shared.
+
+    :param version: keystone API version, by default the one ending the
+        auth_url.
+    """
+    return _get_cached(auth_attr, version).keystone
+
+
+def invalidate(auth_url):
+    """Drop the sessions and clients of every credential of a VIM."""
+    with _cache_lock:
+        for key in [key for key in _cache if key[0] == auth_url]:
+            del _cache[key]
+
+
 class OpenstackClients(object):
 
     def __init__(self, auth_attr, region_name=None):
         super(OpenstackClients, self).__init__()
-        self.keystone_plugin = keystone.Keystone()
         self.heat_client = None
         self.mistral_client = None
         self.keystone_client = None
         self.region_name = region_name
         self.auth_attr = auth_attr
 
-    def _keystone_client(self):
-        version = self.auth_attr['auth_url'].rpartition('/')[2]
-        return self.keystone_plugin.initialize_client(version,
-                                                      **self.auth_attr)
-
     def _heat_client(self):
-        endpoint = self.keystone_session.get_endpoint(
-            service_type='orchestration', region_name=self.region_name)
-        return heatclient.Client('1', endpoint=endpoint,
-                                 session=self.keystone_session)
+        cached = _get_cached(self.auth_attr)
+        client = cached.heat.get(self.region_name)
+        if client is None:
+            session = cached.keystone.session
+            endpoint = session.get_endpoint(
+                service_type='orchestration', region_name=self.region_name)
+            # not built under a lock, as the catalog lookup may yield to
+            # other green threads
+            client = cached.heat.setdefault(
+                self.region_name,
+                heatclient.Client('1', endpoint=endpoint, session=session))
+        return client
 
     @property
     def keystone_session(self):
@@ -43,7 +136,7 @@ class OpenstackClients(object):
     @property
     def keystone(self):
         if not self.keystone_client:
-            self.keystone_client = self._keystone_client()
+            self.keystone_client = get_keystone_client(self.auth_attr)
         return self.keystone_client
 
     @property
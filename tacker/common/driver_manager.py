@@ -15,12 +15,51 @@
 #    under the License.
 #
 
+import time
+
 from oslo_log import log as logging
 
 import stevedore.named
 
+from tacker.common import metrics
+
 LOG = logging.getLogger(__name__)
 
+CALL_SECONDS = metrics.histogram(
+    'tacker_driver_call_seconds', 'Duration of driver method calls',
+    ['namespace', 'driver', 'method'])
+
+
+class DriverMethod(object):
+    """Handle calling one method on the driver of a given type.
+
+    The method of every loaded driver is looked up once, when the handle
+    is made, instead of on every call. Calls are timed per driver.
+    """
+
+    def __init__(self, namespace, method_name, drivers):
+        self.namespace = namespace
+        self.method_name = method_name
+        self._drivers = drivers
+        self._methods = dict(
+            (type_, getattr(driver, method_name))
+            for type_, driver in drivers.items()
+            if hasattr(driver, method_name))
+
+    def __call__(self, type_, **kwargs):
+        method = self._methods.get(type_)
+        if method is None:
+            # a driver registered after the handle was made
+            method = getattr(self._drivers[type_], self.method_name)
+            self._methods[type_] = method
+        start = time.time()
+        try:
+            return method(**kwargs)
+        finally:
+            CALL_SECONDS.observe(time.time() - start,
+                                 namespace=self.namespace, driver=type_,
+                                 method=self.method_name)
+
 
 class DriverManager(object):
     def __init__(self, namespace, driver_list, **kwargs):
@@ -46,8 +85,10 @@ class DriverManager(object):
             drivers[type_] = ext
 
         #将drivers赋给_drivers
+        self._namespace = namespace
         self._drivers = dict((type_, ext.obj)
                              for (type_, ext) in drivers.items())
+        self._handles = {}
         LOG.info("Registered drivers from %(namespace)s: %(keys)s",
                  {'namespace': namespace, 'keys': self._drivers.keys()})
 
@@ -70,11 +111,21 @@ class DriverManager(object):
             raise SystemExit(msg)
         self._drivers[type_] = driver
 
+    def method(self, method_name):
+        """Return a DriverMethod calling `method_name` on the drivers.
+
+        Callers on hot paths should keep the handle instead of using
+        invoke().
+        """
+        handle = self._handles.get(method_name)
+        if handle is None:
+            handle = self._handles[method_name] = DriverMethod(
+                self._namespace, method_name, self._drivers)
+        return handle
+
     def invoke(self, type_, method_name, **kwargs):
-        #取出driver
-        driver = self._drivers[type_]
         #调用driver的method_name方法，并传入相应参数
-        return getattr(driver, method_name)(**kwargs)
+        return self.method(method_name)(type_, **kwargs)
 
     #支持[]符号取值
     def __getitem__(self, type_):
@@ -0,0 +1,40 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import bisect
+import hashlib
+
+
+class HashRing(object):
+    """Consistent hash ring mapping keys to members.
+
+    Every member is placed `replicas` times on the ring, so that adding or
+    removing one member only moves about 1/N of the keys.
+    """
+
+    def __init__(self, members, replicas=64):
+        self.members = frozenset(members)
+        self._ring = sorted((self._hash('%s-%d' % (member, replica)), member)
+                            for member in self.members
+                            for replica in range(replicas))
+        self._hashes = [hash_ for hash_, _member in self._ring]
+
+    @staticmethod
+    def _hash(key):
+        return int(hashlib.md5(key.encode('utf-8')).hexdigest()[:8], 16)
+
+    def get_member(self, key):
+        """Return the member owning `key`, or None if the ring is empty."""
+        if not self._ring:
+            return None
+        index = bisect.bisect(self._hashes, self._hash(key))
+        return self._ring[index % len(self._ring)][1]
@@ -0,0 +1,202 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+Metrics are kept per process and are labelled by a fixed list of label
+names, e.g.::
+
+    PROBES = metrics.counter('tacker_monitor_probes_total',
+                             'Monitor probes run', ['driver', 'result'])
+    PROBES.inc(driver='ping', result='failure')
+"""
+
+import bisect
+import threading
+import time
+
+import six
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                   10.0, 30.0, 60.0)
+
+
+def _escape(value):
+    return (six.text_type(value).replace('\\', '\\\\').
+            replace('\n', '\\n').replace('"', '\\"'))
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{%s}' % ','.join('%s="%s"' % (name, _escape(value))
+                             for name, value in pairs)
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+class _Metric(object):
+    type_name = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}   # label values => value
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError('%s expects labels %s, got %s' %
+                             (self.name, self.labelnames, sorted(labels)))
+        return tuple(six.text_type(labels[name]) for name in self.labelnames)
+
+    def _samples(self):
+        with self._lock:
+            return [(key, value) for key, value in self._values.items()]
+
+    def render(self):
+        lines = ['# HELP %s %s' % (self.name, self.documentation),
+                 '# TYPE %s %s' % (self.name, self.type_name)]
+        for key, value in sorted(self._samples()):
+            lines.append('%s%s %s' % (
+                self.name, _format_labels(self.labelnames, key),
+                _format_value(value)))
+        return lines
+
+
+class Counter(_Metric):
+    type_name = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    type_name = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class _Timer(object):
+
+    def __init__(self, histogram, labels):
+        self._histogram = histogram
+        self._labels = labels
+
+    def __enter__(self):
+        self._start = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self._histogram.observe(time.time() - self._start, **self._labels)
+
+
+class Histogram(_Metric):
+    type_name = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(),
+                 buckets=DEFAULT_BUCKETS):
+        super(Histogram, self).__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            # [per bucket counts..., sum]
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * (len(self.buckets) + 2)
+            state[bisect.bisect_left(self.buckets, value)] += 1
+            state[-1] += value
+
+    def time(self, **labels):
+        """Context manager observing the duration of its block."""
+        return _Timer(self, labels)
+
+    def _samples(self):
+        with self._lock:
+            return [(key, list(state)) for key, state in self._values.items()]
+
+    def render(self):
+        lines = ['# HELP %s %s' % (self.name, self.documentation),
+                 '# TYPE %s %s' % (self.name, self.type_name)]
+        for key, state in sorted(self._samples()):
+            count = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),),
+                                           state[:-1]):
+                count += bucket_count
+                lines.append('%s_bucket%s %s' % (
+                    self.name,
+                    _format_labels(self.labelnames, key,
+                                   [('le', _format_value(bound))]),
+                    _format_value(count)))
+            labels = _format_labels(self.labelnames, key)
+            lines.append('%s_sum%s %s' % (self.name, labels,
+                                          _format_value(state[-1])))
+            lines.append('%s_count%s %s' % (self.name, labels,
+                                            _format_value(count)))
+        return lines
+
+
+class Registry(object):
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def register(self, metric):
+        """Register a metric, returning the one of that name if any."""
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric):
+                    raise ValueError('metric %s is already registered as a '
+                                     '%s' % (metric.name, existing.type_name))
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def render(self):
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        lines = []
+        for _name, metric in metrics:
+            lines.extend(metric.render())
+        return six.text_type('\n'.join(lines) + '\n')
+
+
+REGISTRY = Registry()
+
+
+def counter(name, documentation, labelnames=()):
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+
+def gauge(name, documentation, labelnames=()):
+    return REGISTRY.register(Gauge(name, documentation, labelnames))
+
+
+def histogram(name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+    return REGISTRY.register(Histogram(name, documentation, labelnames,
+                                       buckets))
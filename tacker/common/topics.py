@@ -13,3 +13,5 @@
 
 TOPIC_ACTION_KILL = 'KILL_ACTION'
 TOPIC_CONDUCTOR = 'TACKER_CONDUCTOR'
+TOPIC_VNF_MONITOR = 'TACKER_VNF_MONITOR'
+TOPIC_VIM_MONITOR = 'TACKER_VIM_MONITOR'
@@ -28,6 +28,7 @@ from tacker.db.common_services import common_services_db
 from tacker.db.nfvo import nfvo_db
 from tacker.extensions import nfvo
 from tacker import manager
+from tacker.nfvo import vim_health
 from tacker.plugins.common import constants
 from tacker import service as tacker_service
 from tacker import version
@@ -44,6 +45,13 @@ class Conductor(manager.Manager):
             self.conf = cfg.CONF
         super(Conductor, self).__init__(host=self.conf.host)
 
+    def init_host(self):
+        if not self.conf.vim_monitor.mistral_workflow:
+            partition = tacker_service.Partition(
+                topics.TOPIC_VIM_MONITOR,
+                self.conf.vim_monitor.member_timeout)
+            vim_health.VimHealthMonitor(self.update_vim, partition).start()
+
     def update_vim(self, context, vim_id, status):
         t_admin_context = t_context.get_admin_context()
         update_time = timeutils.utcnow()
@@ -29,3 +29,20 @@ class Event(model_base.BASE):
     timestamp = sa.Column(sa.DateTime, nullable=False)
     event_type = sa.Column(sa.String(64), nullable=False)
     event_details = sa.Column(types.Json)
+
+    # events are listed by resource or by type, in time order
+    __table_args__ = (
+        sa.Index('ix_events_timestamp_id', 'timestamp', 'id'),
+        sa.Index('ix_events_resource_id_timestamp',
+                 'resource_id', 'timestamp'),
+        sa.Index('ix_events_resource_type_event_type_timestamp',
+                 'resource_type', 'event_type', 'timestamp'),
+    )
+
+
+class ServiceHeartbeat(model_base.BASE):
+    """Last time a tacker process reported itself alive for a topic."""
+    __tablename__ = 'service_heartbeats'
+    topic = sa.Column(sa.String(255), primary_key=True)
+    host = sa.Column(sa.String(255), primary_key=True)
+    updated_at = sa.Column(sa.DateTime, nullable=False)
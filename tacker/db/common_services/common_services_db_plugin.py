@@ -17,7 +17,9 @@
 from sqlalchemy.orm import exc as orm_exc
 
 from oslo_log import log as logging
+from oslo_utils import timeutils
 
+from tacker.common import exceptions
 from tacker.common import log
 from tacker.db.common_services import common_services_db
 from tacker.db import db_base
@@ -29,6 +31,8 @@ LOG = logging.getLogger(__name__)
 
 EVENT_ATTRIBUTES = ('id', 'resource_id', 'resource_type', 'resource_state',
                     'timestamp', 'event_type', 'event_details')
+# filters of the events by the time range of their timestamp
+TIME_RANGE_FILTERS = ('since', 'until')
 
 
 class CommonServicesPluginDb(common_services.CommonServicesPluginBase,
@@ -81,10 +85,104 @@ class CommonServicesPluginDb(common_services.CommonServicesPluginBase,
             raise common_services.EventNotFoundException(evt_id=event_id)
         return self._make_event_dict(events_db, fields)
 
+    def _get_event(self, context, event_id):
+        try:
+            return self._get_by_id(context, common_services_db.Event,
+                                   event_id)
+        except orm_exc.NoResultFound:
+            raise common_services.EventNotFoundException(evt_id=event_id)
+
+    @staticmethod
+    def _parse_time_filter(name, values):
+        try:
+            return timeutils.normalize_time(
+                timeutils.parse_isotime(values[-1]))
+        except ValueError as e:
+            raise exceptions.InvalidInput(
+                error_message=_("Invalid %(name)s time: %(error)s") %
+                {'name': name, 'error': e})
+
+    def _filter_events_by_time(self, query, filters):
+        """Keep the events of the `since` and `until` filters."""
+        Event = common_services_db.Event
+        if filters.get('since'):
+            query = query.filter(Event.timestamp >= self._parse_time_filter(
+                'since', filters['since']))
+        if filters.get('until'):
+            query = query.filter(Event.timestamp < self._parse_time_filter(
+                'until', filters['until']))
+        return query
+
+    @staticmethod
+    def _event_sorts(sorts):
+        """Return `sorts` ending with the (timestamp, id) key of events.
+
+        Events are listed in time order by default, and pages of events
+        are read after a (timestamp, id) marker using the index on them.
+        """
+        sorts = list(sorts or [])
+        keys = [key for key, direction in sorts]
+        if keys in ([], ['id']):
+            direction = sorts[0][1] if sorts else True
+            return [('timestamp', direction), ('id', direction)]
+        if 'id' not in keys:
+            sorts.append(('id', True))
+        return sorts
+
     @log.log
     def get_events(self, context, filters=None, fields=None, sorts=None,
-                   limit=None, marker_obj=None, page_reverse=False):
+                   limit=None, marker_obj=None, page_reverse=False,
+                   marker=None):
+        """Return the events matching `filters`, page by page.
+
+        `since` and `until` filters select the events of a time range. A
+        page starts after `marker`, the id of the last event of the
+        previous page, or `marker_obj`, that event.
+        """
+        if marker_obj is None:
+            marker_obj = self._get_marker_obj(context, 'event', limit,
+                                              marker)
         return self._get_collection(context, common_services_db.Event,
                                     self._make_event_dict,
-                                    filters, fields, sorts, limit,
+                                    filters, fields,
+                                    self._event_sorts(sorts), limit,
                                     marker_obj, page_reverse)
+
+    def report_heartbeat(self, context, topic, host, tstamp):
+        with context.session.begin(subtransactions=True):
+            heartbeat_db = self._model_query(
+                context, common_services_db.ServiceHeartbeat).filter_by(
+                    topic=topic, host=host).first()
+            if heartbeat_db:
+                heartbeat_db.updated_at = tstamp
+            else:
+                context.session.add(common_services_db.ServiceHeartbeat(
+                    topic=topic, host=host, updated_at=tstamp))
+
+    def get_live_hosts(self, context, topic, since):
+        """Return the hosts of `topic` that reported since `since`."""
+        query = self._model_query(
+            context, common_services_db.ServiceHeartbeat).filter(
+                common_services_db.ServiceHeartbeat.topic == topic,
+                common_services_db.ServiceHeartbeat.updated_at >= since)
+        return set(heartbeat_db.host for heartbeat_db in query)
+
+    def delete_heartbeat(self, context, topic, host):
+        with context.session.begin(subtransactions=True):
+            self._model_query(
+                context, common_services_db.ServiceHeartbeat).filter_by(
+                    topic=topic, host=host).delete()
+
+    def purge_heartbeats(self, context, topic, before):
+        """Delete the heartbeats of `topic` older than `before`."""
+        with context.session.begin(subtransactions=True):
+            self._model_query(
+                context, common_services_db.ServiceHeartbeat).filter(
+                    common_services_db.ServiceHeartbeat.topic == topic,
+                    common_services_db.ServiceHeartbeat.updated_at <
+                    before).delete()
+
+
+CommonServicesPluginDb.register_model_query_hook(
+    common_services_db.Event, 'time_range', None, None,
+    '_filter_events_by_time')
@@ -0,0 +1,140 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import atexit
+import threading
+import time
+
+from oslo_config import cfg
+from oslo_log import log as logging
+from six.moves import queue
+
+from tacker import context as t_context
+from tacker.db.common_services import common_services_db
+
+
+LOG = logging.getLogger(__name__)
+OPTS = [
+    cfg.IntOpt('queue_size', default=10000,
+               help=_('Maximum number of events waiting to be written')),
+    cfg.IntOpt('batch_size', default=100,
+               help=_('Maximum number of events written by one INSERT')),
+    cfg.FloatOpt('flush_interval', default=1.0,
+                 help=_('Maximum number of seconds an event waits before '
+                        'being written')),
+    cfg.StrOpt('overflow', default='drop', choices=['drop', 'block'],
+               help=_('What to do with a new event when the queue is full, '
+                      'drop it or block the caller until there is room')),
+]
+cfg.CONF.register_opts(OPTS, 'event_sink')
+
+
+def config_opts():
+    return [('event_sink', OPTS)]
+
+
+class EventSink(object):
+    """Writes audit events to the events table in the background.
+
+    Events are queued by create_event and written by a flusher thread with
+    one multi-row INSERT per batch, when batch_size events are queued or
+    every flush_interval seconds.
+    """
+
+    def __init__(self, queue_size, batch_size, flush_interval, overflow):
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._block = overflow == 'block'
+        self._write_lock = threading.Lock()
+        self._dropped = 0
+
+    def start(self):
+        flusher = threading.Thread(target=self._run)
+        flusher.daemon = True
+        flusher.start()
+        atexit.register(self.flush)
+
+    def create_event(self, context, res_id, res_type, res_state, evt_type,
+                     tstamp, details=""):
+        event = {'resource_id': res_id,
+                 'resource_type': res_type,
+                 'resource_state': res_state,
+                 'event_type': evt_type,
+                 'timestamp': tstamp,
+                 'event_details': details}
+        try:
+            self._queue.put(event, block=self._block)
+        except queue.Full:
+            self._dropped += 1
+            if self._dropped % 1000 == 1:
+                LOG.warning('Event queue is full, %d events dropped so far',
+                            self._dropped)
+
+    def _take(self, timeout):
+        batch = []
+        deadline = time.time() + timeout
+        while len(batch) < self._batch_size:
+            remaining = deadline - time.time()
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, events):
+        context = t_context.get_admin_context()
+        try:
+            with context.session.begin(subtransactions=True):
+                context.session.execute(
+                    common_services_db.Event.__table__.insert().values(
+                        events))
+        except Exception:
+            LOG.exception('Failed to write %d events', len(events))
+
+    def _run(self):
+        while(1):
+            # events are taken under the lock so that flush() returns only
+            # once they are written
+            with self._write_lock:
+                events = self._take(self._flush_interval)
+                if events:
+                    self._write(events)
+
+    def flush(self):
+        """Write every queued event before returning."""
+        with self._write_lock:
+            while(1):
+                events = self._take(0)
+                if not events:
+                    return
+                self._write(events)
+
+
+_sink = None
+_sink_lock = threading.Lock()
+
+
+def get_sink():
+    """Return the event sink of this process, starting it if needed."""
+    global _sink
+    with _sink_lock:
+        if _sink is None:
+            _sink = EventSink(cfg.CONF.event_sink.queue_size,
+                              cfg.CONF.event_sink.batch_size,
+                              cfg.CONF.event_sink.flush_interval,
+                              cfg.CONF.event_sink.overflow)
+            _sink.start()
+    return _sink
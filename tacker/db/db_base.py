@@ -19,13 +19,18 @@ import weakref
 from oslo_log import log as logging
 import six
 from six import iteritems
+import sqlalchemy as sa
+from sqlalchemy import orm
 from sqlalchemy.orm import exc as orm_exc
 from sqlalchemy import sql
 
 from tacker.common import exceptions as n_exc
 from tacker.db import sqlalchemyutils
+from tacker.db import types
 
 LOG = logging.getLogger(__name__)
+# columns only loaded when a request asks for them
+LARGE_COLUMN_TYPES = (sa.Text, sa.LargeBinary, types.Json)
 
 
 class CommonDbMixin(object):
@@ -120,6 +125,33 @@ class CommonDbMixin(object):
                          if key in fields))
         return resource
 
+    @staticmethod
+    def _requested_keys(keys, fields):
+        """Return the `keys` in the requested `fields`, all if none is.
+
+        The dict of a row is built from them only, so that the deferred
+        columns which are not requested are not loaded.
+        """
+        if not fields:
+            return keys
+        return [key for key in keys if key in fields]
+
+    @staticmethod
+    def _defer_columns_options(model, fields):
+        """Return the loader options deferring the large columns of `model`.
+
+        The text and JSON columns, e.g. templates, which are not in the
+        requested `fields` are not selected. They are still loaded if the
+        dict of a row uses them.
+        """
+        if not fields:
+            return []
+        return [orm.defer(column_attr.key)
+                for column_attr in sa.inspect(model).column_attrs
+                if (column_attr.key not in fields and
+                    isinstance(column_attr.columns[0].type,
+                               LARGE_COLUMN_TYPES))]
+
     def _get_tenant_id_for_create(self, context, resource):
         if context.is_admin and 'tenant_id' in resource:
             tenant_id = resource['tenant_id']
@@ -131,8 +163,10 @@ class CommonDbMixin(object):
             tenant_id = context.tenant_id
         return tenant_id
 
-    def _get_by_id(self, context, model, id):
+    def _get_by_id(self, context, model, id, options=None):
         query = self._model_query(context, model)
+        if options:
+            query = query.options(*options)
         return query.filter(model.id == id).one()
 
     def _apply_filters_to_query(self, query, model, filters):
@@ -167,8 +201,10 @@ class CommonDbMixin(object):
 
     def _get_collection_query(self, context, model, filters=None,
                               sorts=None, limit=None, marker_obj=None,
-                              page_reverse=False):
+                              page_reverse=False, options=None):
         collection = self._model_query(context, model)
+        if options:
+            collection = collection.options(*options)
         collection = self._apply_filters_to_query(collection, model, filters)
         if limit and page_reverse and sorts:
             sorts = [(s[0], not s[1]) for s in sorts]
@@ -179,12 +215,21 @@ class CommonDbMixin(object):
 
     def _get_collection(self, context, model, dict_func, filters=None,
                         fields=None, sorts=None, limit=None, marker_obj=None,
-                        page_reverse=False):
+                        page_reverse=False, options=None):
+        """Return the dicts of the rows of `model` built by `dict_func`.
+
+        `options` are the loader options of the query, to load at once
+        the relationships `dict_func` uses for the rows. The large columns
+        which are not in `fields` are deferred.
+        """
+        options = (list(options or []) +
+                   self._defer_columns_options(model, fields))
         query = self._get_collection_query(context, model, filters=filters,
                                            sorts=sorts,
                                            limit=limit,
                                            marker_obj=marker_obj,
-                                           page_reverse=page_reverse)
+                                           page_reverse=page_reverse,
+                                           options=options)
         items = [dict_func(c, fields) for c in query]
         if limit and page_reverse:
             items.reverse()
@@ -208,9 +253,11 @@ class CommonDbMixin(object):
         return dict((k, v) for (k, v) in
                     iteritems(data) if k in columns)
 
-    def _get_by_name(self, context, model, name):
+    def _get_by_name(self, context, model, name, options=None):
         try:
             query = self._model_query(context, model)
+            if options:
+                query = query.options(*options)
             return query.filter(model.name == name).one()
         except orm_exc.NoResultFound:
             LOG.info("No result found for %(name)s in %(model)s table",
@@ -0,0 +1,39 @@
+# Copyright 2018 OpenStack Foundation
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+"""add_service_heartbeats
+
+Revision ID: 9d425296f2c3
+Revises: 5d490546290c
+Create Date: 2018-02-05 10:12:41.208313
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '9d425296f2c3'
+down_revision = '5d490546290c'
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade(active_plugins=None, options=None):
+    op.create_table('service_heartbeats',
+        sa.Column('topic', sa.String(255), nullable=False),
+        sa.Column('host', sa.String(255), nullable=False),
+        sa.Column('updated_at', sa.DateTime, nullable=False),
+        sa.PrimaryKeyConstraint('topic', 'host'),
+        mysql_engine='InnoDB'
+    )
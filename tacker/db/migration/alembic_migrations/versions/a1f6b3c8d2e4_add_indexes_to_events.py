@@ -0,0 +1,37 @@
+# Copyright 2018 OpenStack Foundation
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+"""add_indexes_to_events
+
+Revision ID: a1f6b3c8d2e4
+Revises: 9d425296f2c3
+Create Date: 2018-03-12 09:41:27.503126
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = 'a1f6b3c8d2e4'
+down_revision = '9d425296f2c3'
+
+from alembic import op
+
+
+def upgrade(active_plugins=None, options=None):
+    op.create_index('ix_events_timestamp_id', 'events',
+                    ['timestamp', 'id'])
+    op.create_index('ix_events_resource_id_timestamp', 'events',
+                    ['resource_id', 'timestamp'])
+    op.create_index('ix_events_resource_type_event_type_timestamp', 'events',
+                    ['resource_type', 'event_type', 'timestamp'])
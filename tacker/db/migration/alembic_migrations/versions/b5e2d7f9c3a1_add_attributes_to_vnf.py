@@ -0,0 +1,36 @@
+# Copyright 2018 OpenStack Foundation
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+"""add_attributes_to_vnf
+
+Revision ID: b5e2d7f9c3a1
+Revises: a1f6b3c8d2e4
+Create Date: 2018-03-20 14:07:52.918364
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = 'b5e2d7f9c3a1'
+down_revision = 'a1f6b3c8d2e4'
+
+from alembic import op
+import sqlalchemy as sa
+from tacker.db.types import Json
+
+
+def upgrade(active_plugins=None, options=None):
+    # the vnf_attribute rows are moved to it online, see
+    # tacker-db-manage migrate_vnf_attributes
+    op.add_column('vnf', sa.Column('attributes', Json, nullable=True))
@@ -0,0 +1,39 @@
+# Copyright 2018 OpenStack Foundation
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+"""add_model_to_vnfd
+
+Revision ID: d4a7c9e2f1b8
+Revises: b5e2d7f9c3a1
+Create Date: 2018-03-27 10:42:18.530217
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = 'd4a7c9e2f1b8'
+down_revision = 'b5e2d7f9c3a1'
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade(active_plugins=None, options=None):
+    op.add_column('vnfd', sa.Column('model', sa.TEXT(16777215),
+                                    nullable=True))
+    # the models stored as attributes are of an older version, they are
+    # ignored and the VNFDs are parsed instead
+    vnfd_attribute = sa.table('vnfd_attribute', sa.column('key'))
+    op.execute(vnfd_attribute.delete().where(
+        vnfd_attribute.c.key == 'vnfd_model'))
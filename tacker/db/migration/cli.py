@@ -20,6 +20,7 @@ from alembic import script as alembic_script
 from alembic import util as alembic_util
 from oslo_config import cfg
 
+from tacker.db.migration import migrate_attributes
 from tacker.db.migration.models import head  # noqa
 from tacker.db.migration import purge_tables
 
@@ -109,7 +110,19 @@ def purge_deleted(config, cmd):
     purge_tables.purge_deleted(config.tacker_config,
                       CONF.command.resource,
                       CONF.command.age,
-                      CONF.command.granularity)
+                      CONF.command.granularity,
+                      batch_size=CONF.command.batch_size,
+                      sleep=CONF.command.sleep,
+                      dry_run=CONF.command.dry_run,
+                      progress=alembic_util.msg)
+
+
+def migrate_vnf_attributes(config, cmd):
+    """Move the attribute rows of VNFs to their attributes column."""
+    migrate_attributes.migrate_vnf_attributes(
+        config.tacker_config,
+        batch_size=CONF.command.batch_size,
+        progress=alembic_util.msg)
 
 
 def add_command_parsers(subparsers):
@@ -153,6 +166,24 @@ def add_command_parsers(subparsers):
         '-g', '--granularity', default='days',
         choices=['days', 'hours', 'minutes', 'seconds'],
         help=_('Granularity to use for age argument, defaults to days.'))
+    parser.add_argument(
+        '--batch-size', type=int, default=purge_tables.DEFAULT_BATCH_SIZE,
+        help=_('Number of rows deleted per transaction, defaults to %d.') %
+        purge_tables.DEFAULT_BATCH_SIZE)
+    parser.add_argument(
+        '--sleep', type=float, default=0,
+        help=_('Seconds to wait between two transactions, defaults to 0.'))
+    parser.add_argument(
+        '--dry-run', action='store_true',
+        help=_('Only count the rows which would be purged.'))
+
+    parser = subparsers.add_parser('migrate_vnf_attributes')
+    parser.set_defaults(func=migrate_vnf_attributes)
+    parser.add_argument(
+        '--batch-size', type=int,
+        default=migrate_attributes.DEFAULT_BATCH_SIZE,
+        help=_('Number of VNFs migrated per transaction, defaults to %d.') %
+        migrate_attributes.DEFAULT_BATCH_SIZE)
 
 
 command_opt = cfg.SubCommandOpt('command',
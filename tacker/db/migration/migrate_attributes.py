@@ -0,0 +1,85 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Online migration of the vnf_attribute rows to the vnf attributes column.
+
+The migration runs while tacker servers are running: VNFs are migrated in
+batches, each in its own transaction, and a VNF written in the meantime
+by a server, which migrates it, is left as is.
+"""
+
+import collections
+import json
+
+import sqlalchemy
+from sqlalchemy import and_
+
+from tacker.common import exceptions
+from tacker.db.migration import purge_tables
+
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def _migrate_batch(conn, vnf, vnf_attribute, vnf_ids):
+    attributes = collections.defaultdict(dict)
+    query = sqlalchemy.select(
+        [vnf_attribute.c.vnf_id, vnf_attribute.c.key,
+         vnf_attribute.c.value]).where(vnf_attribute.c.vnf_id.in_(vnf_ids))
+    for vnf_id, key, value in conn.execute(query):
+        attributes[vnf_id][key] = value
+    for vnf_id in vnf_ids:
+        conn.execute(vnf.update().where(
+            and_(vnf.c.id == vnf_id, vnf.c.attributes.is_(None))).values(
+                attributes=json.dumps(attributes[vnf_id])))
+    conn.execute(vnf_attribute.delete().where(
+        vnf_attribute.c.vnf_id.in_(vnf_ids)))
+
+
+def migrate_vnf_attributes(tacker_config, batch_size=DEFAULT_BATCH_SIZE,
+                           progress=None):
+    """Move the vnf_attribute rows of VNFs to their attributes column.
+
+    `progress` is called with a message after each batch of `batch_size`
+    VNFs. Return the number of VNFs migrated.
+    """
+    if batch_size < 1:
+        msg = _("'%s' - batch size should be a positive integer") % batch_size
+        raise exceptions.InvalidInput(error_message=msg)
+
+    engine = purge_tables.get_engine(tacker_config)
+    meta = sqlalchemy.MetaData()
+    meta.bind = engine
+    vnf = sqlalchemy.Table('vnf', meta, autoload=True)
+    vnf_attribute = sqlalchemy.Table('vnf_attribute', meta, autoload=True)
+    select_id_query = sqlalchemy.select([vnf.c.id]).where(
+        vnf.c.attributes.is_(None))
+
+    migrated = 0
+    last_id = None
+    while True:
+        query = select_id_query
+        if last_id is not None:
+            query = query.where(vnf.c.id > last_id)
+        vnf_ids = [row[0] for row in engine.execute(
+            query.order_by(vnf.c.id).limit(batch_size))]
+        if not vnf_ids:
+            break
+        with engine.begin() as conn:
+            _migrate_batch(conn, vnf, vnf_attribute, vnf_ids)
+        migrated += len(vnf_ids)
+        if progress:
+            progress(_("VNFs migrated: %d") % migrated)
+        if len(vnf_ids) < batch_size:
+            break
+        last_id = vnf_ids[-1]
+    return migrated
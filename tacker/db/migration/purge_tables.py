@@ -13,7 +13,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import datetime
+import time
+
 import sqlalchemy
 from sqlalchemy import and_
 from sqlalchemy import create_engine, pool
@@ -25,6 +28,7 @@ from tacker.common import exceptions
 
 
 GRANULARITY = {'days': 86400, 'hours': 3600, 'minutes': 60, 'seconds': 1}
+DEFAULT_BATCH_SIZE = 1000
 
 
 def _generate_associated_tables_map(inspector):
@@ -47,42 +51,118 @@ def _generate_associated_tables_map(inspector):
     return assoc_map
 
 
-def _purge_resource_tables(t, meta, engine, time_line, assoc_map):
+class BatchPurger(object):
+    """Delete the rows to purge in bounded batches.
+
+    Candidate rows are walked by ranges of their key, and each batch is
+    deleted, children first, in its own short transaction. In dry run the
+    rows which would be deleted are only counted.
+    """
+
+    def __init__(self, engine, batch_size=DEFAULT_BATCH_SIZE, sleep=0,
+                 dry_run=False, progress=None):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.sleep = sleep
+        self.dry_run = dry_run
+        self.progress = progress
+        self.counts = collections.OrderedDict()
+
+    def batches(self, select_query, key_column):
+        """Yield the rows of `select_query` by batches of `key_column` range.
+
+        `key_column` must be the first column selected.
+        """
+        last_key = None
+        while True:
+            query = select_query
+            if last_key is not None:
+                query = query.where(key_column > last_key)
+            rows = list(self.engine.execute(
+                query.order_by(key_column).limit(self.batch_size)))
+            if not rows:
+                return
+            yield rows
+            if len(rows) < self.batch_size:
+                return
+            last_key = rows[-1][0]
+
+    def delete(self, deletes):
+        """Delete the rows of (table, where clause) pairs of one batch."""
+        if self.dry_run:
+            for table, where in deletes:
+                query = sqlalchemy.select(
+                    [sqlalchemy.func.count()]).select_from(table).where(where)
+                self._count(table, self.engine.execute(query).scalar())
+        else:
+            with self.engine.begin() as conn:
+                for table, where in deletes:
+                    result = conn.execute(table.delete().where(where))
+                    self._count(table, result.rowcount)
+            if self.sleep:
+                # let other transactions use the tables between batches
+                time.sleep(self.sleep)
+        if self.progress:
+            self.progress(self._progress_message())
+
+    def _count(self, table, count):
+        self.counts[table.name] = self.counts.get(table.name, 0) + count
+
+    def _progress_message(self):
+        if self.dry_run:
+            msg = _("Rows to purge: %s")
+        else:
+            msg = _("Rows purged: %s")
+        return msg % ', '.join('%s %d' % (name, count)
+                               for name, count in self.counts.items())
+
+
+def _purge_resource_tables(t, meta, purger, time_line, assoc_map):
     table_load = sqlalchemy.Table(t, meta, autoload=True)
-    table_del_query = table_load.delete().where(
+    select_id_query = sqlalchemy.select([table_load.c.id]).where(
         table_load.c.deleted_at <= time_line)
-    if t in assoc_map.keys():
-        select_id_query = sqlalchemy.select([table_load.c.id]).where(
-            table_load.c.deleted_at <= time_line)
-        resource_ids = [i[0] for i in list(engine.execute(select_id_query))]
-        if resource_ids:
-            for key, val in assoc_map[t].items():
-                assoc_table_load = sqlalchemy.Table(key, meta, autoload=True)
-                assoc_table_del_query = assoc_table_load.delete().where(
-                    assoc_table_load.c[val].in_(resource_ids))
-                engine.execute(assoc_table_del_query)
-    engine.execute(table_del_query)
+    assoc_tables = [(sqlalchemy.Table(key, meta, autoload=True), val)
+                    for key, val in assoc_map.get(t, {}).items()]
+    for rows in purger.batches(select_id_query, table_load.c.id):
+        resource_ids = [row[0] for row in rows]
+        deletes = [(assoc_table_load, assoc_table_load.c[val].in_(
+            resource_ids)) for assoc_table_load, val in assoc_tables]
+        deletes.append((table_load, table_load.c.id.in_(resource_ids)))
+        purger.delete(deletes)
 
 
-def _purge_events_table(meta, engine, time_line):
+def _purge_events_table(meta, purger, time_line):
     tname = "events"
     event_table_load = sqlalchemy.Table(tname, meta, autoload=True)
     event_select_query = sqlalchemy.select(
-        [event_table_load.c.resource_id]
+        [event_table_load.c.id, event_table_load.c.resource_id]
     ).where(
         and_(event_table_load.c.event_type == 'DELETE',
              event_table_load.c.timestamp <= time_line
              )
     )
-    resource_ids = [i[0] for i in list(engine.execute(event_select_query))]
-    if resource_ids:
-        event_delete_query = event_table_load.delete().where(
-            event_table_load.c.resource_id.in_(resource_ids)
-        )
-        engine.execute(event_delete_query)
+    # in dry run the events of a resource deleted twice are still there
+    counted_ids = set()
+    for rows in purger.batches(event_select_query, event_table_load.c.id):
+        resource_ids = set(row[1] for row in rows) - counted_ids
+        if purger.dry_run:
+            counted_ids.update(resource_ids)
+        if resource_ids:
+            purger.delete([(event_table_load,
+                            event_table_load.c.resource_id.in_(
+                                resource_ids))])
 
 
-def purge_deleted(tacker_config, table_name, age, granularity='days'):
+def purge_deleted(tacker_config, table_name, age, granularity='days',
+                  batch_size=DEFAULT_BATCH_SIZE, sleep=0, dry_run=False,
+                  progress=None):
+    """Purge the rows of `table_name` deleted more than `age` ago.
+
+    Rows are deleted by batches of `batch_size` rows, waiting `sleep`
+    seconds between batches. `progress` is called with a message after
+    each batch. Return the number of rows purged, or to purge in
+    `dry_run`, by table.
+    """
     try:
         age = int(age)
     except ValueError:
@@ -97,6 +177,10 @@ def purge_deleted(tacker_config, table_name, age, granularity='days'):
                 "or seconds") % granularity
         raise exceptions.InvalidInput(error_message=msg)
 
+    if batch_size < 1:
+        msg = _("'%s' - batch size should be a positive integer") % batch_size
+        raise exceptions.InvalidInput(error_message=msg)
+
     age *= GRANULARITY[granularity]
 
     time_line = timeutils.utcnow() - datetime.timedelta(seconds=age)
@@ -105,15 +189,18 @@ def purge_deleted(tacker_config, table_name, age, granularity='days'):
     meta.bind = engine
     inspector = inspect(engine)
     assoc_map = _generate_associated_tables_map(inspector)
+    purger = BatchPurger(engine, batch_size=batch_size, sleep=sleep,
+                         dry_run=dry_run, progress=progress)
 
     if table_name == 'events':
-        _purge_events_table(meta, engine, time_line)
+        _purge_events_table(meta, purger, time_line)
     elif table_name == 'all':
-        _purge_events_table(meta, engine, time_line)
+        _purge_events_table(meta, purger, time_line)
         for t in ['vnf', 'vnfd', 'vims']:
-            _purge_resource_tables(t, meta, engine, time_line, assoc_map)
+            _purge_resource_tables(t, meta, purger, time_line, assoc_map)
     else:
-        _purge_resource_tables(table_name, meta, engine, time_line, assoc_map)
+        _purge_resource_tables(table_name, meta, purger, time_line, assoc_map)
+    return purger.counts
 
 
 def get_engine(tacker_config):
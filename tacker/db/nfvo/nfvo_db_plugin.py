@@ -47,14 +47,17 @@ class NfvoPluginDb(nfvo.NFVOPluginBase, db_base.CommonDbMixin):
         return manager.TackerManager.get_plugin()
 
     def _make_vim_dict(self, vim_db, fields=None, mask_password=True):
-        res = dict((key, vim_db[key]) for key in VIM_ATTRIBUTES)
-        vim_auth_db = vim_db.vim_auth
-        res['auth_url'] = vim_auth_db[0].auth_url
-        res['vim_project'] = vim_auth_db[0].vim_project
-        res['auth_cred'] = vim_auth_db[0].auth_cred
-        res['auth_cred']['password'] = vim_auth_db[0].password
-        if mask_password:
-            res['auth_cred'] = strutils.mask_dict_password(res['auth_cred'])
+        res = dict((key, vim_db[key])
+                   for key in self._requested_keys(VIM_ATTRIBUTES, fields))
+        if not fields or set(VIM_AUTH_ATTRIBUTES).intersection(fields):
+            vim_auth_db = vim_db.vim_auth
+            res['auth_url'] = vim_auth_db[0].auth_url
+            res['vim_project'] = vim_auth_db[0].vim_project
+            res['auth_cred'] = vim_auth_db[0].auth_cred
+            res['auth_cred']['password'] = vim_auth_db[0].password
+            if mask_password:
+                res['auth_cred'] = strutils.mask_dict_password(
+                    res['auth_cred'])
         return self._fields(res, fields)
 
     def _fields(self, resource, fields):
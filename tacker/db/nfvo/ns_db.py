@@ -119,9 +119,9 @@ class NSPluginDb(network_service.NSPluginBase, db_base.CommonDbMixin):
         super(NSPluginDb, self).__init__()
         self._cos_db_plg = common_services_db_plugin.CommonServicesPluginDb()
 
-    def _get_resource(self, context, model, id):
+    def _get_resource(self, context, model, id, options=None):
         try:
-            return self._get_by_id(context, model, id)
+            return self._get_by_id(context, model, id, options=options)
         except orm_exc.NoResultFound:
             if issubclass(model, NSD):
                 raise network_service.NSDNotFound(nsd_id=id)
@@ -145,13 +145,22 @@ class NSPluginDb(network_service.NSPluginBase, db_base.CommonDbMixin):
     def _make_attributes_dict(self, attributes_db):
         return dict((attr.key, attr.value) for attr in attributes_db)
 
+    @staticmethod
+    def _nsd_load_options(fields=None):
+        """Return the loader options of the relationships of NSDs."""
+        if not fields or 'attributes' in fields:
+            return [orm.subqueryload(NSD.attributes)]
+        return []
+
     def _make_nsd_dict(self, nsd, fields=None):
-        res = {
-            'attributes': self._make_attributes_dict(nsd['attributes']),
-        }
+        res = {}
+        if not fields or 'attributes' in fields:
+            res['attributes'] = self._make_attributes_dict(
+                nsd['attributes'])
         key_list = ('id', 'tenant_id', 'name', 'description',
                     'created_at', 'updated_at', 'vnfds', 'template_source')
-        res.update((key, nsd[key]) for key in key_list)
+        res.update((key, nsd[key])
+                   for key in self._requested_keys(key_list, fields))
         return self._fields(res, fields)
 
     def _make_dev_attrs_dict(self, dev_attrs_db):
@@ -163,7 +172,8 @@ class NSPluginDb(network_service.NSPluginBase, db_base.CommonDbMixin):
         key_list = ('id', 'tenant_id', 'nsd_id', 'name', 'description',
                     'vnf_ids', 'status', 'mgmt_urls', 'error_reason',
                     'vim_id', 'created_at', 'updated_at')
-        res.update((key, ns_db[key]) for key in key_list)
+        res.update((key, ns_db[key])
+                   for key in self._requested_keys(key_list, fields))
         return self._fields(res, fields)
 
     def create_nsd(self, context, nsd):
@@ -235,7 +245,8 @@ class NSPluginDb(network_service.NSPluginBase, db_base.CommonDbMixin):
                 context.session.delete(nsd_db)
 
     def get_nsd(self, context, nsd_id, fields=None):
-        nsd_db = self._get_resource(context, NSD, nsd_id)
+        nsd_db = self._get_resource(context, NSD, nsd_id,
+                                    options=self._nsd_load_options())
         return self._make_nsd_dict(nsd_db)
 
     def get_nsds(self, context, filters, fields=None):
@@ -244,7 +255,8 @@ class NSPluginDb(network_service.NSPluginBase, db_base.CommonDbMixin):
             filters.pop('template_source')
         return self._get_collection(context, NSD,
                                     self._make_nsd_dict,
-                                    filters=filters, fields=fields)
+                                    filters=filters, fields=fields,
+                                    options=self._nsd_load_options(fields))
 
     # reference implementation. needs to be overrided by subclass
     def create_ns(self, context, ns):
@@ -464,6 +464,8 @@ class VnffgPluginDbMixin(vnffg.VNFFGPluginBase, db_base.CommonDbMixin):
         # Build the list of logical chain representation
         logical_chain = self._get_nfp_attribute(template_db.template,
                                                 nfp_name, 'path')
+        vnfs_resources = vnfm_plugin.get_vnfs_resources(
+            context, set(vnf_mapping.values()))
         # Build physical port chain
         for element in logical_chain:
             if element['forwarder'] not in vnf_mapping.keys():
@@ -472,10 +474,11 @@ class VnffgPluginDbMixin(vnffg.VNFFGPluginBase, db_base.CommonDbMixin):
                                                          mapping=vnf_mapping)
             # TODO(trozet): validate CP in VNFD has forwarding capability
             # Find VNF resources
-            vnf = vnfm_plugin.get_vnf_resources(context,
-                                                vnf_mapping[element[
-                                                    'forwarder']]
-                                                )
+            vnf = vnfs_resources.get(vnf_mapping[element['forwarder']])
+            if vnf is None:
+                # raises the reason why its resources are not available
+                vnf = vnfm_plugin.get_vnf_resources(
+                    context, vnf_mapping[element['forwarder']])
             vnf_info = vnfm_plugin.get_vnf(context,
                                            vnf_mapping[element['forwarder']])
             vnf_cp = None
@@ -831,13 +834,14 @@ class VnffgPluginDbMixin(vnffg.VNFFGPluginBase, db_base.CommonDbMixin):
 
     def _make_vnffg_dict(self, vnffg_db, fields=None):
         LOG.debug('vnffg_db %s', vnffg_db)
-        LOG.debug('vnffg_db nfp %s', vnffg_db.forwarding_paths)
-        res = {
-            'forwarding_paths': vnffg_db.forwarding_paths[0]['id']
-        }
+        res = {}
+        if not fields or 'forwarding_paths' in fields:
+            LOG.debug('vnffg_db nfp %s', vnffg_db.forwarding_paths)
+            res['forwarding_paths'] = vnffg_db.forwarding_paths[0]['id']
         key_list = ('id', 'tenant_id', 'name', 'description',
                     'vnf_mapping', 'status', 'vnffgd_id', 'attributes')
-        res.update((key, vnffg_db[key]) for key in key_list)
+        res.update((key, vnffg_db[key])
+                   for key in self._requested_keys(key_list, fields))
         return self._fields(res, fields)
 
     def _update_vnffg_status_pre(self, context, vnffg_id):
@@ -1315,7 +1319,8 @@ class VnffgPluginDbMixin(vnffg.VNFFGPluginBase, db_base.CommonDbMixin):
         res = {}
         key_list = ('id', 'tenant_id', 'name', 'description', 'template',
                     'template_source')
-        res.update((key, template[key]) for key in key_list)
+        res.update((key, template[key])
+                   for key in self._requested_keys(key_list, fields))
         return self._fields(res, fields)
 
     def _make_acl_match_dict(self, acl_match_db):
@@ -1325,23 +1330,28 @@ class VnffgPluginDbMixin(vnffg.VNFFGPluginBase, db_base.CommonDbMixin):
 
     def _make_classifier_dict(self, classifier_db, fields=None):
         LOG.debug('classifier_db %s', classifier_db)
-        LOG.debug('classifier_db match %s', classifier_db.match)
-        res = {
-            'match': self._make_acl_match_dict(classifier_db.match)
-        }
+        res = {}
+        if not fields or 'match' in fields:
+            LOG.debug('classifier_db match %s', classifier_db.match)
+            res['match'] = self._make_acl_match_dict(classifier_db.match)
         key_list = ('id', 'name', 'tenant_id', 'instance_id', 'status',
                     'chain_id', 'nfp_id')
-        res.update((key, classifier_db[key]) for key in key_list)
+        res.update((key, classifier_db[key])
+                   for key in self._requested_keys(key_list, fields))
         return self._fields(res, fields)
 
     def _make_nfp_dict(self, nfp_db, fields=None):
         LOG.debug('nfp_db %s', nfp_db)
-        res = {'chain_id': nfp_db.chain['id'],
-               'classifier_ids': [classifier['id'] for classifier in
-                               nfp_db.classifiers]}
+        res = {}
+        if not fields or 'chain_id' in fields:
+            res['chain_id'] = nfp_db.chain['id']
+        if not fields or 'classifier_ids' in fields:
+            res['classifier_ids'] = [classifier['id'] for classifier in
+                                     nfp_db.classifiers]
         key_list = ('name', 'id', 'tenant_id', 'symmetrical', 'status',
                     'path_id', 'vnffg_id')
-        res.update((key, nfp_db[key]) for key in key_list)
+        res.update((key, nfp_db[key])
+                   for key in self._requested_keys(key_list, fields))
         return self._fields(res, fields)
 
     def _make_chain_dict(self, chain_db, fields=None):
@@ -1349,7 +1359,8 @@ class VnffgPluginDbMixin(vnffg.VNFFGPluginBase, db_base.CommonDbMixin):
         res = {}
         key_list = ('id', 'tenant_id', 'symmetrical', 'status', 'chain',
                     'path_id', 'nfp_id', 'instance_id')
-        res.update((key, chain_db[key]) for key in key_list)
+        res.update((key, chain_db[key])
+                   for key in self._requested_keys(key_list, fields))
         return self._fields(res, fields)
 
     def _get_resource(self, context, model, res_id):
@@ -38,6 +38,7 @@ from tacker.db import types
 from tacker.extensions import vnfm
 from tacker import manager
 from tacker.plugins.common import constants
+from tacker.vnfm import resource_cache
 
 LOG = logging.getLogger(__name__)
 _ACTIVE_UPDATE = (constants.ACTIVE, constants.PENDING_UPDATE)
@@ -74,6 +75,10 @@ class VNFD(model_base.BASE, models_v1.HasId, models_v1.HasTenant,
     # vnfd template source - inline or onboarded
     template_source = sa.Column(sa.String(255), server_default='onboarded')
 
+    # JSON model of the parsed template, see tacker.tosca.vnfd_model,
+    # a MEDIUMTEXT on MySQL
+    model = sa.Column(sa.TEXT(16777215), nullable=True)
+
     __table_args__ = (
         schema.UniqueConstraint(
             "tenant_id",
@@ -131,7 +136,10 @@ class VNF(model_base.BASE, models_v1.HasId, models_v1.HasTenant,
     # opaque string.
     # e.g. (driver, mgmt_url) = (ssh, ip address), ...
     mgmt_url = sa.Column(sa.String(255), nullable=True)
-    attributes = orm.relationship("VNFAttribute", backref="vnf")
+    # (key, value) pairs of the attributes of the vnf, NULL until the
+    # vnf_attribute rows of a vnf created before it are migrated
+    attributes = sa.Column(types.Json, nullable=True)
+    legacy_attributes = orm.relationship("VNFAttribute", backref="vnf")
 
     status = sa.Column(sa.String(64), nullable=False)
     vim_id = sa.Column(types.Uuid, sa.ForeignKey('vims.id'), nullable=False)
@@ -153,6 +161,10 @@ class VNFAttribute(model_base.BASE, models_v1.HasId):
 
     key value pair is adopted for being agnostic to actuall manager of VMs.
     The interpretation is up to actual driver of hosting vnf.
+
+    Deprecated: the attributes are now stored in the attributes column of
+    the vnf, the rows left are migrated when their vnf is written or by
+    ``tacker-db-manage migrate_vnf_attributes``.
     """
 
     __tablename__ = 'vnf_attribute'
@@ -178,11 +190,11 @@ class VNFMPluginDb(vnfm.VNFMPluginBase, db_base.CommonDbMixin):
         super(VNFMPluginDb, self).__init__()
         self._cos_db_plg = common_services_db_plugin.CommonServicesPluginDb()
 
-    def _get_resource(self, context, model, id):
+    def _get_resource(self, context, model, id, options=None):
         try:
             if uuidutils.is_uuid_like(id):
-                return self._get_by_id(context, model, id)
-            return self._get_by_name(context, model, id)
+                return self._get_by_id(context, model, id, options=options)
+            return self._get_by_name(context, model, id, options=options)
         except orm_exc.NoResultFound:
             if issubclass(model, VNFD):
                 raise vnfm.VNFDNotFound(vnfd_id=id)
@@ -200,33 +212,66 @@ class VNFMPluginDb(vnfm.VNFMPluginBase, db_base.CommonDbMixin):
         return [service_type.service_type
                 for service_type in service_types]
 
+    @staticmethod
+    def _vnfd_load_options(fields=None, path=None):
+        """Return the loader options of the relationships of VNFDs.
+
+        Only the relationships needed by the `fields` of the dicts are
+        loaded, each by one query for all the rows.
+        """
+        path = path or orm
+        options = []
+        if not fields or 'attributes' in fields:
+            options.append(path.subqueryload(VNFD.attributes))
+        if not fields or 'service_types' in fields:
+            options.append(path.subqueryload(VNFD.service_types))
+        return options
+
+    @classmethod
+    def _vnf_load_options(cls, fields=None):
+        """Return the loader options of the relationships of VNFs."""
+        options = []
+        if not fields or 'vnfd' in fields:
+            options.append(orm.joinedload(VNF.vnfd))
+            options.extend(cls._vnfd_load_options(
+                path=orm.joinedload(VNF.vnfd)))
+        return options
+
     def _make_vnfd_dict(self, vnfd, fields=None):
-        res = {
-            'attributes': self._make_attributes_dict(vnfd['attributes']),
-            'service_types': self._make_service_types_list(
+        res = {}
+        if not fields or 'attributes' in fields:
+            res['attributes'] = self._make_attributes_dict(
+                vnfd['attributes'])
+        if not fields or 'service_types' in fields:
+            res['service_types'] = self._make_service_types_list(
                 vnfd.service_types)
-        }
         key_list = ('id', 'tenant_id', 'name', 'description',
                     'mgmt_driver', 'created_at', 'updated_at',
-                    'template_source')
-        res.update((key, vnfd[key]) for key in key_list)
+                    'template_source', 'model')
+        res.update((key, vnfd[key])
+                   for key in self._requested_keys(key_list, fields))
         return self._fields(res, fields)
 
-    def _make_dev_attrs_dict(self, dev_attrs_db):
-        return dict((arg.key, arg.value) for arg in dev_attrs_db)
+    def _make_dev_attrs_dict(self, vnf_db):
+        if vnf_db.attributes is not None:
+            return dict(vnf_db.attributes)
+        # not migrated yet, its rows are loaded by one more query
+        return dict((arg.key, arg.value)
+                    for arg in vnf_db.legacy_attributes)
 
     def _make_vnf_dict(self, vnf_db, fields=None):
         LOG.debug('vnf_db %s', vnf_db)
-        LOG.debug('vnf_db attributes %s', vnf_db.attributes)
-        res = {
-            'vnfd':
-            self._make_vnfd_dict(vnf_db.vnfd),
-            'attributes': self._make_dev_attrs_dict(vnf_db.attributes),
-        }
+        res = {}
+        if not fields or 'vnfd' in fields:
+            res['vnfd'] = self._make_vnfd_dict(vnf_db.vnfd)
+        if not fields or 'attributes' in fields:
+            res['attributes'] = self._make_dev_attrs_dict(vnf_db)
+            LOG.debug('vnf_db attributes %s', res['attributes'])
         key_list = ('id', 'tenant_id', 'name', 'description', 'instance_id',
                     'vim_id', 'placement_attr', 'vnfd_id', 'status',
                     'mgmt_url', 'error_reason', 'created_at', 'updated_at')
-        res.update((key, vnf_db[key]) for key in key_list)
+        res.update((key, vnf_db[key])
+                   for key in self._requested_keys(key_list, fields))
         return self._fields(res, fields)
 
     @staticmethod
@@ -262,6 +307,7 @@ class VNFMPluginDb(vnfm.VNFMPluginBase, db_base.CommonDbMixin):
                     description=vnfd.get('description'),
                     mgmt_driver=mgmt_driver,
                     template_source=template_source,
+                    model=vnfd.get('model'),
                     deleted_at=datetime.min)
                 context.session.add(vnfd_db)
                 for (key, value) in vnfd.get('attributes', {}).items():
@@ -341,7 +387,8 @@ class VNFMPluginDb(vnfm.VNFMPluginBase, db_base.CommonDbMixin):
                 context.session.delete(vnfd_db)
 
     def get_vnfd(self, context, vnfd_id, fields=None):
-        vnfd_db = self._get_resource(context, VNFD, vnfd_id)
+        vnfd_db = self._get_resource(context, VNFD, vnfd_id,
+                                     options=self._vnfd_load_options())
         return self._make_vnfd_dict(vnfd_db)
 
     def get_vnfds(self, context, filters, fields=None):
@@ -350,7 +397,8 @@ class VNFMPluginDb(vnfm.VNFMPluginBase, db_base.CommonDbMixin):
                 filters.pop('template_source')
         return self._get_collection(context, VNFD,
                                     self._make_vnfd_dict,
-                                    filters=filters, fields=fields)
+                                    filters=filters, fields=fields,
+                                    options=self._vnfd_load_options(fields))
 
     def choose_vnfd(self, context, service_type,
                     required_attributes=None):
@@ -376,63 +424,64 @@ class VNFMPluginDb(vnfm.VNFMPluginBase, db_base.CommonDbMixin):
             if vnfd_db:
                 return self._make_vnfd_dict(vnfd_db)
 
-    def _vnf_attribute_update_or_create(
-            self, context, vnf_id, key, value):
-        arg = (self._model_query(context, VNFAttribute).
-               filter(VNFAttribute.vnf_id == vnf_id).
-               filter(VNFAttribute.key == key).first())
-        if arg:
-            arg.value = value
-        else:
-            arg = VNFAttribute(
-                id=uuidutils.generate_uuid(), vnf_id=vnf_id,
-                key=key, value=value)
-            context.session.add(arg)
+    def _set_vnf_attributes(self, context, vnf_db, attributes):
+        """Store the attributes of a vnf, but its decrypted vim auth."""
+        if vnf_db.attributes is None:
+            # migrate the vnf, its attributes are no longer read from rows
+            (context.session.query(VNFAttribute).
+             filter(VNFAttribute.vnf_id == vnf_db.id).
+             delete(synchronize_session='fetch'))
+        vnf_db.attributes = dict(
+            (key, value) for key, value in attributes.items()
+            if 'vim_auth' not in key)
 
     # called internally, not by REST API
     def _create_vnf_pre(self, context, vnf):
-        LOG.debug('vnf %s', vnf)
-        tenant_id = self._get_tenant_id_for_create(context, vnf)
-        vnfd_id = vnf['vnfd_id']
-        name = vnf.get('name')
-        vnf_id = uuidutils.generate_uuid()
-        attributes = vnf.get('attributes', {})
-        vim_id = vnf.get('vim_id')
-        placement_attr = vnf.get('placement_attr', {})
+        return self._create_vnfs_pre(context, [vnf])[0]
+
+    def _create_vnfs_pre(self, context, vnfs):
+        """Insert the rows of VNFs to create, all in one transaction."""
+        vnf_dbs = []
         try:
             with context.session.begin(subtransactions=True):
-                vnfd_db = self._get_resource(context, VNFD,
-                                             vnfd_id)
-                vnf_db = VNF(id=vnf_id,
-                             tenant_id=tenant_id,
-                             name=name,
-                             description=vnfd_db.description,
-                             instance_id=None,
-                             vnfd_id=vnfd_id,
-                             vim_id=vim_id,
-                             placement_attr=placement_attr,
-                             status=constants.PENDING_CREATE,
-                             error_reason=None,
-                             deleted_at=datetime.min)
-                context.session.add(vnf_db)
-                for key, value in attributes.items():
-                        arg = VNFAttribute(
-                            id=uuidutils.generate_uuid(), vnf_id=vnf_id,
-                            key=key, value=value)
-                        context.session.add(arg)
+                vnfd_dbs = {}
+                for vnf in vnfs:
+                    LOG.debug('vnf %s', vnf)
+                    vnfd_id = vnf['vnfd_id']
+                    if vnfd_id not in vnfd_dbs:
+                        vnfd_dbs[vnfd_id] = self._get_resource(
+                            context, VNFD, vnfd_id)
+                    vnf_id = uuidutils.generate_uuid()
+                    vnf_db = VNF(id=vnf_id,
+                                 tenant_id=self._get_tenant_id_for_create(
+                                     context, vnf),
+                                 name=vnf.get('name'),
+                                 description=vnfd_dbs[vnfd_id].description,
+                                 instance_id=None,
+                                 vnfd_id=vnfd_id,
+                                 vim_id=vnf.get('vim_id'),
+                                 placement_attr=vnf.get('placement_attr', {}),
+                                 status=constants.PENDING_CREATE,
+                                 error_reason=None,
+                                 deleted_at=datetime.min)
+                    vnf_db.attributes = dict(vnf.get('attributes', {}))
+                    context.session.add(vnf_db)
+                    vnf_dbs.append(vnf_db)
         except DBDuplicateEntry as e:
             raise exceptions.DuplicateEntity(
                 _type="vnf",
                 entry=e.columns)
         evt_details = "VNF UUID assigned."
-        self._cos_db_plg.create_event(
-            context, res_id=vnf_id,
-            res_type=constants.RES_TYPE_VNF,
-            res_state=constants.PENDING_CREATE,
-            evt_type=constants.RES_EVT_CREATE,
-            tstamp=vnf_db[constants.RES_EVT_CREATED_FLD],
-            details=evt_details)
-        return self._make_vnf_dict(vnf_db)
+        with context.session.begin(subtransactions=True):
+            for vnf_db in vnf_dbs:
+                self._cos_db_plg.create_event(
+                    context, res_id=vnf_db.id,
+                    res_type=constants.RES_TYPE_VNF,
+                    res_state=constants.PENDING_CREATE,
+                    evt_type=constants.RES_EVT_CREATE,
+                    tstamp=vnf_db[constants.RES_EVT_CREATED_FLD],
+                    details=evt_details)
+        return [self._make_vnf_dict(vnf_db) for vnf_db in vnf_dbs]
 
     # called internally, not by REST API
     # intsance_id = None means error on creation
@@ -445,14 +494,13 @@ class VNFMPluginDb(vnfm.VNFMPluginBase, db_base.CommonDbMixin):
                      filter(VNF.status.in_(CREATE_STATES)).
                      one())
             query.update({'instance_id': instance_id, 'mgmt_url': mgmt_url})
+            resource_cache.invalidate(vnf_id)
             if instance_id is None or vnf_dict['status'] == constants.ERROR:
                 query.update({'status': constants.ERROR})
 
-            for (key, value) in vnf_dict['attributes'].items():
-                # do not store decrypted vim auth in vnf attr table
-                if 'vim_auth' not in key:
-                    self._vnf_attribute_update_or_create(context, vnf_id,
-                                                         key, value)
+            attributes = self._make_dev_attrs_dict(query)
+            attributes.update(vnf_dict['attributes'])
+            self._set_vnf_attributes(context, query, attributes)
         evt_details = ("Infra Instance ID created: %s and "
                        "Mgmt URL set: %s") % (instance_id, mgmt_url)
         self._cos_db_plg.create_event(
@@ -468,6 +516,7 @@ class VNFMPluginDb(vnfm.VNFMPluginBase, db_base.CommonDbMixin):
                      filter(VNF.id == vnf_id).
                      filter(VNF.status.in_(CREATE_STATES)).one())
             query.update({'status': new_status})
+            resource_cache.invalidate(vnf_id)
             self._cos_db_plg.create_event(
                 context, res_id=vnf_id,
                 res_type=constants.RES_TYPE_VNF,
@@ -487,6 +536,7 @@ class VNFMPluginDb(vnfm.VNFMPluginBase, db_base.CommonDbMixin):
         if vnf_db.status == constants.PENDING_UPDATE:
             raise vnfm.VNFInUse(vnf_id=vnf_id)
         vnf_db.update({'status': new_status})
+        resource_cache.invalidate(vnf_id)
         return vnf_db
 
     def _update_vnf_scaling_status(self,
@@ -531,17 +581,12 @@ class VNFMPluginDb(vnfm.VNFMPluginBase, db_base.CommonDbMixin):
              filter(VNF.status == constants.PENDING_UPDATE).
              update({'status': new_status,
                      'updated_at': updated_time_stamp}))
+            resource_cache.invalidate(vnf_id)
 
-            dev_attrs = new_vnf_dict.get('attributes', {})
-            (context.session.query(VNFAttribute).
-             filter(VNFAttribute.vnf_id == vnf_id).
-             filter(~VNFAttribute.key.in_(dev_attrs.keys())).
-             delete(synchronize_session='fetch'))
-
-            for (key, value) in dev_attrs.items():
-                if 'vim_auth' not in key:
-                    self._vnf_attribute_update_or_create(context, vnf_id,
-                                                         key, value)
+            vnf_db = (self._model_query(context, VNF).
+                      filter(VNF.id == vnf_id).one())
+            self._set_vnf_attributes(context, vnf_db,
+                                     new_vnf_dict.get('attributes', {}))
         self._cos_db_plg.create_event(
             context, res_id=vnf_id,
             res_type=constants.RES_TYPE_VNF,
@@ -572,6 +617,7 @@ class VNFMPluginDb(vnfm.VNFMPluginBase, db_base.CommonDbMixin):
 
     def _delete_vnf_post(self, context, vnf_dict, error, soft_delete=True):
         vnf_id = vnf_dict['id']
+        resource_cache.invalidate(vnf_id)
         with context.session.begin(subtransactions=True):
             query = (
                 self._model_query(context, VNF).
@@ -643,12 +689,59 @@ class VNFMPluginDb(vnfm.VNFMPluginBase, db_base.CommonDbMixin):
                               soft_delete=soft_delete)
 
     def get_vnf(self, context, vnf_id, fields=None):
-        vnf_db = self._get_resource(context, VNF, vnf_id)
+        options = (self._vnf_load_options(fields) +
+                   self._defer_columns_options(VNF, fields))
+        vnf_db = self._get_resource(context, VNF, vnf_id, options=options)
         return self._make_vnf_dict(vnf_db, fields)
 
     def get_vnfs(self, context, filters=None, fields=None):
         return self._get_collection(context, VNF, self._make_vnf_dict,
-                                    filters=filters, fields=fields)
+                                    filters=filters, fields=fields,
+                                    options=self._vnf_load_options(fields))
+
+    def get_monitored_vnfs(self, context, page_size=500):
+        """Yield ACTIVE vnfs having a monitoring policy, page by page.
+
+        Each page is one query on vnf which only loads the fields needed
+        to monitor a vnf, vnfs are paged by id. The policies of the vnfs
+        whose attributes are not migrated are read by one more query.
+        """
+        last_id = None
+        while True:
+            query = (context.session.query(
+                VNF.id, VNF.status, VNF.mgmt_url, VNF.attributes).
+                filter(VNF.status == constants.ACTIVE).
+                filter(VNF.mgmt_url.isnot(None)).
+                filter(VNF.deleted_at == datetime.min).
+                filter(sa.or_(
+                    VNF.attributes.is_(None),
+                    sa.type_coerce(VNF.attributes, sa.Text).like(
+                        '%"monitoring_policy"%'))).
+                order_by(VNF.id))
+            if last_id is not None:
+                query = query.filter(VNF.id > last_id)
+            rows = query.limit(page_size).all()
+            legacy_ids = [row[0] for row in rows if row[3] is None]
+            legacy_policies = {}
+            if legacy_ids:
+                legacy_policies = dict(context.session.query(
+                    VNFAttribute.vnf_id, VNFAttribute.value).
+                    filter(VNFAttribute.vnf_id.in_(legacy_ids)).
+                    filter(VNFAttribute.key == 'monitoring_policy'))
+            for vnf_id, status, mgmt_url, vnf_attrs in rows:
+                if vnf_attrs is None:
+                    monitoring_policy = legacy_policies.get(vnf_id)
+                else:
+                    monitoring_policy = vnf_attrs.get('monitoring_policy')
+                if monitoring_policy is None:
+                    continue
+                yield {'id': vnf_id,
+                       'status': status,
+                       'mgmt_url': mgmt_url,
+                       'attributes': {'monitoring_policy': monitoring_policy}}
+            if len(rows) < page_size:
+                return
+            last_id = rows[-1][0]
 
     def set_vnf_error_status_reason(self, context, vnf_id, new_reason):
         with context.session.begin(subtransactions=True):
@@ -670,6 +763,7 @@ class VNFMPluginDb(vnfm.VNFMPluginBase, db_base.CommonDbMixin):
                 return False
 
             vnf_db.update({'status': new_status})
+            resource_cache.invalidate(vnf_id)
             self._cos_db_plg.create_event(
                 context, res_id=vnf_id,
                 res_type=constants.RES_TYPE_VNF,
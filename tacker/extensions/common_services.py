@@ -154,5 +154,6 @@ class CommonServicesPluginBase(service_base.NFVPluginBase):
 
     @abc.abstractmethod
     def get_events(self, context, filters=None, fields=None, sorts=None,
-                   limit=None, marker_obj=None, page_reverse=False):
+                   limit=None, marker_obj=None, page_reverse=False,
+                   marker=None):
         pass
@@ -168,6 +168,10 @@ class InvalidKubernetesInputParameter(exceptions.InvalidInput):
     message = _("Found unsupported keys for %(found_keys)s ")
 
 
+class KubernetesObjectsCreateFailed(exceptions.TackerException):
+    message = _("Failed to create Kubernetes objects: %(failures)s")
+
+
 def _validate_service_type_list(data, valid_values=None):
     if not isinstance(data, list):
         msg = _("Invalid data format for service list: '%s'") % data
@@ -484,8 +488,15 @@ class Vnfm(extensions.ExtensionDescriptor):
         plural_mappings['service_types'] = 'service_type'
         attr.PLURALS.update(plural_mappings)
         resources = resource_helper.build_resource_info(
-            plural_mappings, RESOURCE_ATTRIBUTE_MAP, constants.VNFM,
-            translate_name=True)
+            plural_mappings,
+            dict((collection_name, params) for collection_name, params
+                 in RESOURCE_ATTRIBUTE_MAP.items()
+                 if collection_name != 'vnfs'),
+            constants.VNFM, translate_name=True)
+        # only vnfs are created in bulk, by VNFMPlugin.create_vnf_bulk
+        resources.extend(resource_helper.build_resource_info(
+            plural_mappings, {'vnfs': RESOURCE_ATTRIBUTE_MAP['vnfs']},
+            constants.VNFM, translate_name=True, allow_bulk=True))
         plugin = manager.TackerManager.get_service_plugins()[
             constants.VNFM]
         for collection_name in SUB_RESOURCE_ATTRIBUTE_MAP:
@@ -19,7 +19,6 @@ import six
 import yaml
 
 from keystoneauth1 import exceptions
-from keystoneauth1 import identity
 from keystoneauth1.identity import v2
 from keystoneauth1.identity import v3
 from keystoneauth1 import session
@@ -29,6 +28,7 @@ from oslo_config import cfg
 from oslo_log import log as logging
 
 from tacker._i18n import _
+from tacker.common import clients
 from tacker.common import log
 from tacker.extensions import nfvo
 from tacker.keymgr import API as KEYMGR_API
@@ -37,6 +37,8 @@ from tacker.nfvo.drivers.vim import abstract_vim_driver
 from tacker.nfvo.drivers.vnffg import abstract_vnffg_driver
 from tacker.nfvo.drivers.workflow import workflow_generator
 from tacker.plugins.common import constants
+from tacker.vnfm.infra_drivers.openstack import heat_client as hc
+from tacker.vnfm.infra_drivers.openstack import translate_template
 from tacker.vnfm import keystone
 
 LOG = logging.getLogger(__name__)
@@ -206,9 +208,28 @@ class OpenStack_Driver(abstract_vim_driver.VimAbstractDriver,
 
         ks_client = self.authenticate_vim(vim_obj)
         self.discover_placement_attr(vim_obj, ks_client)
+        self.load_resource_schemas(vim_obj, ks_client)
         self.encode_vim_auth(context, vim_obj['id'], vim_obj['auth_cred'])
         LOG.debug('VIM registration completed for %s', vim_obj)
 
+    def load_resource_schemas(self, vim_obj, ks_client):
+        """Cache the Heat resource type schemas used to create VNFs
+
+        They are fetched again for every region, as registering an
+        existing VIM refreshes them.
+        """
+        for region_name in vim_obj['placement_attr']['regions']:
+            try:
+                hc.load_resource_schemas(
+                    ks_client.session, vim_obj['auth_url'], region_name,
+                    translate_template.HEAT_VERSION_INCOMPATIBILITY_MAP)
+            except Exception as e:
+                # they are fetched again when a VNF is created
+                LOG.warning('Failed to load the Heat resource schemas of '
+                            'region %(region)s of vim %(vim)s: %(error)s',
+                            {'region': region_name, 'vim': vim_obj['id'],
+                             'error': e})
+
     @log.log
     def deregister_vim(self, context, vim_obj):
         """Deregister VIM from NFVO
@@ -216,6 +237,7 @@ class OpenStack_Driver(abstract_vim_driver.VimAbstractDriver,
         Delete VIM keys from file system
         """
         self.delete_vim_auth(context, vim_obj['id'], vim_obj['auth_cred'])
+        hc.invalidate_resource_schemas(vim_obj['auth_url'])
 
     @log.log
     def delete_vim_auth(self, context, vim_id, auth):
@@ -673,7 +695,7 @@ class OpenStack_Driver(abstract_vim_driver.VimAbstractDriver,
             raise EnvironmentError('auth dict required for'
                                    ' mistral workflow driver')
         return mistral_client.MistralClient(
-            keystone.Keystone().initialize_client('2', **auth_dict),
+            clients.get_keystone_client(auth_dict, version='2'),
             auth_dict['token']).get_client()
 
     def prepare_and_create_workflow(self, resource, action,
@@ -727,10 +749,7 @@ class NeutronClient(object):
     """Neutron Client class for networking-sfc driver"""
 
     def __init__(self, auth_attr):
-        auth_cred = auth_attr.copy()
-        verify = 'True' == auth_cred.pop('cert_verify', 'True') or False
-        auth = identity.Password(**auth_cred)
-        sess = session.Session(auth=auth, verify=verify)
+        sess = clients.get_keystone_client(auth_attr).session
         self.client = neutron_client.Client(session=sess)
 
     def flow_classifier_show(self, fc_id):
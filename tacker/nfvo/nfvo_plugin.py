@@ -30,6 +30,7 @@ from tempfile import mkstemp
 from toscaparser.tosca_template import ToscaTemplate
 
 from tacker._i18n import _
+from tacker.common import clients
 from tacker.common import driver_manager
 from tacker.common import log
 from tacker.common import utils
@@ -183,6 +184,8 @@ class NfvoPlugin(nfvo_db_plugin.NfvoPluginDb, vnffg_db.VnffgPluginDbMixin,
 
             vim_obj = super(NfvoPlugin, self).update_vim(
                 context, vim_id, vim_obj)
+            if 'auth_cred' in update_args:
+                clients.invalidate(old_vim_obj['auth_url'])
             if old_auth_need_delete:
                 try:
                     self._vim_drivers.invoke(vim_type,
@@ -219,9 +222,13 @@ class NfvoPlugin(nfvo_db_plugin.NfvoPluginDb, vnffg_db.VnffgPluginDbMixin,
         except Exception:
             LOG.exception("Failed to remove vim monitor")
         super(NfvoPlugin, self).delete_vim(context, vim_id)
+        clients.invalidate(vim_obj['auth_url'])
 
     @log.log
     def monitor_vim(self, context, vim_obj):
+        if not CONF.vim_monitor.mistral_workflow:
+            # VIMs are checked by the VIM health monitor of the conductor
+            return
         auth_dict = self.get_auth_dict(context)
         vim_monitor_utils.monitor_vim(auth_dict, vim_obj)
 
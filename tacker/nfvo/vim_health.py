@@ -0,0 +1,213 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Reachability monitor of all registered VIMs.
+
+One thread pings every VIM in a single ICMP pass per round, instead of
+one Mistral action per VIM pinging it in a loop. A VIM changes status
+only after several rounds agree, and only the changes are reported.
+With several tacker-conductors, each VIM is checked by one of them.
+"""
+
+from datetime import datetime
+import threading
+import time
+
+from oslo_config import cfg
+from oslo_log import log as logging
+from oslo_utils import netutils
+
+from tacker.agent.linux import icmp
+from tacker.agent.linux import utils as linux_utils
+from tacker.common import metrics
+from tacker import context as t_context
+from tacker.db.nfvo import nfvo_db
+
+
+LOG = logging.getLogger(__name__)
+OPTS = [
+    cfg.BoolOpt('mistral_workflow',
+                default=False,
+                deprecated_for_removal=True,
+                help=_('Monitor every VIM with its own Mistral workflow '
+                       'instead of the VIM health monitor of '
+                       'tacker-conductor')),
+    cfg.IntOpt('check_intvl',
+               default=10, min=1,
+               help=_('Seconds between two rounds of VIM checks')),
+    cfg.IntOpt('unreachable_threshold',
+               default=3, min=1,
+               help=_('Number of consecutive failed checks after which a '
+                      'VIM is reported UNREACHABLE')),
+    cfg.IntOpt('reachable_threshold',
+               default=1, min=1,
+               help=_('Number of consecutive passed checks after which a '
+                      'VIM is reported REACHABLE')),
+    cfg.IntOpt('member_timeout',
+               default=30, min=1,
+               help=_('Seconds after its last heartbeat at which a '
+                      'tacker-conductor is no longer assigned VIMs to '
+                      'check')),
+]
+cfg.CONF.register_opts(OPTS, 'vim_monitor')
+# the ping parameters are shared with the Mistral VIM monitor workflow
+for opt in ('count', 'timeout', 'interval'):
+    cfg.CONF.import_opt(opt, 'tacker.nfvo.drivers.vim.openstack_driver',
+                        'vim_monitor')
+
+REACHABLE = 'REACHABLE'
+UNREACHABLE = 'UNREACHABLE'
+
+ROUND_SECONDS = metrics.histogram(
+    'tacker_vim_health_round_seconds',
+    'Duration of one round of checks of every VIM')
+PINGS = metrics.counter(
+    'tacker_vim_pings_total', 'VIM reachability checks by their result',
+    ['vim_id', 'result'])
+
+
+def config_opts():
+    return [('vim_monitor', OPTS)]
+
+
+def vim_target_ip(auth_url, vim_type):
+    """Return the address pinged to check a VIM."""
+    if vim_type == 'kubernetes':
+        return auth_url.split("//")[-1].split(":")[0]
+    return auth_url.split("//")[-1].split(":")[0].split("/")[0]
+
+
+class VimHealth(object):
+    """Status of one VIM with hysteresis."""
+
+    def __init__(self, status):
+        self.status = status
+        self.candidate = None
+        self.count = 0
+
+    def update(self, status, thresholds):
+        """Record a check result, returning the new status if it changed."""
+        if status == self.status:
+            self.count = 0
+            return None
+        if status != self.candidate:
+            self.candidate = status
+            self.count = 0
+        self.count += 1
+        if self.count < thresholds[status]:
+            return None
+        self.status = status
+        self.count = 0
+        return status
+
+
+class VimHealthMonitor(object):
+    """Checks all registered VIMs from one thread.
+
+    :param update_cb: called with (context, vim_id, status) when the
+        status of a VIM changes.
+    :param partition: a tacker.service.Partition, only the VIMs it owns
+        are checked.
+    """
+
+    def __init__(self, update_cb, partition=None):
+        self._update_cb = update_cb
+        self._partition = partition
+        self._health = {}   # vim_id => VimHealth
+        self._icmp_available = True
+
+    def start(self):
+        LOG.debug('Spawning VIM health monitor thread')
+        monitor = threading.Thread(target=self._run)
+        monitor.daemon = True
+        monitor.start()
+
+    def _run(self):
+        while(1):
+            started = time.time()
+            try:
+                with ROUND_SECONDS.time():
+                    self.check_vims()
+            except Exception:
+                LOG.exception('VIM health check failed')
+            time.sleep(max(0, cfg.CONF.vim_monitor.check_intvl -
+                           (time.time() - started)))
+
+    @staticmethod
+    def _load_vims(context):
+        query = context.session.query(
+            nfvo_db.Vim.id, nfvo_db.Vim.type, nfvo_db.Vim.status,
+            nfvo_db.VimAuth.auth_url).join(
+                nfvo_db.VimAuth, nfvo_db.VimAuth.vim_id == nfvo_db.Vim.id).\
+            filter(nfvo_db.Vim.deleted_at == datetime.min)
+        return dict((vim_id, (vim_target_ip(auth_url, vim_type), status))
+                    for vim_id, vim_type, status, auth_url in query)
+
+    def check_vims(self):
+        context = t_context.get_admin_context()
+        vims = self._load_vims(context)
+        if self._partition is not None:
+            self._partition.refresh()
+            vims = dict((vim_id, vim) for vim_id, vim in vims.items()
+                        if self._partition.owns(vim_id))
+        for vim_id in set(self._health) - set(vims):
+            del self._health[vim_id]
+        if not vims:
+            return
+
+        rtts = self._ping(set(target for target, _status in vims.values()))
+        thresholds = {REACHABLE: cfg.CONF.vim_monitor.reachable_threshold,
+                      UNREACHABLE: cfg.CONF.vim_monitor.unreachable_threshold}
+        for vim_id, (target, status) in vims.items():
+            health = self._health.get(vim_id)
+            if health is None:
+                health = self._health[vim_id] = VimHealth(status)
+            result = REACHABLE if rtts.get(target) is not None \
+                else UNREACHABLE
+            PINGS.inc(vim_id=vim_id, result=result)
+            new_status = health.update(result, thresholds)
+            if new_status is None:
+                continue
+            LOG.info("VIM %s changed to status %s", vim_id, new_status)
+            try:
+                self._update_cb(context, vim_id, new_status)
+            except Exception:
+                LOG.exception('Failed to update status of vim %s', vim_id)
+                # report it again after the next check
+                health.status = status
+
+    def _ping(self, targets):
+        count = cfg.CONF.vim_monitor.count
+        timeout = cfg.CONF.vim_monitor.timeout
+        interval = cfg.CONF.vim_monitor.interval
+        rtts = {}
+        icmp_targets = set(target for target in targets
+                           if self._icmp_available and
+                           netutils.is_valid_ipv4(target))
+        if icmp_targets:
+            try:
+                rtts = icmp.ping(icmp_targets, count, timeout, interval)
+            except icmp.IcmpUnavailable as e:
+                LOG.warning('%s, falling back to the ping command', e)
+                self._icmp_available = False
+                icmp_targets = set()
+
+        for target in targets - icmp_targets:
+            ping_cmd = ['ping', '-c', count, '-W', timeout, '-i', interval,
+                        target]
+            try:
+                linux_utils.execute(ping_cmd, check_exit_code=True,
+                                    debuglog=False)
+                rtts[target] = 0
+            except RuntimeError:
+                rtts[target] = None
+        return rtts
@@ -15,11 +15,12 @@ import yaml
 from oslo_config import cfg
 from oslo_log import log as logging
 
+from tacker.common import clients
 from tacker.common import rpc
 from tacker.mistral.actionrpc import kill_action as killaction
 from tacker.mistral import mistral_client
+from tacker.nfvo import vim_health
 from tacker.nfvo.workflows.vim_monitor import workflow_generator
-from tacker.vnfm import keystone
 
 
 LOG = logging.getLogger(__name__)
@@ -27,7 +28,7 @@ LOG = logging.getLogger(__name__)
 
 def get_mistral_client(auth_dict):
     return mistral_client.MistralClient(
-        keystone.Keystone().initialize_client('2', **auth_dict),
+        clients.get_keystone_client(auth_dict, version='2'),
         auth_dict['token']).get_client()
 
 
@@ -61,12 +62,7 @@ def delete_workflow(mistral_client, vim_id):
 
 def monitor_vim(auth_dict, vim_obj):
     mc = get_mistral_client(auth_dict)
-    auth_url = vim_obj["auth_url"]
-    vim_type = vim_obj['type']
-    if vim_type == 'openstack':
-        vim_ip = auth_url.split("//")[-1].split(":")[0].split("/")[0]
-    elif vim_type == 'kubernetes':
-        vim_ip = auth_url.split("//")[-1].split(":")[0]
+    vim_ip = vim_health.vim_target_ip(vim_obj['auth_url'], vim_obj['type'])
     workflow_input_dict = {
         'vim_id': vim_obj['id'],
         'count': cfg.CONF.vim_monitor.count,
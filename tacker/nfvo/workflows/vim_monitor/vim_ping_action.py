@@ -10,18 +10,29 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
+import time
+
 from mistral.actions import base
 from oslo_config import cfg
 from oslo_log import log as logging
+from oslo_utils import netutils
 
+from tacker.agent.linux import icmp
 from tacker.agent.linux import utils as linux_utils
+from tacker.common import metrics
 from tacker.common import rpc
 from tacker.common import topics
 from tacker.conductor.conductorrpc import vim_monitor_rpc
 from tacker import context as t_context
+from tacker.nfvo import vim_health
 
 LOG = logging.getLogger(__name__)
 
+PING_SECONDS = metrics.histogram(
+    'tacker_vim_ping_seconds', 'Duration of VIM reachability checks',
+    ['vim_id'])
+PINGS = vim_health.PINGS
+
 
 class PingVimAction(base.Action):
 
@@ -34,6 +45,7 @@ class PingVimAction(base.Action):
         self.targetip = targetip
         self.vim_id = vim_id
         self.current_status = "PENDING"
+        self.icmp_available = True
 
     def start_rpc_listeners(self):
         """Start the RPC loop to let the server communicate with actions."""
@@ -47,7 +59,36 @@ class PingVimAction(base.Action):
     def killAction(self, context, **kwargs):
         self.killed = True
 
+    def _icmp_ping(self):
+        try:
+            rtts = icmp.ping([self.targetip], self.count, self.timeout,
+                             self.interval)
+        except icmp.IcmpUnavailable as e:
+            LOG.warning('%s, falling back to the ping command', e)
+            self.icmp_available = False
+            return None
+
+        if rtts[self.targetip] is None:
+            LOG.warning(("Cannot ping ip address: %s"), self.targetip)
+            return 'UNREACHABLE'
+        return 'REACHABLE'
+
     def _ping(self):
+        result = 'error'
+        start = time.time()
+        try:
+            result = self._do_ping()
+            return result
+        finally:
+            PING_SECONDS.observe(time.time() - start, vim_id=self.vim_id)
+            PINGS.inc(vim_id=self.vim_id, result=result)
+
+    def _do_ping(self):
+        if self.icmp_available and netutils.is_valid_ipv4(self.targetip):
+            status = self._icmp_ping()
+            if status is not None:
+                return status
+
         ping_cmd = ['ping', '-c', self.count,
                     '-W', self.timeout,
                     '-i', self.interval,
@@ -88,7 +129,7 @@ class PingVimAction(base.Action):
                 status = self._ping()
                 if self.current_status != status:
                     self.current_status = self._update(status)
-                # TODO(gongysh) If we need to sleep a little time here?
+                time.sleep(cfg.CONF.vim_monitor.check_intvl)
         except Exception:
             LOG.exception('failed to run mistral action for vim %s',
                           self.vim_id)
@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime
 import inspect
 import os
 import random
@@ -25,10 +26,13 @@ from oslo_service import loopingcall
 from oslo_service import service
 from oslo_utils import excutils
 from oslo_utils import importutils
+from oslo_utils import timeutils
 
 from tacker.common import config
+from tacker.common import hash_ring
 from tacker.common import rpc as n_rpc
 from tacker import context
+from tacker.db.common_services import common_services_db_plugin
 from tacker import wsgi
 
 
@@ -60,6 +64,73 @@ def config_opts():
 LOG = logging.getLogger(__name__)
 
 
+class Heartbeat(object):
+    """Records that a process is alive under a topic.
+
+    The processes of a topic are the members whose heartbeat is recent
+    enough, they may share work among themselves.
+    """
+
+    def __init__(self, topic, host):
+        self.topic = topic
+        self.host = host
+        self._db = common_services_db_plugin.CommonServicesPluginDb()
+
+    def report_state(self):
+        self._db.report_heartbeat(context.get_admin_context(), self.topic,
+                                  self.host, timeutils.utcnow())
+
+    def get_members(self, timeout):
+        """Return the hosts that reported in the last `timeout` seconds.
+
+        The heartbeats of the other hosts are deleted, a host reporting
+        again later is a member again.
+        """
+        since = timeutils.utcnow() - datetime.timedelta(seconds=timeout)
+        admin_context = context.get_admin_context()
+        self._db.purge_heartbeats(admin_context, self.topic, since)
+        return self._db.get_live_hosts(admin_context, self.topic, since)
+
+    def remove(self):
+        """Delete the heartbeat of this process, e.g. when it stops."""
+        self._db.delete_heartbeat(context.get_admin_context(), self.topic,
+                                  self.host)
+
+
+class Partition(object):
+    """Assigns resources to the live processes of a topic.
+
+    Every process reports a heartbeat under the topic, and the resources
+    are spread over the processes with a recent heartbeat by consistent
+    hashing, so that each one is handled by a single process.
+    """
+
+    def __init__(self, topic, member_timeout, member=None):
+        self.topic = topic
+        self.member = member or '%s:%d' % (cfg.CONF.host, os.getpid())
+        self._member_timeout = member_timeout
+        self._heartbeat = Heartbeat(topic, self.member)
+        self._ring = hash_ring.HashRing([self.member])
+
+    def refresh(self):
+        """Report this process alive and rebuild the ring.
+
+        :return: True if the set of live processes changed.
+        """
+        self._heartbeat.report_state()
+        members = self._heartbeat.get_members(self._member_timeout)
+        members.add(self.member)
+        if members == self._ring.members:
+            return False
+        LOG.info('%(topic)s members changed to %(members)s',
+                 {'topic': self.topic, 'members': sorted(members)})
+        self._ring = hash_ring.HashRing(members)
+        return True
+
+    def owns(self, resource_id):
+        return self._ring.get_member(resource_id) == self.member
+
+
 class WsgiService(service.ServiceBase):
     """Base class for WSGI based services.
 
@@ -153,6 +224,7 @@ class Service(n_rpc.Service):
         self.periodic_fuzzy_delay = periodic_fuzzy_delay
         self.saved_args, self.saved_kwargs = args, kwargs
         self.timers = []
+        self.heartbeat = Heartbeat(topic, host)
         super(Service, self).__init__(host, topic, manager=self.manager)
 
     def start(self):
@@ -230,6 +302,12 @@ class Service(n_rpc.Service):
             except Exception:
                 LOG.exception("Exception occurs when timer stops")
         self.timers = []
+        if self.report_interval:
+            try:
+                self.heartbeat.remove()
+            except Exception:
+                LOG.exception("Failed to remove heartbeat of %s",
+                              self.binary)
 
     def wait(self):
         super(Service, self).wait()
@@ -249,5 +327,7 @@ class Service(n_rpc.Service):
 
     def report_state(self):
         """Update the state of this service."""
-        # Todo(gongysh) report state to neutron server
-        pass
+        try:
+            self.heartbeat.report_state()
+        except Exception:
+            LOG.exception("Failed to report state of %s", self.binary)
@@ -0,0 +1,75 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import socket
+import struct
+
+import mock
+import testtools
+
+from tacker.agent.linux import icmp
+
+
+class FakeIcmpSocket(object):
+    """Answers every echo request of reachable targets at once."""
+
+    def __init__(self, reachable):
+        self.reachable = reachable
+        self.replies = []
+
+    def sendto(self, packet, addr):
+        if addr[0] in self.reachable:
+            reply = struct.pack('!B', icmp.ICMP_ECHO_REPLY) + packet[1:]
+            self.replies.append((reply, addr))
+
+    def settimeout(self, timeout):
+        pass
+
+    def recvfrom(self, bufsize):
+        if not self.replies:
+            raise socket.timeout()
+        return self.replies.pop(0)
+
+    def close(self):
+        pass
+
+
+class TestIcmp(testtools.TestCase):
+
+    def test_echo_request_checksum(self):
+        packet = icmp._echo_request(0x1234, 1)
+        self.assertEqual(icmp.ICMP_ECHO_REQUEST, struct.unpack(
+            '!B', packet[:1])[0])
+        self.assertEqual(0, icmp._checksum(packet))
+
+    @mock.patch('tacker.agent.linux.icmp._open_socket')
+    def test_ping(self, mock_open_socket):
+        mock_open_socket.return_value = (
+            FakeIcmpSocket(['10.0.0.1', '10.0.0.3']), False)
+        rtts = icmp.ping(['10.0.0.1', '10.0.0.2', '10.0.0.3'], count=2,
+                         timeout=0)
+        self.assertIsNotNone(rtts['10.0.0.1'])
+        self.assertIsNone(rtts['10.0.0.2'])
+        self.assertIsNotNone(rtts['10.0.0.3'])
+
+    @mock.patch('socket.socket')
+    def test_ping_socket_not_permitted(self, mock_socket):
+        mock_socket.side_effect = socket.error(1, 'Operation not permitted')
+        self.assertRaises(icmp.IcmpUnavailable, icmp.ping, ['10.0.0.1'])
+
+    @mock.patch('tacker.agent.linux.icmp.ping')
+    def test_batch_pinger(self, mock_ping):
+        mock_ping.return_value = {'10.0.0.1': 0.001}
+        pinger = icmp.BatchPinger(window=0)
+        self.assertEqual(0.001, pinger.ping('10.0.0.1', count='1',
+                                            timeout='2'))
+        mock_ping.assert_called_once_with({'10.0.0.1'}, 1, 2.0, 0.0)
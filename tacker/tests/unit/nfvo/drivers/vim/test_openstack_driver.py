@@ -68,6 +68,9 @@ class TestOpenstack_Driver(base.TestCase):
         self.auth_obj = utils.get_vim_auth_obj()
         self.addCleanup(mock.patch.stopall)
         self._mock_keymgr()
+        self.load_resource_schemas = self._mock(
+            'tacker.vnfm.infra_drivers.openstack.heat_client.'
+            'load_resource_schemas')
 
     def _mock_keystone(self):
         self.keystone = mock.Mock(wraps=FakeKeystone())
@@ -120,6 +123,17 @@ class TestOpenstack_Driver(base.TestCase):
         mock_ks_client.regions.list.assert_called_once_with()
         self.keystone.initialize_client.assert_called_once_with(
             version=keystone_version, **self.auth_obj)
+        self.load_resource_schemas.assert_called_once_with(
+            mock_ks_client.session, 'http://localhost:5000/v3', 'RegionOne',
+            mock.ANY)
+
+    def test_register_vim_resource_schemas_failure(self):
+        regions = [mock_dict({'id': 'RegionOne'})]
+        mock_ks_client = mock.Mock(version='v3', **{
+            'regions.list.return_value': regions})
+        self.keystone.get_version.return_value = 'v3'
+        self.load_resource_schemas.side_effect = Exception('unreachable')
+        self._test_register_vim(self.vim_obj, mock_ks_client)
 
     def test_register_keystone_v2(self):
         services_list = [mock_dict({'type': 'orchestration', 'id':
@@ -214,6 +228,9 @@ class TestOpenstack_Driver(base.TestCase):
         mock_ks_client.regions.list.assert_called_once_with()
         self.keystone.initialize_client.assert_called_once_with(
             version=keystone_version, **self.auth_obj)
+        self.load_resource_schemas.assert_called_once_with(
+            mock_ks_client.session, 'http://localhost:5000/v3', 'RegionOne',
+            mock.ANY)
 
     def test_get_vim_resource_id(self):
         resource_type = 'network'
@@ -163,6 +163,14 @@ class FakeVNFMPlugin(mock.Mock):
         elif self.vnf3_update_vnf_id in args:
             return self.get_dummy_vnf3_update_details()
 
+    def get_vnfs_resources(self, context, vnf_ids):
+        vnfs_resources = {}
+        for vnf_id in vnf_ids:
+            resources = self.get_vnf_resources(context, vnf_id)
+            if resources is not None:
+                vnfs_resources[vnf_id] = resources
+        return vnfs_resources
+
     def get_dummy_vnf1_details(self):
         return [{'name': 'CP11', 'id': self.cp11_id},
                 {'name': 'CP12', 'id': self.cp12_id}]
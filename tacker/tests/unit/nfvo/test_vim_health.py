@@ -0,0 +1,125 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+import testtools
+
+from tacker.agent.linux import icmp
+from tacker.common import topics
+from tacker.nfvo import vim_health
+from tacker import service
+
+
+class TestVimHealth(testtools.TestCase):
+
+    thresholds = {vim_health.REACHABLE: 1, vim_health.UNREACHABLE: 3}
+
+    def test_vim_target_ip(self):
+        self.assertEqual('10.0.0.1', vim_health.vim_target_ip(
+            'http://10.0.0.1:5000/v3', 'openstack'))
+        self.assertEqual('10.0.0.2', vim_health.vim_target_ip(
+            'https://10.0.0.2:6443', 'kubernetes'))
+
+    def test_hysteresis(self):
+        health = vim_health.VimHealth(vim_health.REACHABLE)
+        for _ in range(2):
+            self.assertIsNone(health.update(vim_health.UNREACHABLE,
+                                            self.thresholds))
+        # a passed check resets the failure count
+        self.assertIsNone(health.update(vim_health.REACHABLE,
+                                        self.thresholds))
+        for _ in range(2):
+            self.assertIsNone(health.update(vim_health.UNREACHABLE,
+                                            self.thresholds))
+        self.assertEqual(vim_health.UNREACHABLE,
+                         health.update(vim_health.UNREACHABLE,
+                                       self.thresholds))
+        self.assertIsNone(health.update(vim_health.UNREACHABLE,
+                                        self.thresholds))
+        self.assertEqual(vim_health.REACHABLE,
+                         health.update(vim_health.REACHABLE,
+                                       self.thresholds))
+
+
+class TestVimHealthMonitor(testtools.TestCase):
+
+    def setUp(self):
+        super(TestVimHealthMonitor, self).setUp()
+        self.update_cb = mock.Mock()
+        self.monitor = vim_health.VimHealthMonitor(self.update_cb)
+        mock.patch('tacker.context.get_admin_context').start()
+        self.load_vims = mock.patch.object(
+            vim_health.VimHealthMonitor, '_load_vims').start()
+        self.ping = mock.patch('tacker.agent.linux.icmp.ping').start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_check_vims_reports_transitions(self):
+        self.load_vims.return_value = {
+            'vim1': ('10.0.0.1', 'PENDING'),
+            'vim2': ('10.0.0.2', 'REACHABLE')}
+        self.ping.return_value = {'10.0.0.1': 0.001, '10.0.0.2': 0.001}
+        self.monitor.check_vims()
+        self.ping.assert_called_once_with({'10.0.0.1', '10.0.0.2'}, '1',
+                                          '1', '1')
+        self.update_cb.assert_called_once_with(mock.ANY, 'vim1',
+                                               vim_health.REACHABLE)
+
+        self.update_cb.reset_mock()
+        self.ping.return_value = {'10.0.0.1': 0.001, '10.0.0.2': None}
+        for _ in range(3):
+            self.monitor.check_vims()
+        self.update_cb.assert_called_once_with(mock.ANY, 'vim2',
+                                               vim_health.UNREACHABLE)
+
+    def test_check_vims_forgets_deleted_vims(self):
+        self.load_vims.return_value = {'vim1': ('10.0.0.1', 'REACHABLE')}
+        self.ping.return_value = {'10.0.0.1': 0.001}
+        self.monitor.check_vims()
+        self.load_vims.return_value = {}
+        self.monitor.check_vims()
+        self.assertEqual({}, self.monitor._health)
+
+    @mock.patch('tacker.agent.linux.utils.execute')
+    def test_check_vims_without_icmp_socket(self, mock_execute):
+        self.load_vims.return_value = {'vim1': ('10.0.0.1', 'PENDING')}
+        self.ping.side_effect = icmp.IcmpUnavailable(reason='EPERM')
+        self.monitor.check_vims()
+        mock_execute.assert_called_once_with(
+            ['ping', '-c', '1', '-W', '1', '-i', '1', '10.0.0.1'],
+            check_exit_code=True, debuglog=False)
+        self.update_cb.assert_called_once_with(mock.ANY, 'vim1',
+                                               vim_health.REACHABLE)
+
+    @mock.patch('tacker.service.Heartbeat')
+    def test_check_vims_partitioned(self, mock_heartbeat):
+        members = {'conductor-a:1', 'conductor-b:1'}
+        mock_heartbeat.return_value.get_members.return_value = set(members)
+        vims = dict(('vim%d' % index, ('10.0.0.%d' % index, 'PENDING'))
+                    for index in range(20))
+        self.load_vims.return_value = vims
+        self.ping.return_value = dict((target, 0.001)
+                                      for target, _status in vims.values())
+
+        updated = {}
+        for member in members:
+            update_cb = mock.Mock()
+            monitor = vim_health.VimHealthMonitor(
+                update_cb, service.Partition(topics.TOPIC_VIM_MONITOR, 30,
+                                             member=member))
+            monitor.check_vims()
+            updated[member] = [args[1] for args, _kwargs
+                               in update_cb.call_args_list]
+
+        # each vim is checked and updated by one conductor
+        self.assertEqual(sorted(vims),
+                         sorted(sum(updated.values(), [])))
+        self.assertTrue(all(updated.values()))
@@ -0,0 +1,86 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from tacker.common import clients
+from tacker.tests.unit import base
+
+
+class TestOpenstackClients(base.TestCase):
+
+    def setUp(self):
+        super(TestOpenstackClients, self).setUp()
+        self.initialize_client = mock.patch(
+            'tacker.vnfm.keystone.Keystone.initialize_client',
+            side_effect=lambda *args, **kwargs: mock.Mock()).start()
+        self.heatclient = mock.patch('heatclient.client.Client').start()
+        self.addCleanup(mock.patch.stopall)
+        self.addCleanup(clients._cache.clear)
+        clients._cache.clear()
+        self.auth_attr = {'auth_url': 'http://vim1/identity/v3',
+                          'username': 'admin', 'password': 'secret',
+                          'project_name': 'admin'}
+
+    def test_keystone_client_shared(self):
+        keystone = clients.get_keystone_client(self.auth_attr)
+        self.assertIs(keystone,
+                      clients.get_keystone_client(dict(self.auth_attr)))
+        self.assertIs(keystone,
+                      clients.OpenstackClients(self.auth_attr).keystone)
+        self.assertEqual(1, self.initialize_client.call_count)
+        self.assertEqual('v3', self.initialize_client.call_args[0][0])
+
+    def test_credentials_change(self):
+        keystone = clients.get_keystone_client(self.auth_attr)
+        self.auth_attr['password'] = 'changed'
+        self.assertIsNot(keystone,
+                         clients.get_keystone_client(self.auth_attr))
+
+    def test_token_auth_not_cached(self):
+        auth_dict = {'auth_url': 'http://vim1/identity/v3',
+                     'token': 'request-token', 'project_name': 'admin'}
+        keystone = clients.get_keystone_client(auth_dict, version='2')
+        self.assertIsNot(keystone,
+                         clients.get_keystone_client(auth_dict, version='2'))
+        self.assertEqual(0, len(clients._cache))
+
+    def test_heat_client_per_region(self):
+        self.heatclient.side_effect = lambda *args, **kwargs: mock.Mock()
+        heat1 = clients.OpenstackClients(self.auth_attr, 'RegionOne').heat
+        self.assertIs(heat1,
+                      clients.OpenstackClients(self.auth_attr,
+                                               'RegionOne').heat)
+        self.assertIsNot(heat1,
+                         clients.OpenstackClients(self.auth_attr,
+                                                  'RegionTwo').heat)
+        self.assertEqual(1, self.initialize_client.call_count)
+
+    def test_cache_size(self):
+        self.config_fixture.config(cache_size=2, group='openstack_clients')
+        keystone = clients.get_keystone_client(self.auth_attr)
+        for project in ('demo', 'alt_demo'):
+            clients.get_keystone_client(dict(self.auth_attr,
+                                             project_name=project))
+        self.assertEqual(2, len(clients._cache))
+        self.assertIsNot(keystone,
+                         clients.get_keystone_client(self.auth_attr))
+
+    def test_invalidate(self):
+        keystone = clients.get_keystone_client(self.auth_attr)
+        other = dict(self.auth_attr, auth_url='http://vim2/identity/v3')
+        other_keystone = clients.get_keystone_client(other)
+
+        clients.invalidate('http://vim1/identity/v3')
+        self.assertIsNot(keystone,
+                         clients.get_keystone_client(self.auth_attr))
+        self.assertIs(other_keystone, clients.get_keystone_client(other))
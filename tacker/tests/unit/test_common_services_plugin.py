@@ -13,12 +13,16 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime
+
 import mock
 
 from oslo_utils import timeutils
 
+from tacker.common import exceptions
 from tacker import context
 from tacker.db.common_services import common_services_db_plugin
+from tacker.db.common_services import event_sink
 from tacker.extensions import common_services
 from tacker.plugins.common_services import common_services_plugin
 from tacker.tests.unit.db import base as db_base
@@ -158,3 +162,96 @@ class TestCommonServicesPlugin(db_base.SqlTestCase):
         self.assertIn('event_type', result[0])
         self.assertNotIn('event_details', result[0])
         self.assertNotIn('timestamp', result[0])
+
+    def _create_events(self, times):
+        evt_obj = self._get_dummy_event_obj()
+        for tstamp in times:
+            self.event_db_plugin.create_event(
+                self.context, evt_obj['resource_id'],
+                evt_obj['resource_type'], evt_obj['resource_state'],
+                evt_obj['event_type'],
+                timeutils.parse_strtime(tstamp, '%Y-%m-%dT%H:%M:%S'),
+                evt_obj['event_details'])
+
+    def test_get_events_pages(self):
+        # events are listed in time order, not in id order
+        self._create_events(['2016-07-20T05:00:02', '2016-07-20T05:00:01',
+                             '2016-07-20T05:00:03', '2016-07-20T05:00:01'])
+        pages = []
+        marker = None
+        while True:
+            page = self.coreutil_plugin.get_events(
+                self.context, fields=['id', 'timestamp'], limit=2,
+                marker=marker)
+            if not page:
+                break
+            pages.append([event['id'] for event in page])
+            marker = page[-1]['id']
+        self.assertEqual([[2, 4], [1, 3]], pages)
+
+        page = self.coreutil_plugin.get_events(
+            self.context, limit=2, marker=1, page_reverse=True)
+        self.assertEqual([2, 4], [event['id'] for event in page])
+
+    def test_get_events_time_range(self):
+        self._create_events(['2016-07-20T05:00:01', '2016-07-20T05:00:02',
+                             '2016-07-20T05:00:03'])
+        events = self.coreutil_plugin.get_events(
+            self.context, {'since': ['2016-07-20T05:00:02Z'],
+                           'until': ['2016-07-20T05:00:03Z']})
+        self.assertEqual([2], [event['id'] for event in events])
+
+        self.assertRaises(exceptions.InvalidInput,
+                          self.coreutil_plugin.get_events,
+                          self.context, {'since': ['yesterday']})
+
+    def test_heartbeats(self):
+        now = timeutils.utcnow()
+        old = now - datetime.timedelta(seconds=60)
+        for host, tstamp in (('host-a:1', old), ('host-a:2', now),
+                             ('host-b:1', now)):
+            self.event_db_plugin.report_heartbeat(
+                self.context, 'vnf_monitor', host, tstamp)
+        since = now - datetime.timedelta(seconds=30)
+        self.event_db_plugin.purge_heartbeats(self.context, 'vnf_monitor',
+                                              since)
+        self.event_db_plugin.delete_heartbeat(self.context, 'vnf_monitor',
+                                              'host-b:1')
+        self.assertEqual({'host-a:2'}, self.event_db_plugin.get_live_hosts(
+            self.context, 'vnf_monitor', old))
+
+
+class TestEventSink(db_base.SqlTestCase):
+    def setUp(self):
+        super(TestEventSink, self).setUp()
+        self.context = context.get_admin_context()
+        self.event_db_plugin =\
+            common_services_db_plugin.CommonServicesPluginDb()
+
+    def _create_event(self, sink, evt_type):
+        sink.create_event(self.context,
+                          res_id='6261579e-d6f3-49ad-8bc3-a9cb974778ff',
+                          res_type='VNF', res_state='ACTIVE',
+                          evt_type=evt_type,
+                          tstamp=timeutils.utcnow(), details='')
+
+    def test_flush(self):
+        sink = event_sink.EventSink(queue_size=10, batch_size=2,
+                                    flush_interval=1, overflow='drop')
+        for evt_type in ('MONITOR', 'CREATE', 'DELETE'):
+            self._create_event(sink, evt_type)
+        self.assertEqual([], self.event_db_plugin.get_events(self.context))
+        sink.flush()
+        events = self.event_db_plugin.get_events(self.context)
+        self.assertEqual(['MONITOR', 'CREATE', 'DELETE'],
+                         [event['event_type'] for event in events])
+
+    def test_drop_when_full(self):
+        sink = event_sink.EventSink(queue_size=1, batch_size=10,
+                                    flush_interval=1, overflow='drop')
+        self._create_event(sink, 'MONITOR')
+        self._create_event(sink, 'CREATE')
+        sink.flush()
+        events = self.event_db_plugin.get_events(self.context)
+        self.assertEqual(['MONITOR'],
+                         [event['event_type'] for event in events])
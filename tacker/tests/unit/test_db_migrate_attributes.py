@@ -0,0 +1,73 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+
+import mock
+
+from tacker.common import exceptions
+from tacker import context
+from tacker.db import api as db_api
+from tacker.db.migration import migrate_attributes
+from tacker.db.vnfm import vnfm_db
+from tacker.tests.unit.db import base as db_base
+
+
+class TestMigrateVnfAttributes(db_base.SqlTestCase):
+    VNF_IDS = ('6261579e-d6f3-49ad-8bc3-a9cb974778ff',
+               '9a8b7c6d-5e4f-4a3b-8c2d-1e0f9a8b7c6d',
+               '5b6f1a3c-8e2d-4f7a-9c1b-3d4e5f6a7b8c')
+
+    def setUp(self):
+        super(TestMigrateVnfAttributes, self).setUp()
+        mock.patch('tacker.db.migration.purge_tables.get_engine',
+                   return_value=db_api.get_engine()).start()
+        self.addCleanup(mock.patch.stopall)
+        self.context = context.get_admin_context()
+        session = self.context.session
+        with session.begin(subtransactions=True):
+            for vnf_id in self.VNF_IDS:
+                session.add(vnfm_db.VNF(
+                    id=vnf_id, tenant_id='ad7ebc56538745a08ef7c5e97f8bd437',
+                    name=vnf_id, vnfd_id='eb094833-995e-49f0-a047-'
+                    'dfb56aaf7c4e', status='ACTIVE',
+                    deleted_at=datetime.datetime.min))
+            session.add(vnfm_db.VNFAttribute(
+                id='7800cb81-7ed1-4cf6-8387-746468522651',
+                vnf_id=self.VNF_IDS[0], key='monitoring_policy',
+                value='{"vdus": {}}'))
+            # already migrated, e.g. by an update
+            session.query(vnfm_db.VNF).filter_by(id=self.VNF_IDS[2]).update(
+                {'attributes': {'config': 'vdus: {}\n'}})
+
+    def test_migrate_vnf_attributes(self):
+        progress = mock.Mock()
+        migrated = migrate_attributes.migrate_vnf_attributes(
+            mock.Mock(), batch_size=1, progress=progress)
+
+        self.assertEqual(2, migrated)
+        self.assertEqual(2, progress.call_count)
+        session = self.context.session
+        session.expire_all()
+        attributes = dict(session.query(vnfm_db.VNF.id,
+                                        vnfm_db.VNF.attributes))
+        self.assertEqual({self.VNF_IDS[0]: {'monitoring_policy':
+                                            '{"vdus": {}}'},
+                          self.VNF_IDS[1]: {},
+                          self.VNF_IDS[2]: {'config': 'vdus: {}\n'}},
+                         attributes)
+        self.assertEqual(0, session.query(vnfm_db.VNFAttribute).count())
+
+    def test_invalid_batch_size_input(self):
+        self.assertRaises(exceptions.InvalidInput,
+                          migrate_attributes.migrate_vnf_attributes,
+                          mock.Mock(), batch_size=0)
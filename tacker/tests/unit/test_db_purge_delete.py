@@ -13,12 +13,17 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import mock
+import datetime
 
+import mock
+import sqlalchemy
 
 from tacker.common import exceptions
 from tacker import context
+from tacker.db import api as db_api
+from tacker.db.common_services import common_services_db
 from tacker.db.migration import purge_tables
+from tacker.db.vnfm import vnfm_db
 from tacker.tests.unit.db import base as db_base
 
 
@@ -79,3 +84,116 @@ class TestDbPurgeDelete(db_base.SqlTestCase):
         purge_tables.purge_deleted(self.config, 'events', '90', 'days')
         purge_tables._purge_events_table.assert_called_once_with(
             mock.ANY, mock.ANY, mock.ANY)
+
+    def test_invalid_batch_size_input(self):
+        self.assertRaises(exceptions.InvalidInput, purge_tables.purge_deleted,
+                          self.config, 'vnf', '90', 'days', batch_size=0)
+
+
+class TestBatchPurger(db_base.SqlTestCase):
+    RESOURCE_IDS = ('6261579e-d6f3-49ad-8bc3-a9cb974778ff',
+                    '9a8b7c6d-5e4f-4a3b-8c2d-1e0f9a8b7c6d',
+                    '5b6f1a3c-8e2d-4f7a-9c1b-3d4e5f6a7b8c')
+
+    def setUp(self):
+        super(TestBatchPurger, self).setUp()
+        self.engine = db_api.get_engine()
+        self.meta = sqlalchemy.MetaData(bind=self.engine)
+        self.time_line = datetime.datetime(2018, 1, 1)
+        old = self.time_line - datetime.timedelta(days=1)
+        session = context.get_admin_context().session
+        with session.begin(subtransactions=True):
+            for resource_id, event_type in (
+                    (self.RESOURCE_IDS[0], 'CREATE'),
+                    (self.RESOURCE_IDS[0], 'DELETE'),
+                    (self.RESOURCE_IDS[1], 'DELETE'),
+                    (self.RESOURCE_IDS[2], 'CREATE')):
+                session.add(common_services_db.Event(
+                    resource_id=resource_id, resource_state='ACTIVE',
+                    resource_type='vnf', event_type=event_type,
+                    timestamp=old, event_details=''))
+
+    def _resource_ids(self):
+        events = common_services_db.Event.__table__
+        return sorted(row[0] for row in self.engine.execute(
+            sqlalchemy.select([events.c.resource_id])))
+
+    def test_purge_events(self):
+        progress = mock.Mock()
+        purger = purge_tables.BatchPurger(self.engine, batch_size=1,
+                                          progress=progress)
+        purge_tables._purge_events_table(self.meta, purger, self.time_line)
+        self.assertEqual([self.RESOURCE_IDS[2]], self._resource_ids())
+        self.assertEqual({'events': 3}, dict(purger.counts))
+        self.assertEqual(2, progress.call_count)
+
+    def test_purge_events_dry_run(self):
+        purger = purge_tables.BatchPurger(self.engine, batch_size=1,
+                                          dry_run=True)
+        purge_tables._purge_events_table(self.meta, purger, self.time_line)
+        self.assertEqual(4, len(self._resource_ids()))
+        self.assertEqual({'events': 3}, dict(purger.counts))
+
+    def _add_resources(self):
+        """Add three VNFDs and VNFs deleted before the time line and one
+        deleted after it, each VNF with two attributes.
+        """
+        tenant_id = 'ad7ebc56538745a08ef7c5e97f8bd437'
+        old = self.time_line - datetime.timedelta(days=1)
+        recent = self.time_line + datetime.timedelta(days=1)
+        session = context.get_admin_context().session
+        with session.begin(subtransactions=True):
+            for i, deleted_at in enumerate((old, old, old, recent)):
+                vnfd_id = 'eb094833-995e-49f0-a047-dfb56aaf7c4%d' % i
+                vnf_id = '6261579e-d6f3-49ad-8bc3-a9cb974778f%d' % i
+                session.add(vnfm_db.VNFD(
+                    id=vnfd_id, tenant_id=tenant_id, name='vnfd%d' % i,
+                    deleted_at=deleted_at))
+                session.add(vnfm_db.VNF(
+                    id=vnf_id, tenant_id=tenant_id, name='vnf%d' % i,
+                    vnfd_id=vnfd_id,
+                    vim_id='6261579e-d6f3-49ad-8bc3-a9cb974778ff',
+                    status='PENDING_DELETE', deleted_at=deleted_at))
+                for key in ('heat_template', 'param_values'):
+                    session.add(vnfm_db.VNFAttribute(
+                        vnf_id=vnf_id, key=key, value=''))
+
+    def _ids(self, model, column='id'):
+        table = model.__table__
+        return sorted(row[0] for row in self.engine.execute(
+            sqlalchemy.select([table.c[column]])))
+
+    def _purge_resources(self, purger):
+        assoc_map = purge_tables._generate_associated_tables_map(
+            sqlalchemy.inspect(self.engine))
+        for t in ('vnf', 'vnfd'):
+            purge_tables._purge_resource_tables(t, self.meta, purger,
+                                                self.time_line, assoc_map)
+        return dict((name, purger.counts[name])
+                    for name in ('vnf', 'vnf_attribute', 'vnfd'))
+
+    def test_purge_resources(self):
+        self._add_resources()
+        progress = mock.Mock()
+        purger = purge_tables.BatchPurger(self.engine, batch_size=2,
+                                          progress=progress)
+        counts = self._purge_resources(purger)
+        self.assertEqual({'vnf': 3, 'vnf_attribute': 6, 'vnfd': 3}, counts)
+        self.assertEqual(['eb094833-995e-49f0-a047-dfb56aaf7c43'],
+                         self._ids(vnfm_db.VNFD))
+        self.assertEqual(['6261579e-d6f3-49ad-8bc3-a9cb974778f3'],
+                         self._ids(vnfm_db.VNF))
+        self.assertEqual(['6261579e-d6f3-49ad-8bc3-a9cb974778f3'] * 2,
+                         self._ids(vnfm_db.VNFAttribute, 'vnf_id'))
+        # two batches of VNFs and two of VNFDs
+        self.assertEqual(4, progress.call_count)
+
+    def test_purge_resources_dry_run(self):
+        self._add_resources()
+        purger = purge_tables.BatchPurger(self.engine, batch_size=2,
+                                          dry_run=True)
+        counts = self._purge_resources(purger)
+        self.assertEqual({'vnf': 3, 'vnf_attribute': 6, 'vnfd': 3}, counts)
+        self.assertEqual(4, len(self._ids(vnfm_db.VNFD)))
+        self.assertEqual(4, len(self._ids(vnfm_db.VNF)))
+        self.assertEqual(8, len(self._ids(vnfm_db.VNFAttribute)))
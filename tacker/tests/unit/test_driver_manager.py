@@ -0,0 +1,63 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+import testtools
+
+from tacker.common import driver_manager
+
+
+class FakeDriver(object):
+
+    def __init__(self, type_):
+        self.type_ = type_
+
+    def get_type(self):
+        return self.type_
+
+    def ping(self, target):
+        return '%s pinged %s' % (self.type_, target)
+
+
+class TestDriverManager(testtools.TestCase):
+
+    def setUp(self):
+        super(TestDriverManager, self).setUp()
+        extensions = [mock.Mock(obj=FakeDriver('a')),
+                      mock.Mock(obj=FakeDriver('b'))]
+        p = mock.patch('stevedore.named.NamedExtensionManager',
+                       return_value=extensions)
+        p.start()
+        self.addCleanup(p.stop)
+        self.manager = driver_manager.DriverManager('test', ['a', 'b'])
+
+    def test_invoke(self):
+        self.assertEqual('a pinged x',
+                         self.manager.invoke('a', 'ping', target='x'))
+
+    @mock.patch.object(driver_manager, 'CALL_SECONDS')
+    def test_method(self, mock_call_seconds):
+        ping = self.manager.method('ping')
+        self.assertIs(ping, self.manager.method('ping'))
+        self.assertEqual('b pinged y', ping('b', target='y'))
+        mock_call_seconds.observe.assert_called_once_with(
+            mock.ANY, namespace='test', driver='b', method='ping')
+
+    def test_method_of_registered_driver(self):
+        ping = self.manager.method('ping')
+        self.manager.register('c', FakeDriver('c'))
+        self.assertEqual('c pinged z', ping('c', target='z'))
+
+    def test_method_errors(self):
+        self.assertRaises(KeyError, self.manager.method('ping'), 'c',
+                          target='x')
+        self.assertRaises(AttributeError, self.manager.method('pong'), 'a')
@@ -0,0 +1,39 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import testtools
+
+from tacker.common import hash_ring
+
+
+class TestHashRing(testtools.TestCase):
+
+    def test_empty_ring(self):
+        self.assertIsNone(hash_ring.HashRing([]).get_member('vnf'))
+
+    def test_get_member_is_stable(self):
+        ring = hash_ring.HashRing(['host1:1', 'host2:1'])
+        other_ring = hash_ring.HashRing(['host2:1', 'host1:1'])
+        for key in ('vnf-%d' % i for i in range(100)):
+            self.assertEqual(ring.get_member(key),
+                             other_ring.get_member(key))
+
+    def test_add_member_moves_few_keys(self):
+        keys = ['vnf-%d' % i for i in range(1000)]
+        ring = hash_ring.HashRing(['host1:1', 'host2:1', 'host3:1'])
+        new_ring = hash_ring.HashRing(['host1:1', 'host2:1', 'host3:1',
+                                       'host4:1'])
+        moved = [key for key in keys
+                 if ring.get_member(key) != new_ring.get_member(key)]
+        self.assertTrue(all(new_ring.get_member(key) == 'host4:1'
+                            for key in moved))
+        self.assertLess(len(moved), 400)
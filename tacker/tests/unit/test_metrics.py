@@ -0,0 +1,91 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+import testtools
+import webob
+
+from tacker.api import metrics as metrics_api
+from tacker.common import metrics
+from tacker import context
+
+
+class TestMetrics(testtools.TestCase):
+
+    def setUp(self):
+        super(TestMetrics, self).setUp()
+        self.registry = metrics.Registry()
+
+    def test_counter(self):
+        counter = self.registry.register(metrics.Counter(
+            'probes_total', 'Probes', ['driver']))
+        counter.inc(driver='ping')
+        counter.inc(2, driver='ping')
+        counter.inc(driver='http_ping')
+        self.assertEqual('# HELP probes_total Probes\n'
+                         '# TYPE probes_total counter\n'
+                         'probes_total{driver="http_ping"} 1.0\n'
+                         'probes_total{driver="ping"} 3.0\n',
+                         self.registry.render())
+
+    def test_counter_wrong_labels(self):
+        counter = metrics.Counter('probes_total', 'Probes', ['driver'])
+        self.assertRaises(ValueError, counter.inc, vnf='vnf1')
+
+    def test_histogram(self):
+        histogram = self.registry.register(metrics.Histogram(
+            'probe_seconds', 'Probe duration', buckets=(0.1, 1.0)))
+        histogram.observe(0.05)
+        histogram.observe(0.1)
+        histogram.observe(5)
+        self.assertEqual('# HELP probe_seconds Probe duration\n'
+                         '# TYPE probe_seconds histogram\n'
+                         'probe_seconds_bucket{le="0.1"} 2.0\n'
+                         'probe_seconds_bucket{le="1.0"} 2.0\n'
+                         'probe_seconds_bucket{le="+Inf"} 3.0\n'
+                         'probe_seconds_sum 5.15\n'
+                         'probe_seconds_count 3.0\n',
+                         self.registry.render())
+
+    def test_register_existing(self):
+        gauge = self.registry.register(metrics.Gauge('vnfs', 'VNFs'))
+        self.assertIs(gauge, self.registry.register(
+            metrics.Gauge('vnfs', 'VNFs')))
+        self.assertRaises(ValueError, self.registry.register,
+                          metrics.Counter('vnfs', 'VNFs'))
+
+    def test_escape_label_values(self):
+        gauge = self.registry.register(metrics.Gauge('up', 'Up', ['vim']))
+        gauge.set(1, vim='a"b\\c')
+        self.assertIn('up{vim="a\\"b\\\\c"} 1.0', self.registry.render())
+
+    @mock.patch('tacker.policy.init')
+    @mock.patch.object(metrics, 'REGISTRY')
+    def test_metrics_app(self, mock_registry, mock_init):
+        mock_registry.render.return_value = u'vnfs 1.0\n'
+        response = webob.Request.blank('/').get_response(
+            metrics_api.Metrics())
+        self.assertEqual(200, response.status_int)
+        self.assertEqual('text/plain', response.content_type)
+        self.assertEqual(u'vnfs 1.0\n', response.text)
+        self.assertEqual(404, webob.Request.blank('/other').get_response(
+            metrics_api.Metrics()).status_int)
+
+    @mock.patch('tacker.policy.check', return_value=False)
+    @mock.patch('tacker.policy.init')
+    def test_metrics_app_not_authorized(self, mock_init, mock_check):
+        request = webob.Request.blank('/')
+        user_context = context.Context('fake_user', 'fake_tenant')
+        request.environ['tacker.context'] = user_context
+        response = request.get_response(metrics_api.Metrics())
+        self.assertEqual(403, response.status_int)
+        mock_check.assert_called_once_with(user_context, 'get_metrics', {})
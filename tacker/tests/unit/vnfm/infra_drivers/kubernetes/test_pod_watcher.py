@@ -0,0 +1,153 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import eventlet
+import mock
+
+from tacker.tests.unit import base
+from tacker.vnfm.infra_drivers.kubernetes import pod_watcher
+
+
+def _pod(name, phase, resource_version):
+    pod = mock.Mock()
+    pod.metadata.name = name
+    pod.metadata.resource_version = resource_version
+    pod.status.phase = phase
+    return pod
+
+
+class FakeCoreV1Api(object):
+    """Pod list and watch API of one namespace.
+
+    Every list returns the next resourceVersion, and every watch request
+    streams the next scripted list of events, then ends as if its timeout
+    expired.
+    """
+
+    def __init__(self, pods, resource_versions, streams):
+        self.pods = pods
+        self.resource_versions = list(resource_versions)
+        self.streams = list(streams)
+        self.lists = 0
+        self.watches = []
+
+    def list_namespaced_pod(self, namespace):
+        self.lists += 1
+        return mock.Mock(items=list(self.pods),
+                         metadata=mock.Mock(
+                             resource_version=self.resource_versions.pop(0)))
+
+    def stream(self, func, **kwargs):
+        self.watches.append(kwargs)
+        events = self.streams.pop(0) if self.streams else []
+        if isinstance(events, Exception):
+            raise events
+        for event in events:
+            yield event
+        eventlet.sleep(0.01)
+
+
+class TestPodWatcher(base.TestCase):
+
+    def setUp(self):
+        super(TestPodWatcher, self).setUp()
+        self.kubernetes = mock.Mock()
+        mock.patch('tacker.common.container.kubernetes_utils.'
+                   'KubernetesHTTPAPI',
+                   return_value=self.kubernetes).start()
+        self.watch = mock.patch('kubernetes.watch.Watch').start()
+        self.addCleanup(mock.patch.stopall)
+        self.watcher = pod_watcher.PodWatcher({'auth_url': 'url',
+                                               'ssl_ca_cert': None},
+                                              'default')
+
+    def _api(self, pods, resource_versions, streams):
+        api = FakeCoreV1Api(pods, resource_versions, streams)
+        self.kubernetes.get_core_v1_api_client.return_value = api
+        self.watch.return_value.stream.side_effect = api.stream
+        return api
+
+    @staticmethod
+    def _running(pods):
+        return bool(pods) and all(pod.status.phase == 'Running'
+                                  for pod in pods.values())
+
+    def test_wait_from_events(self):
+        api = self._api([_pod('vdu1-a', 'Pending', '10')], ['10'], [
+            [{'type': 'BOOKMARK', 'object': _pod(None, None, '11')},
+             {'type': 'MODIFIED', 'object': _pod('vdu1-a', 'Running', '12')},
+             {'type': 'ADDED', 'object': _pod('vdu2-a', 'Running', '13')}]])
+        wait = self.watcher.wait(self._running, 10)
+
+        self.assertFalse(wait.timed_out)
+        self.assertEqual(['vdu1-a'], list(wait.pods))
+        self.assertEqual(1, api.lists)
+        self.assertEqual([{'namespace': 'default', 'resource_version': '10',
+                           'timeout_seconds': 60,
+                           'allow_watch_bookmarks': True}], api.watches)
+
+    def test_wait_satisfied_by_list(self):
+        api = self._api([_pod('vdu1-a', 'Running', '10')], ['10'], [])
+        wait = self.watcher.wait(self._running, 10)
+        self.assertFalse(wait.timed_out)
+        self.assertEqual(1, api.lists)
+        self.assertEqual([], api.watches)
+
+    def test_relist_when_gone(self):
+        api = self._api([_pod('vdu1-a', 'Pending', '10')], ['10', '20'], [
+            [{'type': 'ERROR', 'raw_object': {'code': 410}}],
+            [{'type': 'DELETED', 'object': _pod('vdu1-a', 'Pending', '21')}]])
+        wait = self.watcher.wait(lambda pods: not pods, 10)
+
+        self.assertFalse(wait.timed_out)
+        self.assertEqual(2, api.lists)
+        self.assertEqual(['10', '20'], [kwargs['resource_version']
+                                        for kwargs in api.watches])
+
+    def test_watch_without_bookmarks(self):
+        api = self._api([_pod('vdu1-a', 'Pending', '10')], ['10'], [
+            TypeError('allow_watch_bookmarks'),
+            [{'type': 'MODIFIED', 'object': _pod('vdu1-a', 'Running', '11')}]])
+        wait = self.watcher.wait(self._running, 10)
+
+        self.assertFalse(wait.timed_out)
+        self.assertIn('allow_watch_bookmarks', api.watches[0])
+        self.assertNotIn('allow_watch_bookmarks', api.watches[1])
+
+    def test_wait_timeout(self):
+        self._api([_pod('vdu1-a', 'Pending', '10')], ['10'], [])
+        wait = self.watcher.wait(self._running, 0.05)
+
+        self.assertTrue(wait.timed_out)
+        self.assertEqual(['vdu1-a'], list(wait.pods))
+        self.assertEqual(set(), self.watcher._waits)
+
+
+class TestWaitPods(base.TestCase):
+
+    def setUp(self):
+        super(TestWaitPods, self).setUp()
+        self.addCleanup(pod_watcher._watchers.clear)
+        mock.patch.object(pod_watcher.PodWatcher, 'wait').start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_watchers_per_credentials(self):
+        user1 = {'auth_url': 'url', 'username': 'user1', 'password': 'pw'}
+        user2 = {'auth_url': 'url', 'username': 'user2', 'password': 'pw'}
+        token1 = {'auth_url': 'url', 'bearer_token': 'token1'}
+        token2 = {'auth_url': 'url', 'bearer_token': 'token2'}
+        for auth_attr in (user1, user2, token1, token2,
+                          dict(user1, password='new')):
+            pod_watcher.wait_pods(auth_attr, 'default', bool, 10)
+
+        self.assertEqual(4, len(pod_watcher._watchers))
+        self.assertNotIn('token1', str(list(pod_watcher._watchers)))
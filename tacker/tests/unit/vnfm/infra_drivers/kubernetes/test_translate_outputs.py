@@ -0,0 +1,103 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import eventlet
+import mock
+
+from tacker.extensions import vnfm
+from tacker.tests.unit import base
+from tacker.vnfm.infra_drivers.kubernetes.k8s import translate_outputs
+
+
+def _object(kind, name):
+    k8s_object = mock.Mock(kind=kind)
+    k8s_object.metadata.name = name
+    return k8s_object
+
+
+class FakeApi(object):
+    """Record the calls of the Kubernetes APIs, in their order."""
+
+    def __init__(self, failing=()):
+        self.calls = []
+        self.failing = failing
+
+    def __getattr__(self, method):
+        def call(namespace, body=None, name=None):
+            name = name or body.metadata.name
+            # let the other green threads of the tier run
+            eventlet.sleep(0)
+            self.calls.append((method, name))
+            if name in self.failing and method.startswith('create'):
+                raise Exception('%s failed' % name)
+        return call
+
+
+class TestTransformer(base.TestCase):
+
+    def setUp(self):
+        super(TestTransformer, self).setUp()
+        self.api = FakeApi()
+        self.transformer = translate_outputs.Transformer(
+            core_v1_api_client=self.api,
+            extension_api_client=self.api,
+            scaling_api_client=self.api)
+        self.objects = [_object('Service', 'svc-a'),
+                        _object('Deployment', 'svc-a'),
+                        _object('ConfigMap', 'svc-a'),
+                        _object('HorizontalPodAutoscaler', 'svc-a'),
+                        _object('Service', 'svc-b'),
+                        _object('Deployment', 'svc-b')]
+
+    def _methods(self):
+        return [method for method, name in self.api.calls]
+
+    def test_deploy(self):
+        deployment_names = self.transformer.deploy(
+            {'namespace': 'default', 'objects': self.objects})
+
+        self.assertEqual('default,svc-a,default,svc-b', deployment_names)
+        methods = self._methods()
+        self.assertEqual('create_namespaced_config_map', methods[0])
+        self.assertEqual(['create_namespaced_deployment'] * 2, methods[1:3])
+        self.assertEqual(
+            ['create_namespaced_horizontal_pod_autoscaler',
+             'create_namespaced_service', 'create_namespaced_service'],
+            sorted(methods[3:]))
+
+    def test_deploy_failure(self):
+        self.api.failing = ('svc-b',)
+        self.assertRaises(vnfm.KubernetesObjectsCreateFailed,
+                          self.transformer.deploy,
+                          {'namespace': 'default', 'objects': self.objects})
+
+        methods = self._methods()
+        # the services and the autoscaler are not created, and the objects
+        # created are deleted
+        self.assertNotIn('create_namespaced_service', methods)
+        self.assertEqual(
+            [('delete_namespaced_deployment', 'svc-a'),
+             ('delete_namespaced_config_map', 'svc-a')],
+            self.api.calls[-2:])
+
+    def test_delete_objects(self):
+        failures = self.transformer.delete_objects(
+            [('default', kind, 'svc-a')
+             for kinds in translate_outputs.CREATE_TIERS for kind in kinds])
+
+        self.assertEqual([], failures)
+        methods = self._methods()
+        self.assertEqual(
+            ['delete_namespaced_horizontal_pod_autoscaler',
+             'delete_namespaced_service'], sorted(methods[:2]))
+        self.assertEqual(['delete_namespaced_deployment',
+                          'delete_namespaced_config_map'], methods[2:])
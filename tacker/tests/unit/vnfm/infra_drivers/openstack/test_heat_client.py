@@ -0,0 +1,80 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from tacker.tests.unit import base
+from tacker.vnfm.infra_drivers.openstack import heat_client as hc
+
+
+PORT_SCHEMA = {'resource_type': 'OS::Neutron::Port',
+               'attributes': {'port_security_enabled': {}}}
+
+
+class TestResourceSchemas(base.TestCase):
+
+    def setUp(self):
+        super(TestResourceSchemas, self).setUp()
+        self.addCleanup(hc._schemas.clear)
+        hc._schemas.clear()
+        self.resource_types = mock.Mock()
+        self.resource_types.get.return_value = PORT_SCHEMA
+        self.time = mock.patch('time.time', return_value=1000.0).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def _get(self, auth_url='http://vim1/identity/v3', refresh=False):
+        return hc.get_resource_schema(self.resource_types, auth_url,
+                                      'RegionOne', 'OS::Neutron::Port',
+                                      refresh=refresh)
+
+    def test_cached(self):
+        self.assertEqual(PORT_SCHEMA, self._get())
+        self.assertEqual(PORT_SCHEMA, self._get())
+        self.resource_types.get.assert_called_once_with('OS::Neutron::Port')
+
+        self._get(refresh=True)
+        self.assertEqual(2, self.resource_types.get.call_count)
+
+    def test_expired(self):
+        self.config_fixture.config(resource_schema_ttl=60,
+                                   group='openstack_vim')
+        self._get()
+        self.time.return_value += 61
+        self._get()
+        self.assertEqual(2, self.resource_types.get.call_count)
+
+    def test_disabled(self):
+        self.config_fixture.config(resource_schema_ttl=0,
+                                   group='openstack_vim')
+        self._get()
+        self._get()
+        self.assertEqual(2, self.resource_types.get.call_count)
+        self.assertEqual({}, hc._schemas)
+
+    def test_invalidate(self):
+        self._get()
+        self._get(auth_url='http://vim2/identity/v3')
+        hc.invalidate_resource_schemas('http://vim1/identity/v3')
+        self._get()
+        self._get(auth_url='http://vim2/identity/v3')
+        self.assertEqual(3, self.resource_types.get.call_count)
+
+    @mock.patch('heatclient.client.Client')
+    def test_load_resource_schemas(self, mock_client):
+        mock_client.return_value.resource_types = self.resource_types
+        session = mock.Mock()
+        hc.load_resource_schemas(session, 'http://vim1/identity/v3',
+                                 'RegionOne', ['OS::Neutron::Port'])
+        session.get_endpoint.assert_called_once_with(
+            service_type='orchestration', region_name='RegionOne')
+        self.assertEqual(PORT_SCHEMA, self._get())
+        self.resource_types.get.assert_called_once_with('OS::Neutron::Port')
@@ -0,0 +1,56 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import fixtures
+
+from tacker.tests.unit import base
+from tacker.vnfm.infra_drivers.openstack import hot_cache
+
+
+class TestHotCache(base.TestCase):
+
+    def test_cache_key(self):
+        key = hot_cache.cache_key({'vnfd': 'a'}, {'param_values': ''})
+        self.assertEqual(key, hot_cache.cache_key({'vnfd': 'a'},
+                                                  {'param_values': ''}))
+        self.assertNotEqual(key, hot_cache.cache_key({'vnfd': 'b'},
+                                                     {'param_values': ''}))
+
+    def test_lru(self):
+        cache = hot_cache.HotCache(2)
+        cache.put('a', {'heat_template': 'a'})
+        cache.put('b', {'heat_template': 'b'})
+        cache.get('a')
+        cache.put('c', {'heat_template': 'c'})
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual({'heat_template': 'a'}, cache.get('a'))
+        self.assertEqual({'heat_template': 'c'}, cache.get('c'))
+
+    def test_values_copied(self):
+        cache = hot_cache.HotCache(2)
+        value = {'vnf_attributes': {}}
+        cache.put('a', value)
+        value['vnf_attributes']['x'] = 1
+        cache.get('a')['vnf_attributes']['y'] = 2
+        self.assertEqual({'vnf_attributes': {}}, cache.get('a'))
+
+    def test_disk_tier(self):
+        cache_dir = self.useFixture(fixtures.TempDir()).join('hot')
+        hot_cache.HotCache(2, cache_dir).put('a', {'heat_template': 'a'})
+
+        cache = hot_cache.HotCache(2, cache_dir)
+        self.assertEqual({'heat_template': 'a'}, cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+
+    def test_disabled(self):
+        self.config_fixture.config(hot_cache_size=0, group='openstack_vim')
+        self.assertIsNone(hot_cache.get_cache())
@@ -0,0 +1,42 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from tacker.tests.unit import base
+from tacker.vnfm.infra_drivers.openstack import mgmt_ip_cache
+
+
+class TestMgmtIpCache(base.TestCase):
+
+    def test_lru(self):
+        cache = mgmt_ip_cache.MgmtIpCache(2)
+        cache.put('stack-a', {'VDU1': '10.0.0.1'})
+        cache.put('stack-b', {'VDU1': '10.0.0.2'})
+        self.assertEqual({'VDU1': '10.0.0.1'}, cache.get('stack-a'))
+        cache.put('stack-c', {'VDU1': '10.0.0.3'})
+
+        self.assertIsNone(cache.get('stack-b'))
+        self.assertEqual({'VDU1': '10.0.0.1'}, cache.get('stack-a'))
+        self.assertEqual({'VDU1': '10.0.0.3'}, cache.get('stack-c'))
+
+    def test_get_returns_copy(self):
+        cache = mgmt_ip_cache.MgmtIpCache(2)
+        cache.put('stack-a', {'VDU1': '10.0.0.1'})
+        cache.get('stack-a')['VDU1'] = '10.0.0.9'
+        self.assertEqual({'VDU1': '10.0.0.1'}, cache.get('stack-a'))
+
+    @mock.patch.object(mgmt_ip_cache, '_cache', None)
+    def test_get_cache_disabled(self):
+        self.config_fixture.config(mgmt_ip_cache_size=0,
+                                   group='openstack_vim')
+        self.assertIsNone(mgmt_ip_cache.get_cache())
@@ -23,7 +23,9 @@ from tacker import context
 from tacker.extensions import vnfm
 from tacker.tests.unit import base
 from tacker.tests.unit.db import utils
+from tacker.vnfm.infra_drivers.openstack import hot_cache
 from tacker.vnfm.infra_drivers.openstack import openstack
+from tacker.vnfm.infra_drivers.openstack import translate_template
 
 
 class FakeHeatClient(mock.Mock):
@@ -308,6 +310,23 @@ class TestOpenStack(base.TestCase):
         self._test_assert_equal_for_tosca_templates('test_tosca_openwrt.yaml',
             'hot_tosca_openwrt.yaml')
 
+    def test_create_tosca_reuses_translation(self):
+        mock.patch.object(hot_cache, '_cache', None).start()
+        translate = mock.patch.object(
+            translate_template.TOSCAToHOT, '_generate_hot_from_tosca',
+            autospec=True,
+            side_effect=translate_template.TOSCAToHOT.
+            _generate_hot_from_tosca).start()
+        fields = []
+        for _ in range(2):
+            vnf = self._get_dummy_tosca_vnf('test_tosca_openwrt.yaml')
+            self.infra_driver.create(plugin=None, context=self.context,
+                                     vnf=vnf,
+                                     auth_attr=utils.get_vim_auth_obj())
+            fields.append(self.heat_client.create.call_args[0][0])
+        self.assertEqual(1, translate.call_count)
+        self.assertEqual(fields[0], fields[1])
+
     def test_create_tosca_with_userdata(self):
         self._test_assert_equal_for_tosca_templates(
             'test_tosca_openwrt_userdata.yaml',
@@ -455,3 +474,43 @@ class TestOpenStack(base.TestCase):
             'hot_tosca_monitoring_multi_vdu.yaml',
             multi_vdus=True
         )
+
+    def _scale_resources(self, member_ids):
+        resources = [mock.Mock(resource_name='SP1_group',
+                               physical_resource_id='grp-id',
+                               parent_resource=None)]
+        for index, member_id in enumerate(member_ids):
+            resources.append(mock.Mock(resource_name='member%d' % index,
+                                       physical_resource_id=member_id,
+                                       resource_status='CREATE_COMPLETE',
+                                       parent_resource='SP1_group'))
+        return resources
+
+    def test_find_mgmt_ips_from_groups(self):
+        self._mock('tacker.vnfm.infra_drivers.openstack.mgmt_ip_cache.'
+                   '_cache', None)
+        heat_client = mock.Mock()
+
+        def resource_get(stack_id, rsc_name):
+            return mock.Mock(attributes={
+                'mgmt_ip-VDU1': '10.0.0.%s' % rsc_name[-1]})
+        heat_client.resource_get.side_effect = resource_get
+
+        heat_client.resource_get_list.return_value = self._scale_resources(
+            ['stack-a', 'stack-b'])
+        mgmt_ips = self.infra_driver._find_mgmt_ips_from_groups(
+            heat_client, 'instance-id', ['SP1_group'])
+        self.assertEqual({'VDU1': ['10.0.0.0', '10.0.0.1']}, mgmt_ips)
+        heat_client.resource_get_list.assert_called_once_with(
+            'instance-id', nested_depth=1)
+        self.assertEqual(2, heat_client.resource_get.call_count)
+
+        # after a scale out only the new member is read
+        heat_client.resource_get.reset_mock()
+        heat_client.resource_get_list.return_value = self._scale_resources(
+            ['stack-a', 'stack-b', 'stack-c'])
+        mgmt_ips = self.infra_driver._find_mgmt_ips_from_groups(
+            heat_client, 'instance-id', ['SP1_group'])
+        self.assertEqual({'VDU1': ['10.0.0.0', '10.0.0.1', '10.0.0.2']},
+                         mgmt_ips)
+        heat_client.resource_get.assert_called_once_with('grp-id', 'member2')
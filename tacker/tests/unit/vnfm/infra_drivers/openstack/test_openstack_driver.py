@@ -18,24 +18,53 @@ import mock
 from tacker.extensions import vnfm
 from tacker.tests.unit import base
 from tacker.vnfm.infra_drivers.openstack import openstack
+from tacker.vnfm.infra_drivers.openstack import stack_poller
 
 
 class TestOpenStack(base.TestCase):
 
+    def _stack_wait(self, status, timed_out=False):
+        wait = stack_poller.StackWait('vnf_id', None, 0)
+        wait.stack = mock.Mock(stack_status=status) if status else None
+        wait.timed_out = timed_out
+        return wait
+
+    @mock.patch("tacker.vnfm.infra_drivers.openstack.stack_poller."
+                "wait_stack")
     @mock.patch("tacker.vnfm.infra_drivers.openstack.heat_client.HeatClient")
-    def test_create_wait_with_heat_connection_exception(self, mocked_hc):
-        stack = {"stack_status", "CREATE_IN_PROGRESS"}
-        mocked_hc.get.side_effect = [stack, Exception("any stuff")]
+    def test_create_wait_timed_out(self, mocked_hc, mocked_wait_stack):
+        mocked_wait_stack.return_value = self._stack_wait(
+            'CREATE_IN_PROGRESS', timed_out=True)
         openstack_driver = openstack.OpenStack()
         self.assertRaises(vnfm.VNFCreateWaitFailed,
                           openstack_driver.create_wait,
                           None, None, {}, 'vnf_id', None)
+        mocked_wait_stack.assert_called_once_with(
+            None, None, 'vnf_id', 'CREATE_IN_PROGRESS', mock.ANY)
 
+    @mock.patch("tacker.vnfm.infra_drivers.openstack.stack_poller."
+                "wait_stack")
     @mock.patch("tacker.vnfm.infra_drivers.openstack.heat_client.HeatClient")
-    def test_delete_wait_with_heat_connection_exception(self, mocked_hc):
-        stack = {"stack_status", "DELETE_IN_PROGRESS"}
-        mocked_hc.get.side_effect = [stack, Exception("any stuff")]
+    def test_create_wait_failed(self, mocked_hc, mocked_wait_stack):
+        mocked_wait_stack.return_value = self._stack_wait('CREATE_FAILED')
+        openstack_driver = openstack.OpenStack()
+        self.assertRaises(vnfm.VNFCreateWaitFailed,
+                          openstack_driver.create_wait,
+                          None, None, {}, 'vnf_id', None)
+
+    @mock.patch("tacker.vnfm.infra_drivers.openstack.stack_poller."
+                "wait_stack")
+    def test_delete_wait_timed_out(self, mocked_wait_stack):
+        mocked_wait_stack.return_value = self._stack_wait(
+            'DELETE_IN_PROGRESS', timed_out=True)
         openstack_driver = openstack.OpenStack()
         self.assertRaises(vnfm.VNFDeleteWaitFailed,
                           openstack_driver.delete_wait,
                           None, None, 'vnf_id', None, None)
+
+    @mock.patch("tacker.vnfm.infra_drivers.openstack.stack_poller."
+                "wait_stack")
+    def test_delete_wait_stack_purged(self, mocked_wait_stack):
+        mocked_wait_stack.return_value = self._stack_wait(None)
+        openstack_driver = openstack.OpenStack()
+        openstack_driver.delete_wait(None, None, 'vnf_id', None, None)
@@ -0,0 +1,78 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from tacker.tests.unit import base
+from tacker.vnfm.infra_drivers.openstack import stack_poller
+
+
+class TestStackPoller(base.TestCase):
+
+    def setUp(self):
+        super(TestStackPoller, self).setUp()
+        self.heatclient = mock.Mock()
+        mock.patch('tacker.vnfm.infra_drivers.openstack.heat_client.'
+                   'HeatClient', return_value=self.heatclient).start()
+        self.spawn_n = mock.patch('eventlet.spawn_n').start()
+        self.addCleanup(mock.patch.stopall)
+        self.poller = stack_poller.StackPoller({'auth_url': 'url'}, None)
+
+    def _stacks(self, **statuses):
+        return [mock.Mock(id=stack_id, stack_status=status)
+                for stack_id, status in statuses.items()]
+
+    def test_poll(self):
+        creating = self.poller.watch('stack1', 'CREATE_IN_PROGRESS', 60)
+        deleting = self.poller.watch('stack2', 'DELETE_IN_PROGRESS', 60)
+        purged = self.poller.watch('stack3', 'DELETE_IN_PROGRESS', 60)
+        self.spawn_n.assert_called_once_with(self.poller._run)
+
+        self.heatclient.stacks.list.return_value = self._stacks(
+            stack1='CREATE_IN_PROGRESS', stack2='DELETE_IN_PROGRESS')
+        self.assertTrue(self.poller.poll())
+        self.heatclient.stacks.list.assert_called_once_with(
+            filters={'id': ['stack1', 'stack2', 'stack3']},
+            show_deleted=True)
+        self.assertIsNone(purged.result())
+        self.assertEqual({creating, deleting}, self.poller._waits)
+
+        self.assertFalse(self.poller.poll())
+
+        self.heatclient.stacks.list.return_value = self._stacks(
+            stack1='CREATE_COMPLETE', stack2='DELETE_IN_PROGRESS')
+        self.assertTrue(self.poller.poll())
+        self.assertEqual('CREATE_COMPLETE', creating.result().stack_status)
+        self.assertEqual({deleting}, self.poller._waits)
+
+    def test_poll_batches(self):
+        self.config_fixture.config(stack_poll_batch_size=2,
+                                   group='openstack_vim')
+        for stack_id in ('stack1', 'stack2', 'stack3'):
+            self.poller.watch(stack_id, 'CREATE_IN_PROGRESS', 60)
+        self.heatclient.stacks.list.return_value = []
+        self.poller.poll()
+        self.heatclient.stacks.list.assert_has_calls([
+            mock.call(filters={'id': ['stack1', 'stack2']},
+                      show_deleted=True),
+            mock.call(filters={'id': ['stack3']}, show_deleted=True)])
+
+    def test_poll_error_until_deadline(self):
+        wait = self.poller.watch('stack1', 'CREATE_IN_PROGRESS', 60)
+        self.heatclient.stacks.list.side_effect = Exception('unreachable')
+        self.assertFalse(self.poller.poll())
+        self.assertEqual({wait}, self.poller._waits)
+
+        wait.deadline = 0
+        self.poller.poll()
+        self.assertTrue(wait.timed_out)
+        self.assertIsNone(wait.result())
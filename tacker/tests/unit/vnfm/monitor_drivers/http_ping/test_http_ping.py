@@ -13,7 +13,7 @@
 #
 
 import mock
-import six.moves.urllib.error as urlerr
+import requests
 import testtools
 
 from tacker.vnfm.monitor_drivers.http_ping import http_ping
@@ -25,19 +25,22 @@ class TestVNFMonitorHTTPPing(testtools.TestCase):
         super(TestVNFMonitorHTTPPing, self).setUp()
         self.monitor_http_ping = http_ping.VNFMonitorHTTPPing()
 
-    @mock.patch('six.moves.urllib.request.urlopen')
-    def test_monitor_call_for_success(self, mock_urlopen):
+    @mock.patch('requests.Session.get')
+    def test_monitor_call_for_success(self, mock_get):
         test_device = {}
         test_kwargs = {
             'mgmt_ip': 'a.b.c.d'
         }
-        self.monitor_http_ping.monitor_call(test_device,
-                                            test_kwargs)
-        mock_urlopen.assert_called_once_with('http://a.b.c.d:80', timeout=5)
+        monitor_return = self.monitor_http_ping.monitor_call(test_device,
+                                                             test_kwargs)
+        self.assertTrue(monitor_return)
+        mock_get.assert_called_once_with('http://a.b.c.d:80', timeout=5)
 
-    @mock.patch('six.moves.urllib.request.urlopen')
-    def test_monitor_call_for_failure(self, mock_urlopen):
-        mock_urlopen.side_effect = urlerr.URLError("MOCK Error")
+    @mock.patch('time.sleep')
+    @mock.patch('requests.Session.get')
+    def test_monitor_call_for_failure(self, mock_get, mock_sleep):
+        mock_get.side_effect = requests.exceptions.ConnectionError(
+            "MOCK Error")
         test_device = {}
         test_kwargs = {
             'mgmt_ip': 'a.b.c.d'
@@ -45,6 +48,22 @@ class TestVNFMonitorHTTPPing(testtools.TestCase):
         monitor_return = self.monitor_http_ping.monitor_call(test_device,
                                                              test_kwargs)
         self.assertEqual('failure', monitor_return)
+        self.assertEqual(5, mock_get.call_count)
+        self.assertEqual([mock.call(0.5), mock.call(1.0), mock.call(2.0),
+                          mock.call(4.0)], mock_sleep.call_args_list)
+
+    @mock.patch('time.sleep')
+    @mock.patch('requests.Session.get')
+    def test_monitor_call_for_http_error(self, mock_get, mock_sleep):
+        mock_get.return_value.raise_for_status.side_effect = \
+            requests.exceptions.HTTPError("MOCK Error")
+        test_kwargs = {
+            'mgmt_ip': 'a.b.c.d',
+            'retry': 2
+        }
+        monitor_return = self.monitor_http_ping.monitor_call({}, test_kwargs)
+        self.assertEqual('failure', monitor_return)
+        self.assertEqual(2, mock_get.call_count)
 
     def test_monitor_url(self):
         test_device = {
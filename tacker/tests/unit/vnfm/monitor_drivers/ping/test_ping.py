@@ -15,6 +15,7 @@
 import mock
 import testtools
 
+from tacker.agent.linux import icmp
 from tacker.vnfm.monitor_drivers.ping import ping
 
 
@@ -51,6 +52,44 @@ class TestVNFMonitorPing(testtools.TestCase):
                                                         test_kwargs)
         self.assertEqual('failure', monitor_return)
 
+    @mock.patch('tacker.agent.linux.utils.execute')
+    @mock.patch('tacker.agent.linux.icmp.ping')
+    def test_monitor_call_icmp_for_success(self, mock_icmp_ping,
+                                           mock_utils_execute):
+        mock_icmp_ping.return_value = {'192.168.0.10': 0.001}
+        test_kwargs = {
+            'mgmt_ip': '192.168.0.10'
+        }
+        monitor_return = self.monitor_ping.monitor_call({}, test_kwargs)
+        self.assertTrue(monitor_return)
+        mock_icmp_ping.assert_called_once_with({'192.168.0.10'}, 5, 1.0,
+                                               0.2)
+        mock_utils_execute.assert_not_called()
+
+    @mock.patch('tacker.agent.linux.icmp.ping')
+    def test_monitor_call_icmp_for_failure(self, mock_icmp_ping):
+        mock_icmp_ping.return_value = {'192.168.0.10': None}
+        test_kwargs = {
+            'mgmt_ip': '192.168.0.10'
+        }
+        monitor_return = self.monitor_ping.monitor_call({}, test_kwargs)
+        self.assertEqual('failure', monitor_return)
+
+    @mock.patch('tacker.agent.linux.utils.execute')
+    @mock.patch('tacker.agent.linux.icmp.ping')
+    def test_monitor_call_icmp_unavailable(self, mock_icmp_ping,
+                                           mock_utils_execute):
+        mock_icmp_ping.side_effect = icmp.IcmpUnavailable(
+            reason='Operation not permitted')
+        test_kwargs = {
+            'mgmt_ip': '192.168.0.10'
+        }
+        self.monitor_ping.monitor_call({}, test_kwargs)
+        self.monitor_ping.monitor_call({}, test_kwargs)
+        mock_icmp_ping.assert_called_once_with({'192.168.0.10'}, 5, 1.0,
+                                               0.2)
+        self.assertEqual(2, mock_utils_execute.call_count)
+
     def test_monitor_url(self):
         test_device = {
             'monitor_url': 'a.b.c.d'
@@ -13,12 +13,12 @@
 #
 
 import json
+import time
 
 import mock
 from oslo_utils import timeutils
 import testtools
 
-from tacker.db.common_services import common_services_db_plugin
 from tacker.plugins.common import constants
 from tacker.vnfm import monitor
 
@@ -56,12 +56,11 @@ class TestVNFMonitor(testtools.TestCase):
         super(TestVNFMonitor, self).setUp()
         p = mock.patch('tacker.common.driver_manager.DriverManager')
         self.mock_monitor_manager = p.start()
-        mock.patch('tacker.db.common_services.common_services_db_plugin.'
-                   'CommonServicesPluginDb.create_event'
-                   ).start()
-        self._cos_db_plugin =\
-            common_services_db_plugin.CommonServicesPluginDb()
+        mock_get_sink = mock.patch(
+            'tacker.db.common_services.event_sink.get_sink').start()
+        self._event_sink = mock_get_sink.return_value
         self.addCleanup(p.stop)
+        self.addCleanup(mock.patch.stopall)
 
     def test_to_hosting_vnf(self):
         test_device_dict = {
@@ -104,7 +103,7 @@ class TestVNFMonitor(testtools.TestCase):
         test_vnfmonitor.add_hosting_vnf(new_dict)
         test_device_id = list(test_vnfmonitor._hosting_vnfs.keys())[0]
         self.assertEqual(MOCK_DEVICE_ID, test_device_id)
-        self._cos_db_plugin.create_event.assert_called_with(
+        self._event_sink.create_event.assert_called_with(
             mock.ANY, res_id=mock.ANY, res_type=constants.RES_TYPE_VNF,
             res_state=mock.ANY, evt_type=constants.RES_EVT_MONITOR,
             tstamp=mock.ANY, details=mock.ANY)
@@ -122,9 +121,169 @@ class TestVNFMonitor(testtools.TestCase):
             'timeout': 2
         }
         test_vnfmonitor = monitor.VNFMonitor(test_boot_wait)
-        self.mock_monitor_manager.invoke = mock.MagicMock()
-        test_vnfmonitor._monitor_manager = self.mock_monitor_manager
+        self.mock_monitor_manager.return_value.method.assert_any_call(
+            'monitor_call')
+        mock_monitor_call = mock.MagicMock()
+        test_vnfmonitor._monitor_methods['monitor_call'] = mock_monitor_call
         test_vnfmonitor.run_monitor(test_hosting_vnf)
-        self.mock_monitor_manager\
-            .invoke.assert_called_once_with('ping', 'monitor_call', vnf={},
-                                            kwargs=mock_kwargs)
+        mock_monitor_call.assert_called_once_with('ping', vnf={},
+                                                  kwargs=mock_kwargs)
+
+    @mock.patch('tacker.vnfm.monitor.PROBES')
+    @mock.patch('tacker.vnfm.monitor.PROBE_SECONDS')
+    @mock.patch('tacker.vnfm.monitor.VNFMonitor.__run__')
+    def test_monitor_call_metrics(self, mock_monitor_run, mock_seconds,
+                                  mock_probes):
+        test_vnfmonitor = monitor.VNFMonitor(30)
+        mock_monitor_call = mock.MagicMock(return_value='failure')
+        test_vnfmonitor._monitor_methods['monitor_call'] = mock_monitor_call
+        test_vnfmonitor.monitor_call('ping', {}, {})
+        mock_probes.inc.assert_called_once_with(driver='ping',
+                                                result='failure')
+        mock_seconds.observe.assert_called_once_with(mock.ANY, driver='ping')
+
+        mock_monitor_call.side_effect = RuntimeError
+        self.assertRaises(RuntimeError, test_vnfmonitor.monitor_call,
+                          'ping', {}, {})
+        mock_probes.inc.assert_called_with(driver='ping', result='error')
+
+    @mock.patch('tacker.vnfm.monitor.VNFMonitor.__run__')
+    def test_add_hosting_vnf_schedules_probes(self, mock_monitor_run):
+        test_device_dict = {
+            'id': MOCK_DEVICE_ID,
+            'mgmt_url': '{"vdu1": "a.b.c.d"}',
+            'attributes': {
+                'monitoring_policy': json.dumps(
+                        MOCK_VNF_DEVICE['monitoring_policy'])
+            },
+            'status': 'ACTIVE'
+        }
+        mock.patch.object(monitor.VNFMonitor, '_schedule', []).start()
+        mock.patch.object(monitor.VNFMonitor, '_hosting_vnfs', {}).start()
+        self.addCleanup(mock.patch.stopall)
+        test_vnfmonitor = monitor.VNFMonitor(30)
+        new_dict = test_vnfmonitor.to_hosting_vnf(test_device_dict,
+                                                  mock.MagicMock())
+        test_vnfmonitor.add_hosting_vnf(new_dict)
+        self.assertEqual(1, len(test_vnfmonitor._schedule))
+        due_at, _seq, hosting_vnf, vdu, driver = \
+            test_vnfmonitor._schedule[0]
+        self.assertIs(new_dict, hosting_vnf)
+        self.assertEqual(('vdu1', 'ping'), (vdu, driver))
+        self.assertEqual([test_vnfmonitor._schedule[0]],
+                         test_vnfmonitor._pop_due_probes())
+
+    @mock.patch('tacker.vnfm.monitor.VNFMonitor.__run__')
+    def test_restore_hosting_vnfs(self, mock_monitor_run):
+        mock.patch.object(monitor.VNFMonitor, '_schedule', []).start()
+        mock.patch.object(monitor.VNFMonitor, '_hosting_vnfs', {}).start()
+        self.addCleanup(mock.patch.stopall)
+        test_vnfmonitor = monitor.VNFMonitor(30)
+        hosting_vnf = {
+            'id': MOCK_DEVICE_ID,
+            'management_ip_addresses': {'vdu1': 'a.b.c.d'},
+            'monitoring_policy': MOCK_VNF_DEVICE['monitoring_policy'],
+        }
+        before = time.time()
+        test_vnfmonitor.restore_hosting_vnfs(iter([hosting_vnf]), spread=5)
+        self.assertIs(hosting_vnf,
+                      test_vnfmonitor._hosting_vnfs[MOCK_DEVICE_ID])
+        self.assertEqual(1, len(test_vnfmonitor._schedule))
+        due_at = test_vnfmonitor._schedule[0][0]
+        self.assertTrue(before <= due_at <= time.time() + 5)
+        self._event_sink.create_event.assert_not_called()
+
+    @mock.patch('tacker.vnfm.monitor.VNFMonitor.__run__')
+    def test_pop_due_probes_drops_deleted_vnf(self, mock_monitor_run):
+        mock.patch.object(monitor.VNFMonitor, '_schedule', []).start()
+        mock.patch.object(monitor.VNFMonitor, '_hosting_vnfs', {}).start()
+        self.addCleanup(mock.patch.stopall)
+        test_vnfmonitor = monitor.VNFMonitor(30)
+        deleted_vnf = {'id': 'deleted-vnf'}
+        live_vnf = {'id': MOCK_DEVICE_ID}
+        test_vnfmonitor._hosting_vnfs[MOCK_DEVICE_ID] = live_vnf
+        with test_vnfmonitor._lock:
+            test_vnfmonitor._push_probe(0, deleted_vnf, 'vdu1', 'ping')
+            test_vnfmonitor._push_probe(0, live_vnf, 'vdu1', 'ping')
+        due = test_vnfmonitor._pop_due_probes()
+        self.assertEqual([live_vnf], [entry[2] for entry in due])
+        self.assertEqual([], test_vnfmonitor._schedule)
+
+    @mock.patch('tacker.vnfm.monitor.VNFMonitor.__run__')
+    def test_run_monitor_skips_actions_of_unowned_vnf(self, mock_monitor_run):
+        test_hosting_vnf = MOCK_VNF_DEVICE
+        test_hosting_vnf['vnf'] = {}
+        test_hosting_vnf['action_cb'] = mock.MagicMock()
+        test_vnfmonitor = monitor.VNFMonitor(30)
+        test_vnfmonitor._monitor_methods['monitor_call'] = mock.MagicMock(
+            return_value='failure')
+        mock_partition = mock.Mock()
+        mock_partition.owns.return_value = False
+        mock.patch.object(test_vnfmonitor, '_partition',
+                          mock_partition).start()
+        self.addCleanup(mock.patch.stopall)
+        test_vnfmonitor.run_monitor(test_hosting_vnf)
+        test_hosting_vnf['action_cb'].assert_not_called()
+
+
+class TestVNFMonitorPartition(testtools.TestCase):
+
+    def setUp(self):
+        super(TestVNFMonitorPartition, self).setUp()
+        p = mock.patch('tacker.service.Heartbeat')
+        self.mock_heartbeat = p.start().return_value
+        self.addCleanup(p.stop)
+        self.partition = monitor.VNFMonitorPartition(30)
+
+    def test_refresh(self):
+        self.mock_heartbeat.get_members.return_value = {'other:1'}
+        self.assertTrue(self.partition.refresh())
+        self.mock_heartbeat.report_state.assert_called_once_with()
+        self.mock_heartbeat.get_members.assert_called_once_with(30)
+        self.assertFalse(self.partition.refresh())
+
+    def test_owns(self):
+        vnf_ids = ['vnf-%d' % i for i in range(20)]
+        self.assertTrue(all(self.partition.owns(vnf_id)
+                            for vnf_id in vnf_ids))
+        self.mock_heartbeat.get_members.return_value = {'other:1'}
+        self.partition.refresh()
+        owned = [vnf_id for vnf_id in vnf_ids
+                 if self.partition.owns(vnf_id)]
+        self.assertNotEqual(vnf_ids, owned)
+        self.assertNotEqual([], owned)
+
+
+class TestProbeState(testtools.TestCase):
+
+    def _update(self, state, result):
+        return state.update(result, base_intvl=10, fast_intvl=1,
+                            max_intvl=80, confirm_count=3)
+
+    def test_healthy_backoff(self):
+        state = monitor.ProbeState()
+        intervals = [self._update(state, None) for _ in range(5)]
+        self.assertEqual([(None, 20), (None, 40), (None, 80), (None, 80),
+                          (None, 80)], intervals)
+
+    def test_failure_confirmed(self):
+        state = monitor.ProbeState()
+        self._update(state, None)
+        self.assertEqual((None, 1), self._update(state, 'failure'))
+        self.assertEqual((None, 1), self._update(state, 'failure'))
+        self.assertEqual(('failure', 10), self._update(state, 'failure'))
+        self.assertEqual(('failure', 10), self._update(state, 'failure'))
+
+    def test_failure_not_confirmed(self):
+        state = monitor.ProbeState()
+        self._update(state, None)
+        self.assertEqual((None, 1), self._update(state, 'failure'))
+        self.assertEqual((None, 10), self._update(state, None))
+        self.assertEqual((None, 1), self._update(state, 'failure'))
+        self.assertEqual((None, 1), self._update(state, 'failure'))
+        self.assertEqual((None, 10), self._update(state, None))
+
+    def test_single_confirmation(self):
+        state = monitor.ProbeState()
+        self.assertEqual(('failure', 10),
+                         state.update('failure', 10, 1, 10, 1))
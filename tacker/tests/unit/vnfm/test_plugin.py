@@ -18,9 +18,11 @@ from datetime import datetime
 import mock
 from mock import patch
 from oslo_utils import uuidutils
+from sqlalchemy import event
 import yaml
 
 from tacker import context
+from tacker.db import api as db_api
 from tacker.db.common_services import common_services_db_plugin
 from tacker.db.nfvo import nfvo_db
 from tacker.db.nfvo import ns_db
@@ -30,6 +32,7 @@ from tacker.plugins.common import constants
 from tacker.tests.unit.db import base as db_base
 from tacker.tests.unit.db import utils
 from tacker.vnfm import plugin
+from tacker.vnfm import resource_cache
 
 
 class FakeDriverManager(mock.Mock):
@@ -59,6 +62,7 @@ class TestVNFMPlugin(db_base.SqlTestCase):
     def setUp(self):
         super(TestVNFMPlugin, self).setUp()
         self.addCleanup(mock.patch.stopall)
+        self.addCleanup(resource_cache._snapshots.clear)
         self.context = context.get_admin_context()
         self._mock_vim_client()
         self._stub_get_vim()
@@ -219,13 +223,15 @@ class TestVNFMPlugin(db_base.SqlTestCase):
         session.add(vim_auth_db)
         session.flush()
 
+    @mock.patch('tacker.vnfm.plugin.vnfd_model.build')
     @mock.patch('tacker.vnfm.plugin.toscautils.updateimports')
     @mock.patch('tacker.vnfm.plugin.ToscaTemplate')
     @mock.patch('tacker.vnfm.plugin.toscautils.get_mgmt_driver')
     def test_create_vnfd(self, mock_get_mgmt_driver, mock_tosca_template,
-                        mock_update_imports):
+                        mock_update_imports, mock_build):
         mock_get_mgmt_driver.return_value = 'dummy_mgmt_driver'
         mock_tosca_template.return_value = mock.ANY
+        mock_build.return_value = {'version': 1}
 
         vnfd_obj = utils.get_dummy_vnfd_obj()
         result = self.vnfm_plugin.create_vnfd(self.context, vnfd_obj)
@@ -244,6 +250,9 @@ class TestVNFMPlugin(db_base.SqlTestCase):
             a_file=False, yaml_dict_tpl=yaml_dict)
         mock_get_mgmt_driver.assert_called_once_with(mock.ANY)
         mock_update_imports.assert_called_once_with(yaml_dict)
+        mock_build.assert_called_once_with(mock.ANY)
+        self.assertNotIn('vnfd_model', result['attributes'])
+        self.assertEqual('{"version": 1}', result['model'])
         self._cos_db_plugin.create_event.assert_called_once_with(
             self.context, evt_type=constants.RES_EVT_CREATE, res_id=mock.ANY,
             res_state=constants.RES_EVT_ONBOARDED,
@@ -280,6 +289,16 @@ class TestVNFMPlugin(db_base.SqlTestCase):
             res_state=mock.ANY, res_type=constants.RES_TYPE_VNF,
             tstamp=mock.ANY, details=mock.ANY)
 
+    def test_create_vnf_attributes_column(self):
+        self._insert_dummy_device_template()
+        vnf_obj = utils.get_dummy_vnf_obj()
+        result = self.vnfm_plugin.create_vnf(self.context, vnf_obj)
+        vnf_db = self.context.session.query(vnfm_db.VNF).filter_by(
+            id=result['id']).one()
+        self.assertEqual(result['attributes'], vnf_db.attributes)
+        self.assertEqual(0, self.context.session.query(
+            vnfm_db.VNFAttribute).count())
+
     @mock.patch('tacker.vnfm.plugin.VNFMPlugin.create_vnfd')
     def test_create_vnf_from_template(self, mock_create_vnfd):
         self._insert_dummy_device_template_inline()
@@ -309,6 +328,60 @@ class TestVNFMPlugin(db_base.SqlTestCase):
             res_state=mock.ANY, res_type=constants.RES_TYPE_VNF,
             tstamp=mock.ANY, details=mock.ANY)
 
+    def _get_dummy_bulk_vnf_obj(self, count):
+        vnfs = []
+        for index in range(count):
+            vnf_obj = utils.get_dummy_vnf_obj()
+            vnf_obj['vnf']['name'] = 'dummy_vnf_%d' % index
+            vnfs.append(vnf_obj)
+        return {'vnfs': vnfs}
+
+    def _run_green_pool_imap(self):
+        self._pool.imap.side_effect = (
+            lambda function, items: [function(item) for item in items])
+
+    def test_create_vnf_bulk(self):
+        self._insert_dummy_device_template()
+        self._run_green_pool_imap()
+        result = self.vnfm_plugin.create_vnf_bulk(
+            self.context, self._get_dummy_bulk_vnf_obj(3))
+        self.assertEqual(['dummy_vnf_0', 'dummy_vnf_1', 'dummy_vnf_2'],
+                         [vnf['name'] for vnf in result])
+        for vnf in result:
+            self.assertEqual(constants.PENDING_CREATE, vnf['status'])
+            self.assertIsNotNone(vnf['instance_id'])
+        self.vim_client.get_vim.assert_called_once_with(
+            self.context, '6261579e-d6f3-49ad-8bc3-a9cb974778ff', None)
+        # the first vnf is created before the two others
+        self.assertEqual([mock.call(mock.ANY, [0]),
+                          mock.call(mock.ANY, [1, 2])],
+                         self._pool.imap.call_args_list)
+        self.assertEqual(3, self._pool.spawn_n.call_count)
+        # each vnf is created with a context, and session, of its own
+        contexts = [kwargs['context'] for args, kwargs in
+                    self._device_manager.invoke.call_args_list
+                    if args[1] == 'create']
+        self.assertEqual(3, len(set(id(ctx) for ctx in contexts)))
+        self.assertNotIn(self.context, contexts)
+
+    def test_create_vnf_bulk_failure(self):
+        self._insert_dummy_device_template()
+        self._run_green_pool_imap()
+
+        def invoke(driver_name, method, **kwargs):
+            if method == 'create':
+                if kwargs['vnf']['name'] == 'dummy_vnf_1':
+                    raise vnfm.HeatClientException(msg='quota exceeded')
+                return uuidutils.generate_uuid()
+        self._device_manager.invoke.side_effect = invoke
+
+        result = self.vnfm_plugin.create_vnf_bulk(
+            self.context, self._get_dummy_bulk_vnf_obj(3))
+        self.assertEqual([constants.PENDING_CREATE, constants.ERROR,
+                          constants.PENDING_CREATE],
+                         [vnf['status'] for vnf in result])
+        self.assertEqual('quota exceeded', result[1]['error_reason'])
+
     def test_show_vnf_details_vnf_inactive(self):
         self._insert_dummy_device_template()
         vnf_obj = utils.get_dummy_vnf_obj()
@@ -325,6 +398,177 @@ class TestVNFMPlugin(db_base.SqlTestCase):
         self.assertIn('type', resources)
         self.assertIn('id', resources)
 
+    def test_show_vnf_details_cached(self):
+        self._insert_dummy_device_template()
+        active_vnf = self._insert_dummy_device()
+        resources = self.vnfm_plugin.get_vnf_resources(self.context,
+                                                       active_vnf['id'])
+        self.assertEqual(resources, self.vnfm_plugin.get_vnf_resources(
+            self.context, active_vnf['id']))
+        self.assertEqual(1, self.vim_client.get_vim.call_count)
+        self._device_manager.invoke.assert_called_once_with(
+            'test_vim', 'get_resource_info', plugin=self.vnfm_plugin,
+            context=self.context, vnf_info=mock.ANY, auth_attr=mock.ANY)
+
+        # a status change drops the cached resources
+        self.vnfm_plugin._update_vnf_pre(self.context, active_vnf['id'])
+        self.assertIsNone(resource_cache.get(active_vnf['id'],
+                                             active_vnf['instance_id']))
+
+    def test_get_vnfs_resources(self):
+        self._insert_dummy_device_template()
+        active_vnf = self._insert_dummy_device()
+        session = self.context.session
+        with session.begin(subtransactions=True):
+            session.add(vnfm_db.VNF(
+                id='5b6f1a3c-8e2d-4f7a-9c1b-3d4e5f6a7b8c',
+                tenant_id='ad7ebc56538745a08ef7c5e97f8bd437',
+                name='fake_device2',
+                instance_id='0c1d2e3f-4a5b-4c6d-8e7f-9a0b1c2d3e4f',
+                vnfd_id='eb094833-995e-49f0-a047-dfb56aaf7c4e',
+                vim_id='6261579e-d6f3-49ad-8bc3-a9cb974778ff',
+                placement_attr={'region': 'RegionOne'},
+                status='ACTIVE',
+                deleted_at=datetime.min))
+            session.add(vnfm_db.VNF(
+                id='9a8b7c6d-5e4f-4a3b-8c2d-1e0f9a8b7c6d',
+                tenant_id='ad7ebc56538745a08ef7c5e97f8bd437',
+                name='fake_device3',
+                vnfd_id='eb094833-995e-49f0-a047-dfb56aaf7c4e',
+                vim_id='6261579e-d6f3-49ad-8bc3-a9cb974778ff',
+                placement_attr={'region': 'RegionOne'},
+                status='PENDING_CREATE',
+                deleted_at=datetime.min))
+        vnf_ids = [active_vnf['id'],
+                   '5b6f1a3c-8e2d-4f7a-9c1b-3d4e5f6a7b8c',
+                   '9a8b7c6d-5e4f-4a3b-8c2d-1e0f9a8b7c6d']
+
+        vnfs_resources = self.vnfm_plugin.get_vnfs_resources(self.context,
+                                                             vnf_ids)
+        self.assertEqual(sorted(vnf_ids[:2]), sorted(vnfs_resources))
+        self.assertEqual(1, self.vim_client.get_vim.call_count)
+        self.assertEqual(2, self._device_manager.invoke.call_count)
+
+    def _capture_queries(self, func, *args, **kwargs):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+        engine = db_api.get_engine()
+        event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            event.remove(engine, 'before_cursor_execute',
+                         before_cursor_execute)
+        return result, statements
+
+    def test_get_vnfs_eager_loaded(self):
+        self._insert_dummy_device_template()
+        device_db = self._insert_dummy_device()
+        # a migrated vnf, its attributes are in its row
+        device_db.attributes = {}
+        self.context.session.flush()
+        vnfs, queries = self._capture_queries(self.vnfm_plugin.get_vnfs,
+                                              self.context)
+        self.assertEqual(1, len(vnfs))
+        self.assertIn('service_types', vnfs[0]['vnfd'])
+        self.assertFalse([query for query in queries
+                          if 'vnf_attribute' in query])
+
+        session = self.context.session
+        with session.begin(subtransactions=True):
+            session.add(vnfm_db.VNF(
+                id='5b6f1a3c-8e2d-4f7a-9c1b-3d4e5f6a7b8c',
+                tenant_id='ad7ebc56538745a08ef7c5e97f8bd437',
+                name='fake_device2',
+                vnfd_id='eb094833-995e-49f0-a047-dfb56aaf7c4e',
+                vim_id='6261579e-d6f3-49ad-8bc3-a9cb974778ff',
+                status='ACTIVE',
+                attributes={},
+                deleted_at=datetime.min))
+        vnfs, more_queries = self._capture_queries(
+            self.vnfm_plugin.get_vnfs, self.context)
+        self.assertEqual(2, len(vnfs))
+        self.assertEqual(len(queries), len(more_queries))
+
+        # only the relationships of the requested fields are loaded
+        vnfs, fewer_queries = self._capture_queries(
+            self.vnfm_plugin.get_vnfs, self.context, fields=['id', 'name'])
+        self.assertEqual({'id', 'name'}, set(vnfs[0]))
+        self.assertEqual(1, len(fewer_queries))
+
+    def test_get_vnfs_defer_columns(self):
+        self._insert_dummy_device_template()
+        self._insert_dummy_device()
+        session = self.context.session
+        with session.begin(subtransactions=True):
+            for index in range(4):
+                session.add(vnfm_db.VNF(
+                    id=uuidutils.generate_uuid(),
+                    tenant_id='ad7ebc56538745a08ef7c5e97f8bd437',
+                    name='fake_device%d' % index,
+                    description='fake_device_description',
+                    vnfd_id='eb094833-995e-49f0-a047-dfb56aaf7c4e',
+                    vim_id='6261579e-d6f3-49ad-8bc3-a9cb974778ff',
+                    placement_attr={'region': 'RegionOne'},
+                    status='ACTIVE',
+                    deleted_at=datetime.min))
+        # the rows are not loaded in the session yet
+        session.expunge_all()
+
+        vnfs, queries = self._capture_queries(
+            self.vnfm_plugin.get_vnfs, self.context,
+            fields=['id', 'name', 'description'])
+        self.assertEqual(5, len(vnfs))
+        self.assertEqual({'id', 'name', 'description'}, set(vnfs[0]))
+        # the large columns not requested are neither selected nor loaded
+        # by the dict of each row
+        self.assertEqual(1, len(queries))
+        self.assertIn('vnf.description', queries[0])
+        self.assertNotIn('vnf.placement_attr', queries[0])
+        self.assertNotIn('vnf.error_reason', queries[0])
+        self.assertIn('vnf.status', queries[0])
+
+    def test_get_monitored_vnfs(self):
+        self._insert_dummy_device_template()
+        device_db = self._insert_dummy_device()
+        device_db.mgmt_url = '{"VDU1": "a.b.c.d"}'
+        session = self.context.session
+        session.add(vnfm_db.VNFAttribute(
+            id='7800cb81-7ed1-4cf6-8387-746468522652',
+            vnf_id=device_db['id'],
+            key='monitoring_policy',
+            value='{"vdus": {}}'))
+        session.flush()
+        monitored_vnfs = list(self.vnfm_plugin.get_monitored_vnfs(
+            self.context, page_size=1))
+        self.assertEqual([{'id': device_db['id'],
+                           'status': 'ACTIVE',
+                           'mgmt_url': '{"VDU1": "a.b.c.d"}',
+                           'attributes': {
+                               'monitoring_policy': '{"vdus": {}}'}}],
+                         monitored_vnfs)
+
+    def test_partial_hosting_vnf_actions_own_context(self):
+        self._vnf_monitor.to_hosting_vnf.side_effect = (
+            lambda vnf_dict, action_cb: {'id': vnf_dict['id'],
+                                         'vnf': vnf_dict,
+                                         'action_cb': action_cb})
+        with mock.patch.object(self.vnfm_plugin, 'get_vnf') as mock_get_vnf,\
+                mock.patch.object(self.vnfm_plugin,
+                                  '_vnf_action') as mock_action:
+            hosting_vnf = self.vnfm_plugin._to_hosting_vnf(
+                self.context, {'id': 'vnf-1'}, partial=True)
+            hosting_vnf['action_cb']('respawn')
+            hosting_vnf['action_cb']('log')
+        contexts = [kwargs['context']
+                    for _args, kwargs in mock_action.invoke.call_args_list]
+        self.assertEqual(2, len(contexts))
+        self.assertNotIn(self.context, contexts)
+        self.assertIsNot(contexts[0], contexts[1])
+        mock_get_vnf.assert_called_once_with(contexts[0], 'vnf-1')
+
     def test_delete_vnf(self):
         self._insert_dummy_device_template()
         dummy_device_obj = self._insert_dummy_device()
@@ -426,6 +670,27 @@ class TestVNFMPlugin(db_base.SqlTestCase):
             res_state=mock.ANY, res_type=constants.RES_TYPE_VNF,
             tstamp=mock.ANY)
 
+    def test_update_vnf_post_migrates_attributes(self):
+        self._insert_dummy_device_template()
+        dummy_device_obj = self._insert_dummy_device()
+        self._insert_scaling_attributes_vnf()
+        vnf_id = dummy_device_obj['id']
+        self.assertEqual(
+            {'scaling_group_names': '{"SP1": "G1"}'},
+            self.vnfm_plugin.get_vnf(self.context, vnf_id)['attributes'])
+
+        self.vnfm_plugin._update_vnf_post(
+            self.context, vnf_id, constants.ACTIVE,
+            {'attributes': {'scaling_group_names': '{"SP1": "G1"}',
+                            'config': 'vdus: {}\n',
+                            'vim_auth': 'secret'}})
+
+        self.assertEqual(0, self.context.session.query(
+            vnfm_db.VNFAttribute).count())
+        self.assertEqual(
+            {'scaling_group_names': '{"SP1": "G1"}', 'config': 'vdus: {}\n'},
+            self.vnfm_plugin.get_vnf(self.context, vnf_id)['attributes'])
+
     def _get_dummy_scaling_policy(self, type):
         vnf_scale = {}
         vnf_scale['scale'] = {}
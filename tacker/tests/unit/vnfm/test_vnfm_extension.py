@@ -0,0 +1,32 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from tacker.extensions import vnfm
+from tacker.plugins.common import constants
+from tacker.tests.unit import base
+
+
+class TestVnfmExtension(base.TestCase):
+
+    @mock.patch('tacker.api.v1.base.create_resource')
+    @mock.patch('tacker.manager.TackerManager.get_service_plugins')
+    def test_get_resources_bulk_vnfs_only(self, mock_get_service_plugins,
+                                          mock_create_resource):
+        mock_get_service_plugins.return_value = {constants.VNFM: mock.Mock()}
+        vnfm.Vnfm.get_resources()
+        allow_bulk = dict(
+            (args[0], kwargs['allow_bulk'])
+            for args, kwargs in mock_create_resource.call_args_list
+            if args[0] in vnfm.RESOURCE_ATTRIBUTE_MAP)
+        self.assertEqual({'vnfds': False, 'vnfs': True}, allow_bulk)
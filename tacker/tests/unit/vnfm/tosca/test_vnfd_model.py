@@ -0,0 +1,92 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import codecs
+import os
+
+import testtools
+import yaml
+
+from tacker.tosca import utils as toscautils
+from tacker.tosca import vnfd_model
+from toscaparser import tosca_template
+
+
+def _get_template(name):
+    filename = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "../infra_drivers/openstack/data/", name)
+    f = codecs.open(filename, encoding='utf-8', errors='strict')
+    return f.read()
+
+
+def _build(name):
+    vnfd_dict = yaml.safe_load(_get_template(name))
+    toscautils.updateimports(vnfd_dict)
+    tosca = tosca_template.ToscaTemplate(parsed_params={}, a_file=False,
+                                         yaml_dict_tpl=vnfd_dict)
+    return vnfd_model.build(tosca)
+
+
+class TestVnfdModel(testtools.TestCase):
+
+    tosca_scale = _get_template('tosca_scale.yaml')
+    model = _build('tosca_scale.yaml')
+
+    def _node_template(self, name):
+        for node_template in self.model['node_templates']:
+            if node_template['name'] == name:
+                return node_template
+
+    def test_node_templates(self):
+        vdu = self._node_template('VDU1')
+        self.assertTrue(vnfd_model.is_derived_from(vdu, toscautils.TACKERVDU))
+        self.assertTrue(vnfd_model.is_derived_from(vdu,
+                                                   'tosca.nodes.Compute'))
+        self.assertEqual('m1.tiny', vdu['properties']['flavor'])
+
+        cp = self._node_template('CP1')
+        self.assertTrue(cp['properties']['management'])
+        self.assertEqual(
+            ['VDU1', 'VL1'],
+            sorted(rel['target'] for rel in cp['relationships']))
+
+    def test_policies(self):
+        policy = self.model['policies'][0]
+        self.assertEqual('SP1', policy['name'])
+        self.assertTrue(vnfd_model.is_derived_from(
+            policy, 'tosca.policies.Scaling'))
+        self.assertEqual(['VDU1'], policy['targets'])
+        self.assertEqual(3, policy['properties']['max_instances'])
+
+    def _vnfd(self, model=None):
+        return {'attributes': {'vnfd': self.tosca_scale}, 'model': model}
+
+    def test_load(self):
+        vnfd = self._vnfd(vnfd_model.dumps(self.model))
+        self.assertEqual(self.model, vnfd_model.load(vnfd))
+        self.assertIsNone(vnfd_model.load(self._vnfd()))
+
+        vnfd['model'] = vnfd_model.dumps(
+            dict(self.model, version=vnfd_model.VERSION - 1))
+        self.assertIsNone(vnfd_model.load(vnfd))
+
+    def test_get_policies(self):
+        expected = yaml.safe_load(
+            self.tosca_scale)['topology_template']['policies'][0]['SP1']
+        self.assertEqual([('SP1', expected)], vnfd_model.get_policies(
+            self._vnfd(vnfd_model.dumps(self.model))))
+        # VNFDs onboarded without the model
+        self.assertEqual([('SP1', expected)],
+                         vnfd_model.get_policies(self._vnfd()))
+        self.assertEqual([], vnfd_model.get_policies(
+            {'attributes': {'vnfd': ''}}))
@@ -0,0 +1,125 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Compact model of a VNFD parsed by tosca-parser.
+
+The model is built once when the VNFD is onboarded and is stored as JSON
+in the `model` column of the VNFD, next to its YAML, so that the VNF
+operations read the node templates and policies without parsing the
+template again. It is internal and not returned by the API. Node
+templates, relationships and policies carry the list of their type and
+parent types, to check what they derive from.
+"""
+
+from oslo_serialization import jsonutils
+import six
+from toscaparser import functions
+import yaml
+
+# bumped when the model changes, older models are then ignored
+VERSION = 2
+
+
+def _types(type_definition):
+    types = []
+    while type_definition is not None:
+        types.append(type_definition.type)
+        type_definition = type_definition.parent_type
+    return types
+
+
+def _primitive(value):
+    if isinstance(value, functions.GetInput):
+        return {'get_input': value.input_name}
+    if isinstance(value, functions.Function):
+        return {value.name: _primitive(value.args)}
+    if isinstance(value, dict):
+        return dict((key, _primitive(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return [_primitive(item) for item in value]
+    if value is None or isinstance(value, (bool, float, six.integer_types,
+                                           six.string_types)):
+        return value
+    return six.text_type(value)
+
+
+def _node_template(node_template):
+    return {
+        'name': node_template.name,
+        'types': _types(node_template.type_definition),
+        'properties': dict(
+            (prop.name, _primitive(prop.value))
+            for prop in node_template.get_properties_objects()),
+        'relationships': [
+            {'types': _types(relationship), 'target': node.name}
+            for relationship, node in node_template.relationships.items()],
+    }
+
+
+def _policy(policy):
+    return {
+        'name': policy.name,
+        'types': _types(policy.type_definition),
+        'targets': list(policy.targets or []),
+        'properties': _primitive(policy.properties or {}),
+        # the policy as written in the template
+        'template': _primitive(policy.entity_tpl),
+    }
+
+
+def build(tosca):
+    """Return the model of a parsed ToscaTemplate."""
+    return {
+        'version': VERSION,
+        'node_templates': [_node_template(node_template)
+                           for node_template in tosca.nodetemplates],
+        'policies': [_policy(policy) for policy in tosca.policies],
+    }
+
+
+def dumps(model):
+    return jsonutils.dumps(model)
+
+
+def load(vnfd):
+    """Return the model stored with a VNFD dict, None if there is none.
+
+    VNFDs onboarded before the model existed, or with an older version of
+    it, have none and must be parsed.
+    """
+    model = vnfd.get('model')
+    if not model:
+        return None
+    model = jsonutils.loads(model)
+    if model.get('version') != VERSION:
+        return None
+    return model
+
+
+def is_derived_from(entry, type_name):
+    """Tell whether a model entry is of type_name or derives from it."""
+    return type_name in entry['types']
+
+
+def get_policies(vnfd):
+    """Return the (name, template) pairs of the policies of a VNFD dict."""
+    model = load(vnfd)
+    if model is not None:
+        return [(policy['name'], policy['template'])
+                for policy in model['policies']]
+    vnfd_dict = yaml.safe_load(vnfd['attributes'].get('vnfd', ''))
+    if not vnfd_dict or not vnfd_dict.get('tosca_definitions_version'):
+        return []
+    return [item
+            for policy_dict in vnfd_dict['topology_template'].get(
+                'policies', [])
+            for item in policy_dict.items()]
@@ -20,9 +20,9 @@ from oslo_utils import uuidutils
 from tacker.common import log
 from tacker.extensions import vnfm
 from tacker.tosca import utils as toscautils
+from tacker.tosca import vnfd_model
 from tacker.vnfm.infra_drivers.kubernetes.k8s import tosca_kube_object
 
-from toscaparser.functions import GetInput
 from toscaparser import tosca_template
 import toscaparser.utils.yamlparser
 
@@ -55,31 +55,41 @@ SCALAR_UNIT_DICT = {'B': 1, 'kB': 1000, 'KiB': 1024, 'MB': 1000000,
 
 
 class Parser(object):
-    """Convert TOSCA template to Tosca Kube object"""
+    """Convert TOSCA template to Tosca Kube object
 
-    def __init__(self, vnfd_dict):
+    The template is parsed unless the model stored at its onboarding is
+    given.
+    """
+
+    def __init__(self, vnfd_dict, model=None):
         self.vnfd_dict = vnfd_dict
+        self.model = model
 
     def loader(self):
         """Load TOSCA template and start parsing"""
 
-        try:
-            parserd_params = None
-            toscautils.updateimports(self.vnfd_dict)
-            tosca = tosca_template.\
-                ToscaTemplate(parsed_params=parserd_params,
-                              a_file=False,
-                              yaml_dict_tpl=self.vnfd_dict)
-        except Exception as e:
-            LOG.debug("tosca-parser error: %s", str(e))
-            raise vnfm.ToscaParserFailed(error_msg_details=str(e))
+        tosca = self.model
+        if tosca is None:
+            try:
+                parserd_params = None
+                toscautils.updateimports(self.vnfd_dict)
+                tosca = vnfd_model.build(tosca_template.
+                                         ToscaTemplate(
+                                             parsed_params=parserd_params,
+                                             a_file=False,
+                                             yaml_dict_tpl=self.vnfd_dict))
+            except Exception as e:
+                LOG.debug("tosca-parser error: %s", str(e))
+                raise vnfm.ToscaParserFailed(error_msg_details=str(e))
 
         # Initiate a list tosca_kube_object which are defined from VDU
         tosca_kube_objects = []
-        vdus = toscautils.findvdus(tosca)
+        vdus = [node_template for node_template in tosca['node_templates']
+                if vnfd_model.is_derived_from(node_template,
+                                              toscautils.TACKERVDU)]
 
         for node_template in vdus:
-            vdu_name = node_template.name
+            vdu_name = node_template['name']
             tosca_kube_obj = self.tosca_to_kube_mapping(node_template)
 
             # Find network name in which VDU is attached
@@ -105,7 +115,7 @@ class Parser(object):
         tosca_kube_obj = tosca_kube_object.ToscaKubeObject()
 
         # tosca_kube_obj name is used for tracking Kubernetes resources
-        service_name = 'svc-' + node_template.name + '-' + \
+        service_name = 'svc-' + node_template['name'] + '-' + \
                        uuidutils.generate_uuid()
         tosca_kube_obj.name = service_name[:15]
         tosca_kube_obj.namespace = tosca_props.get('namespace')
@@ -169,19 +179,19 @@ class Parser(object):
     @log.log
     def get_scaling_policy(self, tosca, vdu_name):
         """Find scaling policy which is used for VDU"""
-        if len(tosca.policies) == 0:
+        if len(tosca['policies']) == 0:
             scaling_obj = None
         else:
             count = 0
             scaling_obj = tosca_kube_object.ScalingObject()
-            for policy in tosca.policies:
-                if policy.type_definition.is_derived_from(SCALING) \
-                        and vdu_name in policy.targets:
+            for policy in tosca['policies']:
+                if vnfd_model.is_derived_from(policy, SCALING) \
+                        and vdu_name in policy['targets']:
                     count = count + 1
-                    policy_props = policy.properties
+                    policy_props = policy['properties']
                     self.check_unsupported_key(policy_props,
                                                ALLOWED_SCALING_OBJECT_PROPS)
-                    scaling_obj.scaling_name = policy.name
+                    scaling_obj.scaling_name = policy['name']
                     scaling_obj.target_cpu_utilization_percentage = \
                         policy_props.get(
                             'target_cpu_utilization_percentage')
@@ -204,25 +214,27 @@ class Parser(object):
         """Find networks which VDU is attached based on vdu_name."""
         networks = []
         network_names = []
-        for node_template in tosca.nodetemplates:
-            if node_template.type_definition.is_derived_from(TACKER_CP):
+        for node_template in tosca['node_templates']:
+            if vnfd_model.is_derived_from(node_template, TACKER_CP):
                 match = False
                 links_to = None
                 binds_to = None
-                for rel, node in node_template.relationships.items():
-                    if not links_to and rel.is_derived_from(TOSCA_LINKS_TO):
-                        links_to = node
-                    elif not binds_to and rel.is_derived_from(TOSCA_BINDS_TO):
-                        binds_to = node
-                        if binds_to.name == vdu_name:
+                for rel in node_template['relationships']:
+                    if not links_to and vnfd_model.is_derived_from(
+                            rel, TOSCA_LINKS_TO):
+                        links_to = rel['target']
+                    elif not binds_to and vnfd_model.is_derived_from(
+                            rel, TOSCA_BINDS_TO):
+                        binds_to = rel['target']
+                        if binds_to == vdu_name:
                             match = True
                 if match:
-                    networks.append(links_to.name)
+                    networks.append(links_to)
 
-        for node_template in tosca.nodetemplates:
-            if node_template.type_definition.is_derived_from(TACKER_VL):
+        for node_template in tosca['node_templates']:
+            if vnfd_model.is_derived_from(node_template, TACKER_VL):
                 tosca_props = self.get_properties(node_template)
-                if node_template.name in networks:
+                if node_template['name'] in networks:
                     for key, value in tosca_props.items():
                         if key == 'network_name':
                             network_names.append(value)
@@ -242,14 +254,14 @@ class Parser(object):
     def check_mgmt_cp(self, tosca, vdu_name):
         """Check if management for connection point is enabled"""
         mgmt_connection_point = False
-        for nt in tosca.nodetemplates:
-            if nt.type_definition.is_derived_from(TACKER_CP):
-                mgmt = nt.get_property_value('management') or None
+        for nt in tosca['node_templates']:
+            if vnfd_model.is_derived_from(nt, TACKER_CP):
+                mgmt = nt['properties'].get('management') or None
                 if mgmt:
                     vdu = None
-                    for rel, node in nt.relationships.items():
-                        if rel.is_derived_from(TOSCA_BINDS_TO):
-                            vdu = node.name
+                    for rel in nt['relationships']:
+                        if vnfd_model.is_derived_from(rel, TOSCA_BINDS_TO):
+                            vdu = rel['target']
                             break
                     if vdu == vdu_name:
                         mgmt_connection_point = True
@@ -260,11 +272,11 @@ class Parser(object):
     def get_properties(self, node_template):
         """Return a list of property node template objects."""
         tosca_props = {}
-        for prop in node_template.get_properties_objects():
-            if isinstance(prop.value, GetInput):
-                tosca_props[prop.name] = {'get_param': prop.value.input_name}
+        for name, value in node_template['properties'].items():
+            if isinstance(value, dict) and list(value) == ['get_input']:
+                tosca_props[name] = {'get_param': value['get_input']}
             else:
-                tosca_props[prop.name] = prop.value
+                tosca_props[name] = value
         return tosca_props
 
     def check_unsupported_key(self, input_values, support_key):
@@ -13,14 +13,30 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import eventlet
 from kubernetes import client
 from oslo_config import cfg
 from oslo_log import log as logging
 import toscaparser.utils.yamlparser
 
+from tacker.extensions import vnfm
+
 LOG = logging.getLogger(__name__)
 CONF = cfg.CONF
 
+OPTS = [
+    cfg.IntOpt('api_concurrency',
+               default=8, min=1,
+               help=_("Maximum number of Kubernetes objects of a VNF "
+                      "created or deleted in parallel")),
+]
+
+CONF.register_opts(OPTS, group='kubernetes_vim')
+
+
+def config_opts():
+    return [('kubernetes_vim', OPTS)]
+
 YAML_LOADER = toscaparser.utils.yamlparser.load_yaml
 NEWLINE_CHARACTER = "\n"
 COLON_CHARACTER = ':'
@@ -29,6 +45,40 @@ NON_WHITE_SPACE_CHARACTER = ''
 HYPHEN_CHARACTER = '-'
 DASH_CHARACTER = '_'
 
+# kinds of objects created one tier after the other, as the objects of a
+# tier may use the ones of the previous tiers, and deleted in reverse order
+CREATE_TIERS = (('ConfigMap',),
+                ('Deployment',),
+                ('Service', 'HorizontalPodAutoscaler'))
+
+
+def run_tiers(tiers, action, stop_on_failure=False):
+    """Call action on the items of tiers, one tier after the other.
+
+    The items of a tier are handled in parallel. Return the list of the
+    items done and the list of (item, exception) of the failed ones. The
+    tiers following a failed one are skipped if stop_on_failure is set.
+    """
+    pool = eventlet.GreenPool(CONF.kubernetes_vim.api_concurrency)
+
+    def run(item):
+        try:
+            action(item)
+        except Exception as e:
+            return e
+
+    done = []
+    failures = []
+    for tier in tiers:
+        for item, error in zip(tier, pool.imap(run, tier)):
+            if error is None:
+                done.append(item)
+            else:
+                failures.append((item, error))
+        if failures and stop_on_failure:
+            break
+    return done, failures
+
 
 class Transformer(object):
     """Transform TOSCA template to Kubernetes resources"""
@@ -85,41 +135,30 @@ class Transformer(object):
     def deploy(self, kubernetes_objects):
         """Deploy Kubernetes objects on Kubernetes VIM and return
 
-        a list name of services
+        a list name of services. If an object can not be created, the
+        objects created are deleted.
         """
 
         deployment_names = list()
         namespace = kubernetes_objects.get('namespace')
         k8s_objects = kubernetes_objects.get('objects')
 
-        for k8s_object in k8s_objects:
-            object_type = k8s_object.kind
+        tiers = [[k8s_object for k8s_object in k8s_objects
+                  if k8s_object.kind in kinds] for kinds in CREATE_TIERS]
+        created, failures = run_tiers(
+            tiers, lambda k8s_object: self.create_object(namespace,
+                                                         k8s_object),
+            stop_on_failure=True)
+        if failures:
+            self.delete_objects(
+                [(namespace, k8s_object.kind, k8s_object.metadata.name)
+                 for k8s_object in created])
+            raise vnfm.KubernetesObjectsCreateFailed(failures=', '.join(
+                '%s %s: %s' % (k8s_object.kind, k8s_object.metadata.name, e)
+                for k8s_object, e in failures))
 
-            if object_type == 'ConfigMap':
-                self.core_v1_api_client.create_namespaced_config_map(
-                    namespace=namespace,
-                    body=k8s_object)
-                LOG.debug('Successfully created ConfigMap %s',
-                          k8s_object.metadata.name)
-            elif object_type == 'Deployment':
-                self.extension_api_client.create_namespaced_deployment(
-                    namespace=namespace,
-                    body=k8s_object)
-                LOG.debug('Successfully created Deployment %s',
-                          k8s_object.metadata.name)
-            elif object_type == 'HorizontalPodAutoscaler':
-                self.scaling_api_client.\
-                    create_namespaced_horizontal_pod_autoscaler(
-                        namespace=namespace,
-                        body=k8s_object)
-                LOG.debug('Successfully created Horizontal Pod Autoscaler %s',
-                          k8s_object.metadata.name)
-            elif object_type == 'Service':
-                self.core_v1_api_client.create_namespaced_service(
-                    namespace=namespace,
-                    body=k8s_object)
-                LOG.debug('Successfully created Service %s',
-                          k8s_object.metadata.name)
+        for k8s_object in k8s_objects:
+            if k8s_object.kind == 'Service':
                 deployment_names.append(namespace)
                 deployment_names.append(k8s_object.metadata.name)
 
@@ -128,6 +167,83 @@ class Transformer(object):
         # namespace1,deployment1,namespace2,deployment2,namespace3,deployment3
         return ",".join(deployment_names)
 
+    def create_object(self, namespace, k8s_object):
+        object_type = k8s_object.kind
+
+        if object_type == 'ConfigMap':
+            self.core_v1_api_client.create_namespaced_config_map(
+                namespace=namespace,
+                body=k8s_object)
+            LOG.debug('Successfully created ConfigMap %s',
+                      k8s_object.metadata.name)
+        elif object_type == 'Deployment':
+            self.extension_api_client.create_namespaced_deployment(
+                namespace=namespace,
+                body=k8s_object)
+            LOG.debug('Successfully created Deployment %s',
+                      k8s_object.metadata.name)
+        elif object_type == 'HorizontalPodAutoscaler':
+            self.scaling_api_client.\
+                create_namespaced_horizontal_pod_autoscaler(
+                    namespace=namespace,
+                    body=k8s_object)
+            LOG.debug('Successfully created Horizontal Pod Autoscaler %s',
+                      k8s_object.metadata.name)
+        elif object_type == 'Service':
+            self.core_v1_api_client.create_namespaced_service(
+                namespace=namespace,
+                body=k8s_object)
+            LOG.debug('Successfully created Service %s',
+                      k8s_object.metadata.name)
+
+    def delete_objects(self, objects):
+        """Delete objects given as (namespace, kind, name), best effort.
+
+        Return the objects that could not be deleted with the exception.
+        """
+        tiers = [[obj for obj in objects if obj[1] in kinds]
+                 for kinds in reversed(CREATE_TIERS)]
+        deleted, failures = run_tiers(tiers, self._delete_object)
+        for (namespace, kind, name), e in failures:
+            LOG.debug('Failed to delete %(kind)s %(name)s in namespace '
+                      '%(namespace)s: %(error)s',
+                      {'kind': kind, 'name': name, 'namespace': namespace,
+                       'error': e})
+        return failures
+
+    def _delete_object(self, obj):
+        namespace, object_type, name = obj
+
+        if object_type == 'ConfigMap':
+            self.core_v1_api_client.delete_namespaced_config_map(
+                namespace=namespace,
+                name=name,
+                body={})
+            LOG.debug('Successfully deleted ConfigMap %s', name)
+        elif object_type == 'Deployment':
+            body = client.V1DeleteOptions(
+                propagation_policy='Foreground',
+                grace_period_seconds=5)
+            self.extension_api_client.delete_namespaced_deployment(
+                namespace=namespace,
+                name=name,
+                body=body)
+            LOG.debug('Successfully deleted Deployment %s', name)
+        elif object_type == 'HorizontalPodAutoscaler':
+            body = client.V1DeleteOptions()
+            self.scaling_api_client.\
+                delete_namespaced_horizontal_pod_autoscaler(
+                    namespace=namespace,
+                    name=name,
+                    body=body)
+            LOG.debug('Successfully deleted Horizon Pod Auto-Scaling %s',
+                      name)
+        elif object_type == 'Service':
+            self.core_v1_api_client.delete_namespaced_service(
+                namespace=namespace,
+                name=name)
+            LOG.debug('Successfully deleted Service %s', name)
+
     # config_labels configures label
     def config_labels(self, deployment_name=None, scaling_name=None):
         label = dict()
@@ -16,7 +16,7 @@
 import time
 import yaml
 
-from kubernetes import client
+import eventlet
 from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_serialization import jsonutils
@@ -26,6 +26,8 @@ from tacker.common import log
 from tacker.common import utils
 from tacker.extensions import vnfm
 from tacker.vnfm.infra_drivers import abstract_driver
+from tacker.vnfm.infra_drivers.kubernetes.k8s import translate_outputs
+from tacker.vnfm.infra_drivers.kubernetes import pod_watcher
 from tacker.vnfm.infra_drivers.kubernetes import translate_template
 from tacker.vnfm.infra_drivers import scale_driver
 
@@ -121,36 +123,7 @@ class Kubernetes(abstract_driver.DeviceAbstractDriver,
                 self.kubernetes.get_core_v1_api_client(auth=auth_cred)
             deployment_info = vnf_id.split(COMMA_CHARACTER)
             mgmt_ips = dict()
-            pods_information = self._get_pods_information(
-                core_v1_api_client=core_v1_api_client,
-                deployment_info=deployment_info)
-            status = self._get_pod_status(pods_information)
-            stack_retries = self.STACK_RETRIES
-            error_reason = None
-            while status == 'Pending' and stack_retries > 0:
-                time.sleep(self.STACK_RETRY_WAIT)
-                pods_information = \
-                    self._get_pods_information(
-                        core_v1_api_client=core_v1_api_client,
-                        deployment_info=deployment_info)
-                status = self._get_pod_status(pods_information)
-                LOG.debug('status: %s', status)
-                stack_retries = stack_retries - 1
-
-            LOG.debug('VNF initializing status: %(service_name)s %(status)s',
-                      {'service_name': str(deployment_info), 'status': status})
-            if stack_retries == 0 and status != 'Running':
-                error_reason = _("Resource creation is not completed within"
-                                " {wait} seconds as creation of stack {stack}"
-                                " is not completed").format(
-                    wait=(self.STACK_RETRIES *
-                          self.STACK_RETRY_WAIT),
-                    stack=vnf_id)
-                LOG.warning("VNF Creation failed: %(reason)s",
-                            {'reason': error_reason})
-                raise vnfm.VNFCreateWaitFailed(reason=error_reason)
-            elif stack_retries != 0 and status != 'Running':
-                raise vnfm.VNFCreateWaitFailed(reason=error_reason)
+            self._wait_pods_running(auth_cred, deployment_info, vnf_id)
 
             for i in range(0, len(deployment_info), 2):
                 namespace = deployment_info[i]
@@ -170,19 +143,67 @@ class Kubernetes(abstract_driver.DeviceAbstractDriver,
         finally:
             self.clean_authenticate_vim(auth_cred, file_descriptor)
 
-    def _get_pods_information(self, core_v1_api_client, deployment_info):
-        """Get pod information"""
-        pods_information = list()
+    def _wait_pods(self, auth_cred, deployment_info, done, timeout):
+        """Wait for the pods of every deployment of a VNF
+
+        The pods are followed by the watch of their namespace, shared with
+        the other VNFs waited for there. done(deployment_names, pods) tells
+        whether the pods of the deployments of a namespace are ready.
+        Return the pods of all deployments, or None if they are not ready
+        within timeout seconds.
+        """
+        deadline = time.time() + timeout
+        namespaces = dict()
         for i in range(0, len(deployment_info), 2):
-            namespace = deployment_info[i]
-            deployment_name = deployment_info[i + 1]
-            respone = \
-                core_v1_api_client.list_namespaced_pod(namespace=namespace)
-            for item in respone.items:
-                if deployment_name in item.metadata.name:
-                    pods_information.append(item)
+            namespaces.setdefault(deployment_info[i], []).append(
+                deployment_info[i + 1])
+        pods_information = list()
+        for namespace, deployment_names in namespaces.items():
+            def _deployment_pods(pods, deployment_names=deployment_names):
+                return [pod for name, pod in pods.items()
+                        if any(deployment_name in name
+                               for deployment_name in deployment_names)]
+
+            def _ready(pods, deployment_names=deployment_names):
+                return done(deployment_names, _deployment_pods(pods))
+
+            wait = pod_watcher.wait_pods(auth_cred, namespace, _ready,
+                                         deadline - time.time())
+            if wait.timed_out:
+                return None
+            pods_information.extend(_deployment_pods(wait.pods))
         return pods_information
 
+    def _wait_pods_running(self, auth_cred, deployment_info, stack):
+        def _started(deployment_names, pods):
+            # a deployment without pods yet is still pending
+            return (all(any(deployment_name in pod.metadata.name
+                            for pod in pods)
+                        for deployment_name in deployment_names) and
+                    self._get_pod_status(pods) != 'Pending')
+
+        pods_information = self._wait_pods(
+            auth_cred, deployment_info, _started,
+            self.STACK_RETRIES * self.STACK_RETRY_WAIT)
+        if pods_information is None:
+            error_reason = _("Resource creation is not completed within"
+                             " {wait} seconds as creation of stack {stack}"
+                             " is not completed").format(
+                wait=(self.STACK_RETRIES *
+                      self.STACK_RETRY_WAIT),
+                stack=stack)
+            LOG.warning("VNF Creation failed: %(reason)s",
+                        {'reason': error_reason})
+            raise vnfm.VNFCreateWaitFailed(reason=error_reason)
+
+        status = self._get_pod_status(pods_information)
+        LOG.debug('VNF initializing status: %(service_name)s %(status)s',
+                  {'service_name': str(deployment_info), 'status': status})
+        if status != 'Running':
+            error_reason = _("Pods of stack {stack} are in status "
+                             "{status}").format(stack=stack, status=status)
+            raise vnfm.VNFCreateWaitFailed(reason=error_reason)
+
     def _get_pod_status(self, pods_information):
         pending_flag = False
         unknown_flag = False
@@ -276,58 +297,17 @@ class Kubernetes(abstract_driver.DeviceAbstractDriver,
                 auth=auth_cred)
             deployment_names = vnf_id.split(COMMA_CHARACTER)
 
-            for i in range(0, len(deployment_names), 2):
-                namespace = deployment_names[i]
-                deployment_name = deployment_names[i + 1]
-                # delete ConfigMap if it exists
-                try:
-                    body = {}
-                    core_v1_api_client.delete_namespaced_config_map(
-                        namespace=namespace,
-                        name=deployment_name,
-                        body=body)
-                    LOG.debug('Successfully deleted ConfigMap %s',
-                              deployment_name)
-                except Exception as e:
-                    LOG.debug(e)
-                    pass
-                # delete Service if it exists
-                try:
-                    core_v1_api_client.delete_namespaced_service(
-                        namespace=namespace,
-                        name=deployment_name)
-                    LOG.debug('Successfully deleted Service %s',
-                              deployment_name)
-                except Exception as e:
-                    LOG.debug(e)
-                    pass
-                # delete Horizon Pod Auto-scaling if it exists
-                try:
-                    body = client.V1DeleteOptions()
-                    scaling_api_client.\
-                        delete_namespaced_horizontal_pod_autoscaler(
-                            namespace=namespace,
-                            name=deployment_name,
-                            body=body)
-                    LOG.debug('Successfully deleted Horizon Pod Auto-Scaling'
-                              '%s', deployment_name)
-                except Exception as e:
-                    LOG.debug(e)
-                    pass
-                # delete Deployment if it exists
-                try:
-                    body = client.V1DeleteOptions(
-                        propagation_policy='Foreground',
-                        grace_period_seconds=5)
-                    extension_api_client.delete_namespaced_deployment(
-                        namespace=namespace,
-                        name=deployment_name,
-                        body=body)
-                    LOG.debug('Successfully deleted Deployment %s',
-                              deployment_name)
-                except Exception as e:
-                    LOG.debug(e)
-                    pass
+            # every object of a deployment is named after it, objects
+            # that do not exist are skipped
+            transformer = translate_outputs.Transformer(
+                core_v1_api_client=core_v1_api_client,
+                extension_api_client=extension_api_client,
+                scaling_api_client=scaling_api_client)
+            transformer.delete_objects(
+                [(deployment_names[i], kind, deployment_names[i + 1])
+                 for i in range(0, len(deployment_names), 2)
+                 for kinds in translate_outputs.CREATE_TIERS
+                 for kind in kinds])
         except Exception as e:
             LOG.error('Deleting VNF got an error due to %s', e)
             raise
@@ -354,6 +334,20 @@ class Kubernetes(abstract_driver.DeviceAbstractDriver,
                 auth=auth_cred)
 
             deployment_names = vnf_id.split(COMMA_CHARACTER)
+            # deployments are deleted in the foreground, after their pods,
+            # so only check the objects once the pods are gone
+            if self._wait_pods(auth_cred, deployment_names,
+                               lambda names, pods: not pods,
+                               self.STACK_RETRIES *
+                               self.STACK_RETRY_WAIT) is None:
+                error_reason = _("Resource cleanup for vnf is not completed"
+                                 " within {wait} seconds as deletion of the"
+                                 " pods of {vnf} is not completed").format(
+                    wait=(self.STACK_RETRIES *
+                          self.STACK_RETRY_WAIT),
+                    vnf=vnf_id)
+                LOG.warning(error_reason)
+                raise vnfm.VNFDeleteWaitFailed(reason=error_reason)
             keep_going = True
             stack_retries = self.STACK_RETRIES
             while keep_going and stack_retries > 0:
@@ -394,6 +388,7 @@ class Kubernetes(abstract_driver.DeviceAbstractDriver,
                 # If one of objects is still alive, keeps on waiting
                 if count > 0:
                     keep_going = True
+                    eventlet.sleep(self.STACK_RETRY_WAIT)
                 else:
                     keep_going = False
         except Exception as e:
@@ -472,44 +467,9 @@ class Kubernetes(abstract_driver.DeviceAbstractDriver,
         # initialize Kubernetes APIs
         auth_cred, file_descriptor = self._get_auth_creds(auth_attr)
         try:
-            core_v1_api_client = self.kubernetes.get_core_v1_api_client(
-                auth=auth_cred)
             deployment_info = policy['instance_id'].split(",")
-
-            pods_information = self._get_pods_information(
-                core_v1_api_client=core_v1_api_client,
-                deployment_info=deployment_info)
-            status = self._get_pod_status(pods_information)
-
-            stack_retries = self.STACK_RETRIES
-            error_reason = None
-            while status == 'Pending' and stack_retries > 0:
-                time.sleep(self.STACK_RETRY_WAIT)
-
-                pods_information = self._get_pods_information(
-                    core_v1_api_client=core_v1_api_client,
-                    deployment_info=deployment_info)
-                status = self._get_pod_status(pods_information)
-
-                # LOG.debug('status: %s', status)
-                stack_retries = stack_retries - 1
-
-            LOG.debug('VNF initializing status: %(service_name)s %(status)s',
-                      {'service_name': str(deployment_info), 'status': status})
-
-            if stack_retries == 0 and status != 'Running':
-                error_reason = _("Resource creation is not completed within"
-                                 " {wait} seconds as creation of stack {stack}"
-                                 " is not completed").format(
-                    wait=(self.STACK_RETRIES *
-                          self.STACK_RETRY_WAIT),
-                    stack=policy['instance_id'])
-                LOG.error("VNF Creation failed: %(reason)s",
-                          {'reason': error_reason})
-                raise vnfm.VNFCreateWaitFailed(reason=error_reason)
-
-            elif stack_retries != 0 and status != 'Running':
-                raise vnfm.VNFCreateWaitFailed(reason=error_reason)
+            self._wait_pods_running(auth_cred, deployment_info,
+                                    policy['instance_id'])
         except Exception as e:
             LOG.error('Scaling wait VNF got an error due to %s', e)
             raise
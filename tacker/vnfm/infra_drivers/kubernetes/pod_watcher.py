@@ -0,0 +1,223 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Shared pod watches of the Kubernetes VIMs.
+
+One green thread per VIM and namespace lists its pods once, then follows
+them with the watch API from the last resourceVersion seen, and checks
+the VNFs waiting on that namespace after every event.
+"""
+
+import hashlib
+import threading
+
+import eventlet
+from eventlet import event
+from kubernetes import watch
+from oslo_config import cfg
+from oslo_log import log as logging
+
+from tacker.common.container import kubernetes_utils
+
+
+LOG = logging.getLogger(__name__)
+OPTS = [
+    cfg.IntOpt('watch_timeout',
+               default=60, min=1,
+               help=_("Seconds a pod watch request is kept open before "
+                      "being renewed")),
+]
+cfg.CONF.register_opts(OPTS, group='kubernetes_vim')
+
+
+def config_opts():
+    return [('kubernetes_vim', OPTS)]
+
+
+class PodWait(object):
+    """Pending wait for the pods of a namespace to satisfy a predicate.
+
+    `pods` is the dict of pod name => pod the predicate held for, or the
+    last one known if `timed_out` is set.
+    """
+
+    def __init__(self, predicate):
+        self.predicate = predicate
+        self.pods = {}
+        self.timed_out = False
+        self._done = event.Event()
+
+    def check(self, pods):
+        if self._done.ready() or not self.predicate(pods):
+            return False
+        self.pods = dict(pods)
+        self._done.send()
+        return True
+
+    def expire(self, pods):
+        if not self._done.ready():
+            self.pods = dict(pods)
+            self.timed_out = True
+            self._done.send()
+
+    def result(self):
+        self._done.wait()
+        return self
+
+
+class PodWatcher(object):
+    """Follows the pods of one namespace while some VNF waits on them."""
+
+    def __init__(self, auth_attr, namespace):
+        self._auth_attr = dict(auth_attr)
+        self._namespace = namespace
+        self._pods = {}
+        self._resource_version = None
+        self._waits = set()
+        self._running = False
+        self._bookmarks = True
+
+    def wait(self, predicate, timeout, auth_attr=None):
+        """Wait until predicate(pods) holds, returning the PodWait."""
+        if auth_attr is not None:
+            self._auth_attr = dict(auth_attr)
+        wait = PodWait(predicate)
+        if self._resource_version is not None and wait.check(self._pods):
+            return wait
+        self._waits.add(wait)
+        timer = eventlet.spawn_after(timeout, self._expire, wait)
+        if not self._running:
+            self._running = True
+            eventlet.spawn_n(self._run)
+        try:
+            return wait.result()
+        finally:
+            timer.cancel()
+
+    def _expire(self, wait):
+        self._waits.discard(wait)
+        wait.expire(self._pods)
+
+    def _notify(self):
+        for wait in list(self._waits):
+            if wait.check(self._pods):
+                self._waits.discard(wait)
+
+    def _run(self):
+        kubernetes = kubernetes_utils.KubernetesHTTPAPI()
+        auth = dict(self._auth_attr)
+        # the CA file of the caller is removed once its call returns
+        auth.pop('ca_cert_file', None)
+        file_descriptor = None
+        try:
+            if auth.get('ssl_ca_cert') is not None:
+                file_descriptor, auth['ca_cert_file'] = \
+                    kubernetes.create_ca_cert_tmp_file(auth['ssl_ca_cert'])
+            core_v1_api_client = kubernetes.get_core_v1_api_client(auth=auth)
+            while self._waits:
+                try:
+                    if self._resource_version is None:
+                        self._list(core_v1_api_client)
+                    self._watch(core_v1_api_client)
+                except Exception:
+                    LOG.warning('Watch of the pods of namespace %s failed',
+                                self._namespace, exc_info=True)
+                    self._resource_version = None
+                    eventlet.sleep(1)
+        except Exception:
+            LOG.exception('Failed to watch the pods of namespace %s',
+                          self._namespace)
+        finally:
+            # the cache is stale as soon as the pods are not watched
+            self._resource_version = None
+            self._running = False
+            if file_descriptor is not None:
+                kubernetes.close_tmp_file(file_descriptor,
+                                          auth['ca_cert_file'])
+
+    def _list(self, core_v1_api_client):
+        response = core_v1_api_client.list_namespaced_pod(
+            namespace=self._namespace)
+        self._pods = dict((pod.metadata.name, pod) for pod in response.items)
+        self._resource_version = response.metadata.resource_version
+        self._notify()
+
+    def _watch(self, core_v1_api_client):
+        kwargs = {'namespace': self._namespace,
+                  'resource_version': self._resource_version,
+                  'timeout_seconds': cfg.CONF.kubernetes_vim.watch_timeout}
+        if self._bookmarks:
+            kwargs['allow_watch_bookmarks'] = True
+        pod_watch = watch.Watch()
+        try:
+            for pod_event in pod_watch.stream(
+                    core_v1_api_client.list_namespaced_pod, **kwargs):
+                if not self._handle(pod_event) or not self._waits:
+                    pod_watch.stop()
+                    return
+        except TypeError:
+            if not self._bookmarks:
+                raise
+            LOG.debug('The kubernetes client does not support watch '
+                      'bookmarks')
+            self._bookmarks = False
+
+    def _handle(self, pod_event):
+        """Apply a watch event, returning False if the watch must stop."""
+        event_type = pod_event['type']
+        if event_type == 'ERROR':
+            # mostly 410 Gone, the resourceVersion is too old
+            LOG.debug('Watch of the pods of namespace %(namespace)s '
+                      'ended: %(error)s',
+                      {'namespace': self._namespace,
+                       'error': pod_event.get('raw_object')})
+            self._resource_version = None
+            return False
+        pod = pod_event['object']
+        self._resource_version = pod.metadata.resource_version
+        if event_type == 'BOOKMARK':
+            return True
+        if event_type == 'DELETED':
+            self._pods.pop(pod.metadata.name, None)
+        else:
+            self._pods[pod.metadata.name] = pod
+        self._notify()
+        return True
+
+
+_watchers = {}
+_watchers_lock = threading.Lock()
+
+
+def _watcher_key(auth_attr, namespace):
+    # a watch only sees the pods its credentials are allowed to list
+    bearer_token = auth_attr.get('bearer_token')
+    if bearer_token is not None:
+        bearer_token = hashlib.sha256(
+            bearer_token.encode('utf-8')).hexdigest()
+    return (auth_attr['auth_url'], auth_attr.get('username'), bearer_token,
+            namespace)
+
+
+def wait_pods(auth_attr, namespace, predicate, timeout):
+    """Wait until predicate(pods) holds for the pods of a namespace.
+
+    :param predicate: called with the dict of pod name => pod of the
+        namespace after every change.
+    :return: the finished PodWait.
+    """
+    key = _watcher_key(auth_attr, namespace)
+    with _watchers_lock:
+        watcher = _watchers.get(key)
+        if watcher is None:
+            watcher = _watchers[key] = PodWatcher(auth_attr, namespace)
+    return watcher.wait(predicate, max(timeout, 0), auth_attr=auth_attr)
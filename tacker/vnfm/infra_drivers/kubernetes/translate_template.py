@@ -22,6 +22,7 @@ from toscaparser.utils import yamlparser
 from tacker.common import log
 from tacker.extensions import common_services as cs
 from tacker.extensions import vnfm
+from tacker.tosca import vnfd_model
 from tacker.vnfm.infra_drivers.kubernetes.k8s import translate_inputs
 from tacker.vnfm.infra_drivers.kubernetes.k8s import translate_outputs
 
@@ -44,7 +45,11 @@ class TOSCAToKubernetes(object):
         """Load TOSCA template and return tosca_kube_objects"""
 
         vnfd_dict = self.process_input()
-        parser = translate_inputs.Parser(vnfd_dict)
+        model = vnfd_model.load(self.vnf['vnfd'])
+        if model is not None and 'get_input' in str(model):
+            # inputs are substituted in the template, which is parsed again
+            model = None
+        parser = translate_inputs.Parser(vnfd_dict, model)
         return parser.loader()
 
     def deploy_kubernetes_objects(self):
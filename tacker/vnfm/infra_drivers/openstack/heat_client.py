@@ -11,14 +11,72 @@
 # under the License.
 
 import sys
+import threading
+import time
 
+from heatclient import client as heatclient
 from heatclient import exc as heatException
+from oslo_config import cfg
 from oslo_log import log as logging
 
 from tacker.common import clients
 from tacker.extensions import vnfm
 
 LOG = logging.getLogger(__name__)
+OPTS = [
+    cfg.IntOpt('resource_schema_ttl',
+               default=3600, min=0,
+               help=_("Number of seconds the Heat resource type schemas of "
+                      "a VIM are cached, 0 disables the cache")),
+]
+cfg.CONF.register_opts(OPTS, group='openstack_vim')
+
+
+def config_opts():
+    return [('openstack_vim', OPTS)]
+
+
+# (auth_url, region_name, resource_type) => (expiry time, schema)
+_schemas = {}
+_schemas_lock = threading.Lock()
+
+
+def get_resource_schema(resource_types, auth_url, region_name,
+                        resource_type, refresh=False):
+    """Return the schema of a resource type of the Heat of a VIM region.
+
+    The schema is fetched with `resource_types` and then cached for
+    resource_schema_ttl seconds, unless refresh is set.
+    """
+    key = (auth_url, region_name, resource_type)
+    ttl = cfg.CONF.openstack_vim.resource_schema_ttl
+    if ttl and not refresh:
+        with _schemas_lock:
+            cached = _schemas.get(key)
+        if cached is not None and cached[0] > time.time():
+            return cached[1]
+    schema = resource_types.get(resource_type)
+    if ttl:
+        with _schemas_lock:
+            _schemas[key] = (time.time() + ttl, schema)
+    return schema
+
+
+def load_resource_schemas(session, auth_url, region_name, resource_types):
+    """Fetch again the schemas of resource types of a VIM region."""
+    endpoint = session.get_endpoint(service_type='orchestration',
+                                    region_name=region_name)
+    heat = heatclient.Client('1', endpoint=endpoint, session=session)
+    for resource_type in resource_types:
+        get_resource_schema(heat.resource_types, auth_url, region_name,
+                            resource_type, refresh=True)
+
+
+def invalidate_resource_schemas(auth_url):
+    """Drop the cached resource type schemas of a VIM."""
+    with _schemas_lock:
+        for key in [key for key in _schemas if key[0] == auth_url]:
+            del _schemas[key]
 
 
 class HeatClient(object):
@@ -28,6 +86,8 @@ class HeatClient(object):
         self.stacks = self.heat.stacks
         self.resource_types = self.heat.resource_types
         self.resources = self.heat.resources
+        self.auth_url = auth_attr['auth_url']
+        self.region_name = region_name
 
     def create(self, fields):
         fields = fields.copy()
@@ -54,7 +114,8 @@ class HeatClient(object):
         return self.stacks.get(stack_id)
 
     def resource_attr_support(self, resource_name, property_name):
-        resource = self.resource_types.get(resource_name)
+        resource = get_resource_schema(self.resource_types, self.auth_url,
+                                       self.region_name, resource_name)
         return property_name in resource['attributes']
 
     def resource_get_list(self, stack_id, nested_depth=0):
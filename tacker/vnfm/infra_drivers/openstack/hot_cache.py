@@ -0,0 +1,140 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Cache of the HOT templates translated from VNFDs.
+
+A translation is keyed by a hash of everything it depends on, so VNFs
+created from the same VNFD with the same attributes reuse the templates
+translated for the first one. Entries are kept in a bounded in-memory
+LRU and, if a directory is configured, as JSON files shared by the
+processes of the host.
+"""
+
+import collections
+import copy
+import hashlib
+import os
+import tempfile
+import threading
+
+from oslo_config import cfg
+from oslo_log import log as logging
+from oslo_serialization import jsonutils
+
+from tacker.common import metrics
+
+
+LOG = logging.getLogger(__name__)
+OPTS = [
+    cfg.IntOpt('hot_cache_size',
+               default=128, min=0,
+               help=_("Maximum number of VNFD translations to HOT kept in "
+                      "memory, 0 disables the cache")),
+    cfg.StrOpt('hot_cache_dir',
+               help=_("Directory where VNFD translations to HOT are also "
+                      "stored, to be shared by the processes of the host")),
+]
+cfg.CONF.register_opts(OPTS, group='openstack_vim')
+
+LOOKUPS = metrics.counter(
+    'tacker_hot_cache_lookups_total',
+    'Lookups of VNFD translations to HOT by their result', ['result'])
+
+
+def config_opts():
+    return [('openstack_vim', OPTS)]
+
+
+def cache_key(*parts):
+    """Return the hex digest identifying a translation of `parts`."""
+    content = jsonutils.dumps(parts, sort_keys=True)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class HotCache(object):
+    """LRU of translations, with an optional on-disk tier.
+
+    Values must be serializable to JSON. They are copied in and out, so
+    callers may change them freely.
+    """
+
+    def __init__(self, max_size, cache_dir=None):
+        self._max_size = max_size
+        self._cache_dir = cache_dir
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self._cache_dir, key + '.json')
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.pop(key, None)
+            if value is not None:
+                self._entries[key] = value
+        if value is None and self._cache_dir:
+            try:
+                with open(self._path(key)) as f:
+                    value = jsonutils.load(f)
+            except (IOError, OSError, ValueError):
+                value = None
+            if value is not None:
+                self._put(key, copy.deepcopy(value))
+                LOOKUPS.inc(result='disk')
+                return value
+        LOOKUPS.inc(result='miss' if value is None else 'hit')
+        return copy.deepcopy(value)
+
+    def put(self, key, value):
+        value = copy.deepcopy(value)
+        self._put(key, value)
+        if self._cache_dir:
+            self._write(key, value)
+
+    def _put(self, key, value):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = value
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def _write(self, key, value):
+        tmp_path = None
+        try:
+            if not os.path.isdir(self._cache_dir):
+                os.makedirs(self._cache_dir, 0o700)
+            fd, tmp_path = tempfile.mkstemp(dir=self._cache_dir)
+            with os.fdopen(fd, 'w') as f:
+                jsonutils.dump(value, f)
+            # readers see either no file or a complete one
+            os.rename(tmp_path, self._path(key))
+        except (IOError, OSError, TypeError, ValueError):
+            LOG.warning('Failed to store translation %s in %s', key,
+                        self._cache_dir, exc_info=True)
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Return the translation cache of this process, or None if disabled."""
+    global _cache
+    if not cfg.CONF.openstack_vim.hot_cache_size:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = HotCache(cfg.CONF.openstack_vim.hot_cache_size,
+                              cfg.CONF.openstack_vim.hot_cache_dir)
+    return _cache
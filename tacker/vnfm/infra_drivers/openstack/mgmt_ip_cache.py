@@ -0,0 +1,75 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Cache of the management IPs of the members of scaling groups.
+
+A member is identified by the id of its nested stack, which is new for
+every member a scale creates, so after a scale only the new members of
+a group have to be read from Heat.
+"""
+
+import collections
+import threading
+
+from oslo_config import cfg
+
+
+OPTS = [
+    cfg.IntOpt('mgmt_ip_cache_size',
+               default=1024, min=0,
+               help=_("Maximum number of scaling group members whose "
+                      "management IPs are kept, 0 disables the cache")),
+]
+cfg.CONF.register_opts(OPTS, group='openstack_vim')
+
+
+def config_opts():
+    return [('openstack_vim', OPTS)]
+
+
+class MgmtIpCache(object):
+    """LRU of the management IPs of group members by member id."""
+
+    def __init__(self, max_size):
+        self._max_size = max_size
+        self._members = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, member_id):
+        with self._lock:
+            mgmt_ips = self._members.pop(member_id, None)
+            if mgmt_ips is None:
+                return None
+            self._members[member_id] = mgmt_ips
+        return dict(mgmt_ips)
+
+    def put(self, member_id, mgmt_ips):
+        with self._lock:
+            self._members.pop(member_id, None)
+            self._members[member_id] = dict(mgmt_ips)
+            while len(self._members) > self._max_size:
+                self._members.popitem(last=False)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Return the member cache of this process, or None if disabled."""
+    global _cache
+    if not cfg.CONF.openstack_vim.mgmt_ip_cache_size:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = MgmtIpCache(cfg.CONF.openstack_vim.mgmt_ip_cache_size)
+    return _cache
@@ -16,7 +16,6 @@
 
 import time
 
-from heatclient import exc as heatException
 from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_serialization import jsonutils
@@ -27,6 +26,8 @@ from tacker.common import utils
 from tacker.extensions import vnfm
 from tacker.vnfm.infra_drivers import abstract_driver
 from tacker.vnfm.infra_drivers.openstack import heat_client as hc
+from tacker.vnfm.infra_drivers.openstack import mgmt_ip_cache
+from tacker.vnfm.infra_drivers.openstack import stack_poller
 from tacker.vnfm.infra_drivers.openstack import translate_template
 from tacker.vnfm.infra_drivers import scale_driver
 
@@ -131,28 +132,15 @@ class OpenStack(abstract_driver.DeviceAbstractDriver,
             'region_name', None)
         heatclient = hc.HeatClient(auth_attr, region_name)
 
-        stack = heatclient.get(vnf_id)
-        status = stack.stack_status
-        stack_retries = self.STACK_RETRIES
-        error_reason = None
-        while status == 'CREATE_IN_PROGRESS' and stack_retries > 0:
-            time.sleep(self.STACK_RETRY_WAIT)
-            try:
-                stack = heatclient.get(vnf_id)
-            except Exception:
-                LOG.warning("VNF Instance setup may not have "
-                            "happened because Heat API request failed "
-                            "while waiting for the stack %(stack)s to be "
-                            "created", {'stack': vnf_id})
-                # continue to avoid temporary connection error to target
-                # VIM
-            status = stack.stack_status
-            LOG.debug('status: %s', status)
-            stack_retries = stack_retries - 1
+        wait = stack_poller.wait_stack(
+            auth_attr, region_name, vnf_id, 'CREATE_IN_PROGRESS',
+            self.STACK_RETRIES * self.STACK_RETRY_WAIT)
+        stack = wait.stack
+        status = stack.stack_status if stack else None
 
         LOG.debug('stack status: %(stack)s %(status)s',
                   {'stack': str(stack), 'status': status})
-        if stack_retries == 0 and status != 'CREATE_COMPLETE':
+        if wait.timed_out:
             error_reason = _("Resource creation is not completed within"
                            " {wait} seconds as creation of stack {stack}"
                            " is not completed").format(
@@ -163,7 +151,12 @@ class OpenStack(abstract_driver.DeviceAbstractDriver,
                         {'reason': error_reason})
             raise vnfm.VNFCreateWaitFailed(reason=error_reason)
 
-        elif stack_retries != 0 and status != 'CREATE_COMPLETE':
+        elif stack is None:
+            error_reason = _("Stack {stack} is not found").format(
+                stack=vnf_id)
+            raise vnfm.VNFCreateWaitFailed(reason=error_reason)
+
+        elif status != 'CREATE_COMPLETE':
             error_reason = stack.stack_status_reason
             raise vnfm.VNFCreateWaitFailed(reason=error_reason)
 
@@ -184,7 +177,8 @@ class OpenStack(abstract_driver.DeviceAbstractDriver,
                                                        vnf_id,
                                                        group_names)
         else:
-            mgmt_ips = _find_mgmt_ips(stack.outputs)
+            # stack summaries listed by the poller have no outputs
+            mgmt_ips = _find_mgmt_ips(heatclient.get(vnf_id).outputs)
 
         if mgmt_ips:
             vnf_dict['mgmt_url'] = jsonutils.dumps(mgmt_ips)
@@ -236,29 +230,15 @@ class OpenStack(abstract_driver.DeviceAbstractDriver,
     @log.log
     def delete_wait(self, plugin, context, vnf_id, auth_attr,
                     region_name=None):
-        heatclient = hc.HeatClient(auth_attr, region_name)
+        wait = stack_poller.wait_stack(
+            auth_attr, region_name, vnf_id, 'DELETE_IN_PROGRESS',
+            self.STACK_RETRIES * self.STACK_RETRY_WAIT)
+        if wait.stack is None and not wait.timed_out:
+            # the stack is already purged
+            return
+        status = wait.stack.stack_status if wait.stack else None
 
-        stack = heatclient.get(vnf_id)
-        status = stack.stack_status
-        error_reason = None
-        stack_retries = self.STACK_RETRIES
-        while (status == 'DELETE_IN_PROGRESS' and stack_retries > 0):
-            time.sleep(self.STACK_RETRY_WAIT)
-            try:
-                stack = heatclient.get(vnf_id)
-            except heatException.HTTPNotFound:
-                return
-            except Exception:
-                LOG.warning("VNF Instance cleanup may not have "
-                            "happened because Heat API request failed "
-                            "while waiting for the stack %(stack)s to be "
-                            "deleted", {'stack': vnf_id})
-                # Just like create wait, ignore the exception to
-                # avoid temporary connection error.
-            status = stack.stack_status
-            stack_retries = stack_retries - 1
-
-        if stack_retries == 0 and status != 'DELETE_COMPLETE':
+        if wait.timed_out:
             error_reason = _("Resource cleanup for vnf is"
                              " not completed within {wait} seconds as "
                              "deletion of Stack {stack} is "
@@ -267,7 +247,7 @@ class OpenStack(abstract_driver.DeviceAbstractDriver,
             LOG.warning(error_reason)
             raise vnfm.VNFDeleteWaitFailed(reason=error_reason)
 
-        if stack_retries != 0 and status != 'DELETE_COMPLETE':
+        if status != 'DELETE_COMPLETE':
             error_reason = _("VNF {vnf_id} deletion is not completed. "
                             "{stack_status}").format(vnf_id=vnf_id,
                             stack_status=status)
@@ -285,21 +265,38 @@ class OpenStack(abstract_driver.DeviceAbstractDriver,
 
             return mgmt_ips
 
+        cache = mgmt_ip_cache.get_cache()
+        # list the scale groups and their members at once
+        resources = heat_client.resource_get_list(instance_id, nested_depth=1)
+        group_ids = dict((rsc.resource_name, rsc.physical_resource_id)
+                         for rsc in resources
+                         if rsc.resource_name in group_names and
+                         not getattr(rsc, 'parent_resource', None))
+
         mgmt_ips = {}
-        for group_name in group_names:
-            # Get scale group
-            grp = heat_client.resource_get(instance_id, group_name)
-            for rsc in heat_client.resource_get_list(grp.physical_resource_id):
-                # Get list of resources in scale group
-                scale_rsc = heat_client.resource_get(grp.physical_resource_id,
+        for rsc in resources:
+            group_name = getattr(rsc, 'parent_resource', None)
+            if not group_name or not group_ids.get(group_name):
+                continue
+            member_ips = None
+            if cache is not None:
+                member_ips = cache.get(rsc.physical_resource_id)
+            if member_ips is None:
+                # Get the member of the scale group, only if it is new
+                scale_rsc = heat_client.resource_get(group_ids[group_name],
                                                      rsc.resource_name)
 
                 # findout the mgmt ips from attributes
-                for k, v in _find_mgmt_ips(scale_rsc.attributes).items():
-                    if k not in mgmt_ips:
-                        mgmt_ips[k] = [v]
-                    else:
-                        mgmt_ips[k].append(v)
+                member_ips = _find_mgmt_ips(scale_rsc.attributes)
+                if (cache is not None and
+                        rsc.resource_status.endswith('_COMPLETE')):
+                    cache.put(rsc.physical_resource_id, member_ips)
+
+            for k, v in member_ips.items():
+                if k not in mgmt_ips:
+                    mgmt_ips[k] = [v]
+                else:
+                    mgmt_ips[k].append(v)
 
         return mgmt_ips
 
@@ -0,0 +1,201 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Shared status poller of the Heat stacks being waited for.
+
+Instead of every waiting VNF getting its own stack in a loop, one green
+thread per VIM region lists the status of all the stacks waited for in
+that region with a few filtered stack-list calls per round.
+"""
+
+import threading
+import time
+
+import eventlet
+from eventlet import event
+from oslo_config import cfg
+from oslo_log import log as logging
+
+from tacker.vnfm.infra_drivers.openstack import heat_client as hc
+
+
+LOG = logging.getLogger(__name__)
+OPTS = [
+    cfg.IntOpt('stack_poll_min_interval',
+               default=2, min=1,
+               help=_("Shortest wait time (in seconds) between two polls "
+                      "of the stacks in progress. The wait time doubles "
+                      "up to stack_retry_wait while none of them changes")),
+    cfg.IntOpt('stack_poll_batch_size',
+               default=100, min=1,
+               help=_("Maximum number of stacks whose status is fetched "
+                      "by one stack-list call")),
+]
+cfg.CONF.register_opts(OPTS, group='openstack_vim')
+
+
+def config_opts():
+    return [('openstack_vim', OPTS)]
+
+
+class StackWait(object):
+    """Pending wait for a stack to leave an in progress status.
+
+    `stack` is the last stack summary fetched, None once the stack is not
+    found, and `timed_out` is set if it was still in progress at the
+    deadline.
+    """
+
+    def __init__(self, stack_id, in_progress_status, deadline):
+        self.stack_id = stack_id
+        self.in_progress_status = in_progress_status
+        self.deadline = deadline
+        self.stack = None
+        self.status = None
+        self.timed_out = False
+        self._done = event.Event()
+
+    def complete(self, stack):
+        self.stack = stack
+        self._done.send(stack)
+
+    def result(self):
+        """Wait for the stack, returning its last summary or None."""
+        return self._done.wait()
+
+
+class StackPoller(object):
+    """Polls the stacks waited for in one VIM region."""
+
+    def __init__(self, auth_attr, region_name):
+        self._auth_attr = auth_attr
+        self._region_name = region_name
+        self._heatclient = None
+        self._waits = set()
+        self._running = False
+
+    def watch(self, stack_id, in_progress_status, timeout, auth_attr=None):
+        """Start waiting for a stack, returning its StackWait."""
+        if auth_attr is not None and auth_attr != self._auth_attr:
+            self._auth_attr = auth_attr
+            self._heatclient = None
+        wait = StackWait(stack_id, in_progress_status, time.time() + timeout)
+        self._waits.add(wait)
+        if not self._running:
+            self._running = True
+            eventlet.spawn_n(self._run)
+        return wait
+
+    def _run(self):
+        min_interval = cfg.CONF.openstack_vim.stack_poll_min_interval
+        max_interval = max(min_interval,
+                           cfg.CONF.openstack_vim.stack_retry_wait)
+        interval = min_interval
+        try:
+            while self._waits:
+                eventlet.sleep(interval)
+                if self.poll():
+                    interval = min_interval
+                else:
+                    interval = min(interval * 2, max_interval)
+        finally:
+            self._running = False
+
+    def _list_stacks(self, stack_ids):
+        if self._heatclient is None:
+            self._heatclient = hc.HeatClient(self._auth_attr,
+                                             self._region_name)
+        batch_size = cfg.CONF.openstack_vim.stack_poll_batch_size
+        stacks = {}
+        for i in range(0, len(stack_ids), batch_size):
+            # deleted stacks are listed too, with their DELETE_COMPLETE
+            # status, until they are purged
+            for stack in self._heatclient.stacks.list(
+                    filters={'id': stack_ids[i:i + batch_size]},
+                    show_deleted=True):
+                stacks[stack.id] = stack
+        return stacks
+
+    def poll(self):
+        """Fetch the stacks waited for and complete the finished waits.
+
+        :return: True if a stack changed status since the previous poll.
+        """
+        waits = list(self._waits)
+        if not waits:
+            return False
+        try:
+            stacks = self._list_stacks(
+                sorted(set(wait.stack_id for wait in waits)))
+        except Exception:
+            # do not fail the waits on a temporary error of the Heat API,
+            # only at their deadline
+            LOG.warning("Failed to list the stacks in progress in region "
+                        "%(region)s", {'region': self._region_name},
+                        exc_info=True)
+            self._heatclient = None
+            stacks = None
+
+        changed = False
+        now = time.time()
+        for wait in waits:
+            if stacks is not None:
+                stack = stacks.get(wait.stack_id)
+                if stack is None:
+                    LOG.debug('stack %s is not found', wait.stack_id)
+                    self._finish(wait, None)
+                    changed = True
+                    continue
+                wait.stack = stack
+                if stack.stack_status != wait.status:
+                    LOG.debug('stack %(stack)s status: %(status)s',
+                              {'stack': wait.stack_id,
+                               'status': stack.stack_status})
+                    wait.status = stack.stack_status
+                    changed = True
+                if wait.status != wait.in_progress_status:
+                    self._finish(wait, stack)
+                    continue
+            if now >= wait.deadline:
+                wait.timed_out = True
+                self._finish(wait, wait.stack)
+        return changed
+
+    def _finish(self, wait, stack):
+        self._waits.discard(wait)
+        wait.complete(stack)
+
+
+_pollers = {}
+_pollers_lock = threading.Lock()
+
+
+def _poller_key(auth_attr, region_name):
+    return (auth_attr.get('auth_url'), auth_attr.get('project_id'),
+            auth_attr.get('project_name'), region_name)
+
+
+def wait_stack(auth_attr, region_name, stack_id, in_progress_status,
+               timeout):
+    """Wait until a stack leaves `in_progress_status`.
+
+    :return: the StackWait, once finished.
+    """
+    key = _poller_key(auth_attr, region_name)
+    with _pollers_lock:
+        poller = _pollers.get(key)
+        if poller is None:
+            poller = _pollers[key] = StackPoller(auth_attr, region_name)
+    wait = poller.watch(stack_id, in_progress_status, timeout,
+                        auth_attr=auth_attr)
+    wait.result()
+    return wait
@@ -22,6 +22,7 @@ from tacker.common import log
 from tacker.extensions import common_services as cs
 from tacker.extensions import vnfm
 from tacker.tosca import utils as toscautils
+from tacker.vnfm.infra_drivers.openstack import hot_cache
 
 
 LOG = logging.getLogger(__name__)
@@ -58,6 +59,9 @@ class TOSCAToHOT(object):
         self.heat_template_yaml = None
         self.monitoring_dict = None
         self.nested_resources = dict()
+        # vnf attributes set by the translation
+        self.hot_attributes = dict()
+        self.metadata = None
         self.fields = None
         self.STACK_FLAVOR_EXTRA = cfg.CONF.openstack_vim.flavor_extra_specs
         self.appmonitoring_dict = None
@@ -68,11 +72,26 @@ class TOSCAToHOT(object):
         self._get_vnfd()
         dev_attrs = self._update_fields()
 
-        vnfd_dict = yamlparser.simple_ordered_parse(self.vnfd_yaml)
-        LOG.debug('vnfd_dict %s', vnfd_dict)
         self._get_unsupported_resource_props(self.heatclient)
+        cache = hot_cache.get_cache()
+        translation = None
+        if cache is not None:
+            # the translation depends on the VNF attributes too, e.g. on
+            # its param_values and alarm urls
+            key = hot_cache.cache_key(
+                self.vnf['vnfd']['attributes'], self.vnf['attributes'],
+                self.STACK_FLAVOR_EXTRA, self.unsupported_props)
+            translation = cache.get(key)
+        if translation is None:
+            vnfd_dict = yamlparser.simple_ordered_parse(self.vnfd_yaml)
+            LOG.debug('vnfd_dict %s', vnfd_dict)
+            self._generate_hot_from_tosca(vnfd_dict, dev_attrs)
+            if cache is not None:
+                cache.put(key, self._get_translation())
+        else:
+            LOG.debug('Reusing the HOT translation %s', key)
+            self._set_translation(translation)
 
-        self._generate_hot_from_tosca(vnfd_dict, dev_attrs)
         self.fields['template'] = self.heat_template_yaml
         if not self.vnf['attributes'].get('heat_template'):
             self.vnf['attributes']['heat_template'] = self.fields['template']
@@ -83,6 +102,28 @@ class TOSCAToHOT(object):
             self.vnf['attributes']['app_monitoring_policy'] = \
                 jsonutils.dumps(self.appmonitoring_dict)
 
+    def _get_translation(self):
+        translation = {'heat_template': self.heat_template_yaml,
+                       'monitoring_policy': self.monitoring_dict,
+                       'app_monitoring_policy': self.appmonitoring_dict,
+                       'metadata': self.metadata,
+                       'vnf_attributes': self.hot_attributes,
+                       'nested_resources': self.nested_resources}
+        if self.nested_resources:
+            translation['files'] = self.fields['files']
+        return translation
+
+    def _set_translation(self, translation):
+        self.heat_template_yaml = translation['heat_template']
+        self.monitoring_dict = translation['monitoring_policy']
+        self.appmonitoring_dict = translation['app_monitoring_policy']
+        self.metadata = translation['metadata']
+        self.hot_attributes = translation['vnf_attributes']
+        self.nested_resources = translation['nested_resources']
+        if 'files' in translation:
+            self.fields['files'] = translation['files']
+        self.vnf['attributes'].update(self.hot_attributes)
+
     @log.log
     def _get_vnfd(self):
         self.attributes = self.vnf['vnfd']['attributes'].copy()
@@ -307,15 +348,16 @@ class TOSCAToHOT(object):
                 self.nested_resources, mgmt_ports, metadata,
                 res_tpl, self.unsupported_props)
             self.fields['files'] = nested_tpl
-            self.vnf['attributes'][nested_resource_name] =\
+            self.hot_attributes[nested_resource_name] =\
                 nested_tpl[nested_resource_name]
             mgmt_ports.clear()
 
         if scaling_policy_names:
             scaling_group_dict = toscautils.get_scaling_group_dict(
                 heat_template_yaml, scaling_policy_names)
-            self.vnf['attributes']['scaling_group_names'] =\
+            self.hot_attributes['scaling_group_names'] =\
                 jsonutils.dumps(scaling_group_dict)
+        self.vnf['attributes'].update(self.hot_attributes)
 
         heat_template_yaml = toscautils.post_process_heat_template(
             heat_template_yaml, mgmt_ports, metadata, alarm_resources,
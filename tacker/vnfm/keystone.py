@@ -44,14 +44,15 @@ class Keystone(object):
             raise
         return keystone_client.version
 
-    def get_session(self, auth_plugin, verify):
-        ses = session.Session(auth=auth_plugin, verify=verify)
+    def get_session(self, auth_plugin, verify, http_session=None):
+        ses = session.Session(auth=auth_plugin, verify=verify,
+                              session=http_session)
         return ses
 
     def get_endpoint(self, ses, service_type, region_name=None):
         return ses.get_endpoint(service_type, region_name)
 
-    def initialize_client(self, version, **kwargs):
+    def initialize_client(self, version, http_session=None, **kwargs):
         verify = 'True' == kwargs.pop('cert_verify', 'True') or False
         if version == 'v2.0':
             from keystoneclient.v2_0 import client
@@ -65,7 +66,8 @@ class Keystone(object):
                 auth_plugin = identity.v3.Token(**kwargs)
             else:
                 auth_plugin = identity.v3.Password(**kwargs)
-        ses = self.get_session(auth_plugin=auth_plugin, verify=verify)
+        ses = self.get_session(auth_plugin=auth_plugin, verify=verify,
+                               http_session=http_session)
         cli = client.Client(session=ses)
         return cli
 
@@ -15,7 +15,9 @@
 #    under the License.
 
 import ast
-import inspect
+import heapq
+import itertools
+import random
 import threading
 import time
 
@@ -23,11 +25,15 @@ from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_serialization import jsonutils
 from oslo_utils import timeutils
+from six.moves import queue
 
 from tacker.common import driver_manager
+from tacker.common import metrics
+from tacker.common import topics
 from tacker import context as t_context
-from tacker.db.common_services import common_services_db_plugin
+from tacker.db.common_services import event_sink
 from tacker.plugins.common import constants
+from tacker import service
 
 LOG = logging.getLogger(__name__)
 CONF = cfg.CONF
@@ -35,10 +41,64 @@ OPTS = [
     cfg.IntOpt('check_intvl',
                default=10,
                help=_("check interval for monitor")),
+    cfg.IntOpt('probe_workers',
+               default=16,
+               help=_("Number of worker threads running monitor probes "
+                      "concurrently")),
+    cfg.BoolOpt('partitioned',
+                default=False,
+                help=_("Split the monitored VNFs among the running tacker "
+                       "servers, so that each VNF is probed by one of them")),
+    cfg.IntOpt('member_timeout',
+               default=30,
+               help=_("Seconds after its last heartbeat at which a tacker "
+                      "server is no longer assigned VNFs to monitor")),
+    cfg.IntOpt('resync_interval',
+               default=60,
+               help=_("Seconds between two loads of the VNFs assigned to "
+                      "this tacker server when monitoring is partitioned")),
+    cfg.IntOpt('max_check_intvl',
+               default=0,
+               help=_("Longest interval a VDU passing its checks is probed "
+                      "at, its interval doubles after every passed check "
+                      "from check_intvl up to this value. Values not "
+                      "greater than check_intvl disable the stretching")),
+    cfg.IntOpt('min_check_intvl',
+               default=1,
+               help=_("Interval a VDU is probed at after its check result "
+                      "changed, until the new result is confirmed")),
+    cfg.IntOpt('confirm_count',
+               default=1, min=1,
+               help=_("Number of consecutive probes that must return the "
+                      "same result before the monitoring actions for that "
+                      "result are run")),
+    cfg.IntOpt('restore_page_size',
+               default=500,
+               help=_("Number of VNFs read per database query when "
+                      "restoring the monitored VNFs on start")),
 ]
 CONF.register_opts(OPTS, group='monitor')
 
 
+PROBE_SECONDS = metrics.histogram(
+    'tacker_monitor_probe_seconds',
+    'Duration of VNF monitor driver calls', ['driver'])
+PROBES = metrics.counter(
+    'tacker_monitor_probes_total',
+    'VNF monitor driver calls by their result', ['driver', 'result'])
+PROBE_LAG_SECONDS = metrics.histogram(
+    'tacker_monitor_probe_lag_seconds',
+    'Delay between the time a probe was due and the time it started')
+SWEEP_SECONDS = metrics.histogram(
+    'tacker_monitor_sweep_seconds',
+    'Duration of handing the probes due at once to the probe workers')
+MONITORED_VNFS = metrics.gauge(
+    'tacker_monitor_vnfs', 'Number of VNFs monitored by this process')
+SCHEDULED_PROBES = metrics.gauge(
+    'tacker_monitor_scheduled_probes',
+    'Number of probes waiting for their due time')
+
+
 def config_opts():
     return [('monitor', OPTS),
             ('tacker', VNFMonitor.OPTS),
@@ -47,13 +107,65 @@ def config_opts():
 
 
 def _log_monitor_events(context, vnf_dict, evt_details):
-    _cos_db_plg = common_services_db_plugin.CommonServicesPluginDb()
-    _cos_db_plg.create_event(context, res_id=vnf_dict['id'],
-                             res_type=constants.RES_TYPE_VNF,
-                             res_state=vnf_dict['status'],
-                             evt_type=constants.RES_EVT_MONITOR,
-                             tstamp=timeutils.utcnow(),
-                             details=evt_details)
+    event_sink.get_sink().create_event(context, res_id=vnf_dict['id'],
+                                       res_type=constants.RES_TYPE_VNF,
+                                       res_state=vnf_dict['status'],
+                                       evt_type=constants.RES_EVT_MONITOR,
+                                       tstamp=timeutils.utcnow(),
+                                       details=evt_details)
+
+
+class ProbeState(object):
+    """Adapts the probe interval of a VDU to its recent results.
+
+    A result is either None for a passed check or the driver return for
+    which actions are defined. A new result is probed again at the fast
+    interval until confirm_count probes returned it, only then are its
+    actions run. The interval of a VDU passing its checks doubles up to
+    the ceiling.
+    """
+
+    def __init__(self):
+        self.confirmed = None
+        self.candidate = None
+        self.count = 0
+        self.interval = None
+
+    def update(self, result, base_intvl, fast_intvl, max_intvl,
+               confirm_count):
+        """Record a probe result.
+
+        :return: (result whose actions must run or None, next interval)
+        """
+        if result != self.confirmed:
+            if result != self.candidate or self.count == 0:
+                self.candidate = result
+                self.count = 0
+            self.count += 1
+            if self.count < confirm_count:
+                self.interval = fast_intvl
+                return None, self.interval
+            self.confirmed = result
+            self.interval = base_intvl
+        elif self.count:
+            # the previous result was not confirmed
+            self.interval = base_intvl
+        elif result is None:
+            self.interval = min((self.interval or base_intvl) * 2, max_intvl)
+        else:
+            self.interval = base_intvl
+        self.candidate = None
+        self.count = 0
+        return result, self.interval
+
+
+class VNFMonitorPartition(service.Partition):
+    """Assigns monitored VNFs to live tacker servers."""
+
+    def __init__(self, member_timeout):
+        super(VNFMonitorPartition, self).__init__(topics.TOPIC_VNF_MONITOR,
+                                                  member_timeout)
+
 
 #实现vnf的监控
 class VNFMonitor(object):
@@ -63,6 +175,11 @@ class VNFMonitor(object):
     _hosting_vnfs = dict()   # vnf_id => dict of parameters
     _status_check_intvl = 0
     _lock = threading.RLock()
+    _wakeup = threading.Condition(_lock)
+    # heap of (due_at, seq, hosting_vnf, vdu, driver), one entry per probe
+    _schedule = []
+    _schedule_seq = itertools.count()
+    _partition = None
 
     OPTS = [
         cfg.ListOpt(
@@ -83,6 +200,10 @@ class VNFMonitor(object):
         self._monitor_manager = driver_manager.DriverManager(
             'tacker.tacker.monitor.drivers',
             cfg.CONF.tacker.monitor_driver)
+        self._monitor_methods = dict(
+            (method, self._monitor_manager.method(method))
+            for method in ('monitor_get_config', 'monitor_url',
+                           'monitor_call'))
 
         self.boot_wait = boot_wait
         if check_intvl is None:
@@ -92,16 +213,143 @@ class VNFMonitor(object):
         threading.Thread(target=self.__run__).start()
 
     def __run__(self):
+        workers = cfg.CONF.monitor.probe_workers
+        self._probe_queue = queue.Queue(maxsize=workers)
+        for _ in range(workers):
+            worker = threading.Thread(target=self._probe_worker)
+            worker.daemon = True
+            worker.start()
+
+        while(1):
+            due = self._pop_due_probes()
+            with SWEEP_SECONDS.time():
+                for entry in due:
+                    self._probe_queue.put(entry)
+
+    def start_loading(self, load_cb):
+        """Load the VNFs to monitor from the database in the background.
+
+        :param load_cb: called with an owns(vnf_id) predicate, it must add
+            the owned VNFs that are not monitored yet. It is called once on
+            start, and when monitoring is partitioned, again whenever the
+            VNFs assigned to this tacker server change and every
+            resync_interval.
+        """
+        if cfg.CONF.monitor.partitioned:
+            self._partition = VNFMonitorPartition(
+                cfg.CONF.monitor.member_timeout)
+            target = self._run_partition
+        else:
+            target = self._run_load
+        LOG.debug('Spawning VNF monitor loading thread')
+        threading.Thread(target=target, args=(load_cb,)).start()
+
+    def _run_load(self, load_cb):
+        try:
+            load_cb(self.owns)
+        except Exception:
+            LOG.exception('Failed to load the VNFs to monitor')
+
+    def _run_partition(self, load_cb):
+        loaded_at = None
         while(1):
-            time.sleep(self._status_check_intvl)
+            try:
+                changed = self._partition.refresh()
+                if changed:
+                    self._drop_unowned_vnfs()
+                if changed or loaded_at is None or (
+                        time.time() - loaded_at >=
+                        cfg.CONF.monitor.resync_interval):
+                    load_cb(self.owns)
+                    loaded_at = time.time()
+            except Exception:
+                LOG.exception('Failed to refresh VNF monitor partition')
+            time.sleep(cfg.CONF.report_interval)
+
+    def _drop_unowned_vnfs(self):
+        with self._lock:
+            for vnf_id in list(self._hosting_vnfs):
+                if not self.owns(vnf_id):
+                    LOG.debug('vnf %s is now monitored by another tacker '
+                              'server', vnf_id)
+                    del self._hosting_vnfs[vnf_id]
 
-            with self._lock:
-                for hosting_vnf in self._hosting_vnfs.values():
-                    if hosting_vnf.get('dead', False):
-                        LOG.debug('monitor skips dead vnf %s', hosting_vnf)
-                        continue
+    def owns(self, vnf_id):
+        return self._partition is None or self._partition.owns(vnf_id)
+
+    def is_monitored(self, vnf_id):
+        return vnf_id in self._hosting_vnfs
 
-                    self.run_monitor(hosting_vnf)
+    def _probe_worker(self):
+        while(1):
+            due_at, _seq, hosting_vnf, vdu, driver = self._probe_queue.get()
+            PROBE_LAG_SECONDS.observe(max(time.time() - due_at, 0))
+            interval = None
+            try:
+                if self._is_monitored(hosting_vnf):
+                    interval = self._probe(hosting_vnf, vdu, driver)
+            except Exception:
+                LOG.exception('monitor probe %(driver)s failed for vdu '
+                              '%(vdu)s of vnf %(vnf_id)s',
+                              {'driver': driver, 'vdu': vdu,
+                               'vnf_id': hosting_vnf['id']})
+            finally:
+                with self._lock:
+                    if self._is_monitored(hosting_vnf):
+                        if interval is None:
+                            params = self._probe_params(hosting_vnf, vdu,
+                                                        driver)
+                            interval = self._probe_interval(params)
+                        self._push_probe(time.time() + interval,
+                                         hosting_vnf, vdu, driver)
+
+    def _pop_due_probes(self):
+        with self._wakeup:
+            while(1):
+                now = time.time()
+                if self._schedule and self._schedule[0][0] <= now:
+                    break
+                if self._schedule:
+                    self._wakeup.wait(self._schedule[0][0] - now)
+                else:
+                    self._wakeup.wait(self._status_check_intvl)
+
+            due = []
+            while self._schedule and self._schedule[0][0] <= now:
+                entry = heapq.heappop(self._schedule)
+                hosting_vnf = entry[2]
+                if not self._is_monitored(hosting_vnf):
+                    LOG.debug('monitor drops probe of vnf %s',
+                              hosting_vnf['id'])
+                    continue
+                due.append(entry)
+            MONITORED_VNFS.set(len(self._hosting_vnfs))
+            SCHEDULED_PROBES.set(len(self._schedule))
+            return due
+
+    def _is_monitored(self, hosting_vnf):
+        # entries of a deleted or re-added vnf are dropped lazily
+        return (self._hosting_vnfs.get(hosting_vnf['id']) is hosting_vnf and
+                not hosting_vnf.get('dead', False))
+
+    def _push_probe(self, due_at, hosting_vnf, vdu, driver):
+        heapq.heappush(self._schedule,
+                       (due_at, next(self._schedule_seq),
+                        hosting_vnf, vdu, driver))
+        self._wakeup.notify()
+
+    def _schedule_probes(self, hosting_vnf, spread=None):
+        # a vnf already running is first probed at a random time within
+        # spread seconds instead of after its boot delay
+        now = time.time()
+        for vdu, policy in hosting_vnf['monitoring_policy']['vdus'].items():
+            for driver in policy.keys():
+                if spread is None:
+                    params = self._probe_params(hosting_vnf, vdu, driver)
+                    delay = self._probe_delay(hosting_vnf, params)
+                else:
+                    delay = random.uniform(0, spread)
+                self._push_probe(now + delay, hosting_vnf, vdu, driver)
 
     @staticmethod
     def to_hosting_vnf(vnf_dict, action_cb):
@@ -119,9 +367,15 @@ class VNFMonitor(object):
         LOG.debug('Adding host %(id)s, Mgmt IP %(ips)s',
                   {'id': new_vnf['id'],
                    'ips': new_vnf['management_ip_addresses']})
+        if not self.owns(new_vnf['id']):
+            LOG.debug('vnf %s is monitored by another tacker server',
+                      new_vnf['id'])
+            return
+
         new_vnf['boot_at'] = timeutils.utcnow()
         with self._lock:
             self._hosting_vnfs[new_vnf['id']] = new_vnf
+            self._schedule_probes(new_vnf)
 
         attrib_dict = new_vnf['vnf']['attributes']
         mon_policy_dict = attrib_dict['monitoring_policy']
@@ -130,70 +384,122 @@ class VNFMonitor(object):
         _log_monitor_events(t_context.get_admin_context(), new_vnf['vnf'],
                             evt_details)
 
+    def restore_hosting_vnfs(self, hosting_vnfs, spread=None):
+        """Monitor VNFs that are already running, e.g. after a restart.
+
+        `hosting_vnfs` may be a generator, it is consumed one VNF at a time.
+        The first probes are spread over `spread` seconds, the check
+        interval by default, so that they do not all run at once.
+        """
+        if spread is None:
+            spread = self._status_check_intvl
+        restored = 0
+        for hosting_vnf in hosting_vnfs:
+            hosting_vnf['boot_at'] = timeutils.utcnow()
+            with self._lock:
+                self._hosting_vnfs[hosting_vnf['id']] = hosting_vnf
+                self._schedule_probes(hosting_vnf, spread)
+            restored += 1
+        LOG.info('Restored monitoring of %d VNFs', restored)
+
     def delete_hosting_vnf(self, vnf_id):
         LOG.debug('deleting vnf_id %(vnf_id)s', {'vnf_id': vnf_id})
         with self._lock:
             hosting_vnf = self._hosting_vnfs.pop(vnf_id, None)
-            if hosting_vnf:
-                LOG.debug('deleting vnf_id %(vnf_id)s, Mgmt IP %(ips)s',
-                          {'vnf_id': vnf_id,
-                           'ips': hosting_vnf['management_ip_addresses']})
+        if hosting_vnf:
+            LOG.debug('deleting vnf_id %(vnf_id)s, Mgmt IP %(ips)s',
+                      {'vnf_id': vnf_id,
+                       'ips': hosting_vnf['management_ip_addresses']})
 
-    def run_monitor(self, hosting_vnf):
-        mgmt_ips = hosting_vnf['management_ip_addresses']
-        vdupolicies = hosting_vnf['monitoring_policy']['vdus']
+    @staticmethod
+    def _probe_params(hosting_vnf, vdu, driver):
+        policy = hosting_vnf['monitoring_policy']['vdus'][vdu][driver]
+        return policy.get('monitoring_params', {})
 
+    def _probe_delay(self, hosting_vnf, params):
         vnf_delay = hosting_vnf['monitoring_policy'].get(
             'monitoring_delay', self.boot_wait)
+        return params.get('monitoring_delay', vnf_delay)
+
+    def _probe_interval(self, params):
+        return params.get('monitoring_interval', self._status_check_intvl)
+
+    def _probe(self, hosting_vnf, vdu, driver):
+        policy = hosting_vnf['monitoring_policy']['vdus'][vdu][driver]
+        params = policy.get('monitoring_params', {})
+        actions = policy.get('actions', {})
+        if 'mgmt_ip' not in params:
+            params['mgmt_ip'] = hosting_vnf['management_ip_addresses'][vdu]
+
+        driver_return = self.monitor_call(driver,
+                                          hosting_vnf['vnf'],
+                                          params)
+
+        LOG.debug('driver_return %s', driver_return)
+
+        state = hosting_vnf.setdefault('probe_states', {}).get((vdu, driver))
+        if state is None:
+            state = hosting_vnf['probe_states'][(vdu, driver)] = ProbeState()
+        result = driver_return if driver_return in actions else None
+        base_intvl = self._probe_interval(params)
+        confirmed, interval = state.update(
+            result, base_intvl,
+            min(base_intvl, cfg.CONF.monitor.min_check_intvl),
+            max(base_intvl, cfg.CONF.monitor.max_check_intvl),
+            cfg.CONF.monitor.confirm_count)
+
+        if confirmed is not None:
+            if not self.owns(hosting_vnf['id']):
+                LOG.debug('vnf %s was assigned to another tacker server, '
+                          'skipping its actions', hosting_vnf['id'])
+                return interval
+            action = actions[confirmed]
+            hosting_vnf['action_cb'](action)
+        return interval
+
+    def run_monitor(self, hosting_vnf):
+        vdupolicies = hosting_vnf['monitoring_policy']['vdus']
 
         for vdu in vdupolicies.keys():
             if hosting_vnf.get('dead'):
                 return
 
-            policy = vdupolicies[vdu]
-            for driver in policy.keys():
-                params = policy[driver].get('monitoring_params', {})
-
-                vdu_delay = params.get('monitoring_delay', vnf_delay)
+            for driver in vdupolicies[vdu].keys():
+                params = self._probe_params(hosting_vnf, vdu, driver)
+                vdu_delay = self._probe_delay(hosting_vnf, params)
 
                 if not timeutils.is_older_than(
                     hosting_vnf['boot_at'],
                         vdu_delay):
                         continue
 
-                actions = policy[driver].get('actions', {})
-                if 'mgmt_ip' not in params:
-                    params['mgmt_ip'] = mgmt_ips[vdu]
-
-                driver_return = self.monitor_call(driver,
-                                                  hosting_vnf['vnf'],
-                                                  params)
-
-                LOG.debug('driver_return %s', driver_return)
-
-                if driver_return in actions:
-                    action = actions[driver_return]
-                    hosting_vnf['action_cb'](action)
+                self._probe(hosting_vnf, vdu, driver)
 
     def mark_dead(self, vnf_id):
         self._hosting_vnfs[vnf_id]['dead'] = True
 
-    def _invoke(self, driver, **kwargs):
-        method = inspect.stack()[1][3]
-        return self._monitor_manager.invoke(
-            driver, method, **kwargs)
+    def _invoke(self, method, driver, **kwargs):
+        return self._monitor_methods[method](driver, **kwargs)
 
     def monitor_get_config(self, vnf_dict):
         return self._invoke(
-            vnf_dict, monitor=self, vnf=vnf_dict)
+            'monitor_get_config', vnf_dict, monitor=self, vnf=vnf_dict)
 
     def monitor_url(self, vnf_dict):
         return self._invoke(
-            vnf_dict, monitor=self, vnf=vnf_dict)
+            'monitor_url', vnf_dict, monitor=self, vnf=vnf_dict)
 
     def monitor_call(self, driver, vnf_dict, kwargs):
-        return self._invoke(driver,
-                            vnf=vnf_dict, kwargs=kwargs)
+        result = 'error'
+        start = time.time()
+        try:
+            driver_return = self._invoke('monitor_call', driver,
+                                         vnf=vnf_dict, kwargs=kwargs)
+            result = driver_return or 'success'
+            return driver_return
+        finally:
+            PROBE_SECONDS.observe(time.time() - start, driver=driver)
+            PROBES.inc(driver=driver, result=result)
 
 
 class VNFAppMonitor(object):
@@ -211,6 +517,9 @@ class VNFAppMonitor(object):
         self._application_monitor_manager = driver_manager.DriverManager(
             'tacker.tacker.app_monitor.drivers',
             cfg.CONF.tacker.app_monitor_driver)
+        self._app_monitor_methods = {
+            'add_to_appmonitor':
+                self._application_monitor_manager.method('add_to_appmonitor')}
 
     def _create_app_monitoring_dict(self, dev_attrs, mgmt_url):
         app_policy = 'app_monitoring_policy'
@@ -227,16 +536,15 @@ class VNFAppMonitor(object):
         mgmt_url = vnf_dict['mgmt_url']
         return self._create_app_monitoring_dict(dev_attrs, mgmt_url)
 
-    def _invoke(self, driver, **kwargs):
-        method = inspect.stack()[1][3]
-        return self._application_monitor_manager.\
-            invoke(driver, method, **kwargs)
+    def _invoke(self, method, driver, **kwargs):
+        return self._app_monitor_methods[method](driver, **kwargs)
 
     def add_to_appmonitor(self, applicationvnfdict, vnf_dict):
         vdunode = applicationvnfdict['vdus'].keys()
         driver = applicationvnfdict['vdus'][vdunode[0]]['name']
         kwargs = applicationvnfdict
-        return self._invoke(driver, vnf=vnf_dict, kwargs=kwargs)
+        return self._invoke('add_to_appmonitor', driver, vnf=vnf_dict,
+                            kwargs=kwargs)
 
 
 class VNFAlarmMonitor(object):
@@ -255,6 +563,9 @@ class VNFAlarmMonitor(object):
         self._alarm_monitor_manager = driver_manager.DriverManager(
             'tacker.tacker.alarm_monitor.drivers',
             cfg.CONF.tacker.alarm_monitor_driver)
+        self._alarm_monitor_methods = dict(
+            (method, self._alarm_monitor_manager.method(method))
+            for method in ('call_alarm_url', 'process_alarm'))
 
     def update_vnf_with_alarm(self, plugin, context, vnf, policy_dict):
         triggers = policy_dict['triggers']
@@ -316,15 +627,13 @@ class VNFAlarmMonitor(object):
         driver = trigger_dict['event_type']['implementation']
         return self.process_alarm(driver, vnf, alarm_dict)
 
-    def _invoke(self, driver, **kwargs):
-        method = inspect.stack()[1][3]
-        return self._alarm_monitor_manager.invoke(
-            driver, method, **kwargs)
+    def _invoke(self, method, driver, **kwargs):
+        return self._alarm_monitor_methods[method](driver, **kwargs)
 
     def call_alarm_url(self, driver, vnf_dict, kwargs):
-        return self._invoke(driver,
+        return self._invoke('call_alarm_url', driver,
                             vnf=vnf_dict, kwargs=kwargs)
 
     def process_alarm(self, driver, vnf_dict, kwargs):
-        return self._invoke(driver,
+        return self._invoke('process_alarm', driver,
                             vnf=vnf_dict, kwargs=kwargs)
@@ -12,10 +12,12 @@
 #    under the License.
 #
 
+import threading
+import time
+
 from oslo_config import cfg
 from oslo_log import log as logging
-import six.moves.urllib.error as urlerr
-import six.moves.urllib.request as urlreq
+import requests
 
 from tacker.common import log
 from tacker.vnfm.monitor_drivers import abstract_driver
@@ -28,7 +30,17 @@ OPTS = [
     cfg.IntOpt('timeout', default=1,
                help=_('Number of seconds to wait for a response')),
     cfg.IntOpt('port', default=80,
-               help=_('HTTP port number to send request'))
+               help=_('HTTP port number to send request')),
+    cfg.IntOpt('max_concurrency', default=32,
+               help=_('Maximum number of HTTP probes in flight at once, '
+                      'also the number of kept-alive connections per '
+                      'host')),
+    cfg.FloatOpt('retry_backoff', default=0.5,
+                 help=_('Seconds to wait before the first retry, doubled '
+                        'after every further failed attempt')),
+    cfg.FloatOpt('max_retry_backoff', default=8.0,
+                 help=_('Maximum number of seconds to wait between two '
+                        'attempts'))
 ]
 cfg.CONF.register_opts(OPTS, 'monitor_http_ping')
 
@@ -37,7 +49,47 @@ def config_opts():
     return [('monitor_http_ping', OPTS)]
 
 
+class HTTPProber(object):
+    """Probes HTTP endpoints over kept-alive per host connections.
+
+    The number of requests in flight is capped across every thread using
+    the prober, and failed attempts are retried with exponential backoff.
+    """
+
+    def __init__(self, max_concurrency, backoff, max_backoff):
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=max_concurrency)
+        self._session.mount('http://', adapter)
+
+    def _get(self, url, timeout):
+        with self._slots:
+            response = self._session.get(url, timeout=timeout)
+            response.raise_for_status()
+
+    def probe(self, url, retry, timeout):
+        """Return True once `url` answers, False after `retry` failures."""
+        for retry_index in range(int(retry)):
+            if retry_index:
+                time.sleep(min(self._backoff * 2 ** (retry_index - 1),
+                               self._max_backoff))
+            try:
+                self._get(url, timeout)
+                return True
+            except requests.exceptions.RequestException as e:
+                LOG.warning('Unable to reach to the url %(url)s: %(e)s',
+                            {'url': url, 'e': e})
+        return False
+
+
 class VNFMonitorHTTPPing(abstract_driver.VNFMonitorAbstractDriver):
+    def __init__(self):
+        self._prober = HTTPProber(cfg.CONF.monitor_http_ping.max_concurrency,
+                                  cfg.CONF.monitor_http_ping.retry_backoff,
+                                  cfg.CONF.monitor_http_ping.max_retry_backoff)
+
     def get_type(self):
         return 'http_ping'
 
@@ -52,24 +104,21 @@ class VNFMonitorHTTPPing(abstract_driver.VNFMonitorAbstractDriver):
         return vnf.get('monitor_url', '')
 
     def _is_pingable(self, mgmt_ip='', retry=5, timeout=5, port=80, **kwargs):
-        """Checks whether the server is reachable by using urllib.
+        """Checks whether the server is reachable by using HTTP.
 
         Waits for connectivity for `timeout` seconds,
         and if connection refused, it will retry `retry`
-        times.
+        times with an increasing backoff. Connections to a server are kept
+        alive between checks.
         :param mgmt_ip: IP to check
         :param retry: times to reconnect if connection refused
         :param timeout: seconds to wait for connection
         :param port: port number to check connectivity
-        :return: bool - True or False depending on pingability.
+        :return: bool - True or string 'failure' depending on pingability.
         """
         url = 'http://' + mgmt_ip + ':' + str(port)
-        for retry_index in range(int(retry)):
-            try:
-                urlreq.urlopen(url, timeout=timeout)
-                return True
-            except urlerr.URLError:
-                LOG.warning('Unable to reach to the url %s', url)
+        if self._prober.probe(url, retry, timeout):
+            return True
         return 'failure'
 
     @log.log
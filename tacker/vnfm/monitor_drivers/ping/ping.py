@@ -14,7 +14,9 @@
 
 from oslo_config import cfg
 from oslo_log import log as logging
+from oslo_utils import netutils
 
+from tacker.agent.linux import icmp
 from tacker.agent.linux import utils as linux_utils
 from tacker.common import log
 from tacker.vnfm.monitor_drivers import abstract_driver
@@ -37,6 +39,10 @@ def config_opts():
 
 
 class VNFMonitorPing(abstract_driver.VNFMonitorAbstractDriver):
+    def __init__(self):
+        self._pinger = icmp.BatchPinger()
+        self._icmp_available = True
+
     def get_type(self):
         return 'ping'
 
@@ -50,16 +56,40 @@ class VNFMonitorPing(abstract_driver.VNFMonitorAbstractDriver):
         LOG.debug('monitor_url %s', vnf)
         return vnf.get('monitor_url', '')
 
+    def _icmp_ping(self, mgmt_ip, count, timeout, interval):
+        """Ping in-process, returning None if ICMP sockets are denied."""
+        try:
+            rtt = self._pinger.ping(mgmt_ip, count, timeout, interval)
+        except icmp.IcmpUnavailable as e:
+            LOG.warning('%s, falling back to the ping command', e)
+            self._icmp_available = False
+            return None
+
+        if rtt is None:
+            LOG.warning("Cannot ping ip address: %s", mgmt_ip)
+            return 'failure'
+        LOG.debug('ip address %(ip)s replied in %(rtt).3f seconds',
+                  {'ip': mgmt_ip, 'rtt': rtt})
+        return True
+
     def _is_pingable(self, mgmt_ip="", count=5, timeout=1, interval='0.2',
                      **kwargs):
         """Checks whether an IP address is reachable by pinging.
 
-        Use linux utils to execute the ping (ICMP ECHO) command.
+        IPv4 addresses are pinged in-process through an ICMP socket, batched
+        with the concurrent checks of other VDUs. Otherwise, or if opening
+        an ICMP socket is not permitted, linux utils is used to execute the
+        ping (ICMP ECHO) command.
         Sends 5 packets with an interval of 0.2 seconds and timeout of 1
         seconds. Runtime error implies unreachability else IP is pingable.
         :param ip: IP to check
         :return: bool - True or string 'failure' depending on pingability.
         """
+        if self._icmp_available and netutils.is_valid_ipv4(mgmt_ip):
+            result = self._icmp_ping(mgmt_ip, count, timeout, interval)
+            if result is not None:
+                return result
+
         ping_cmd = ['ping',
                     '-c', count,
                     '-W', timeout,
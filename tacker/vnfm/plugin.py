@@ -14,7 +14,6 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import inspect
 import six
 import yaml
 
@@ -29,12 +28,15 @@ from tacker.api.v1 import attributes
 from tacker.common import driver_manager
 from tacker.common import exceptions
 from tacker.common import utils
+from tacker import context as t_context
 from tacker.db.vnfm import vnfm_db
 from tacker.extensions import vnfm
 from tacker.plugins.common import constants
 from tacker.tosca import utils as toscautils
+from tacker.tosca import vnfd_model
 from tacker.vnfm.mgmt_drivers import constants as mgmt_constants
 from tacker.vnfm import monitor
+from tacker.vnfm import resource_cache
 from tacker.vnfm import vim_client
 
 
@@ -45,7 +47,8 @@ CONF = cfg.CONF
 def config_opts():
     return [('tacker', VNFMMgmtMixin.OPTS),
             ('tacker', VNFMPlugin.OPTS_INFRA_DRIVER),
-            ('tacker', VNFMPlugin.OPTS_POLICY_ACTION)]
+            ('tacker', VNFMPlugin.OPTS_POLICY_ACTION),
+            ('tacker', VNFMPlugin.OPTS_BULK)]
 
 
 class VNFMMgmtMixin(object):
@@ -60,54 +63,68 @@ class VNFMMgmtMixin(object):
     ]
     cfg.CONF.register_opts(OPTS, 'tacker')
 
+    _MGMT_METHODS = ('mgmt_create_pre', 'mgmt_create_post',
+                     'mgmt_update_pre', 'mgmt_update_post',
+                     'mgmt_delete_pre', 'mgmt_delete_post',
+                     'mgmt_get_config', 'mgmt_url', 'mgmt_call')
+
     def __init__(self):
         super(VNFMMgmtMixin, self).__init__()
         #实现vnf配置的管理
         self._mgmt_manager = driver_manager.DriverManager(
             'tacker.tacker.mgmt.drivers', cfg.CONF.tacker.mgmt_driver)
+        self._mgmt_methods = dict(
+            (method, self._mgmt_manager.method(method))
+            for method in self._MGMT_METHODS)
 
-    def _invoke(self, vnf_dict, **kwargs):
-        #取调用的方法名称
-        method = inspect.stack()[1][3]
-        return self._mgmt_manager.invoke(
-            self._mgmt_driver_name(vnf_dict), method, **kwargs)
+    def _invoke(self, method, vnf_dict, **kwargs):
+        return self._mgmt_methods[method](
+            self._mgmt_driver_name(vnf_dict), **kwargs)
 
     def mgmt_create_pre(self, context, vnf_dict):
         return self._invoke(
-            vnf_dict, plugin=self, context=context, vnf=vnf_dict)
+            'mgmt_create_pre', vnf_dict, plugin=self, context=context,
+            vnf=vnf_dict)
 
     def mgmt_create_post(self, context, vnf_dict):
         return self._invoke(
-            vnf_dict, plugin=self, context=context, vnf=vnf_dict)
+            'mgmt_create_post', vnf_dict, plugin=self, context=context,
+            vnf=vnf_dict)
 
     def mgmt_update_pre(self, context, vnf_dict):
         return self._invoke(
-            vnf_dict, plugin=self, context=context, vnf=vnf_dict)
+            'mgmt_update_pre', vnf_dict, plugin=self, context=context,
+            vnf=vnf_dict)
 
     def mgmt_update_post(self, context, vnf_dict):
         return self._invoke(
-            vnf_dict, plugin=self, context=context, vnf=vnf_dict)
+            'mgmt_update_post', vnf_dict, plugin=self, context=context,
+            vnf=vnf_dict)
 
     def mgmt_delete_pre(self, context, vnf_dict):
         return self._invoke(
-            vnf_dict, plugin=self, context=context, vnf=vnf_dict)
+            'mgmt_delete_pre', vnf_dict, plugin=self, context=context,
+            vnf=vnf_dict)
 
     def mgmt_delete_post(self, context, vnf_dict):
         return self._invoke(
-            vnf_dict, plugin=self, context=context, vnf=vnf_dict)
+            'mgmt_delete_post', vnf_dict, plugin=self, context=context,
+            vnf=vnf_dict)
 
     def mgmt_get_config(self, context, vnf_dict):
         return self._invoke(
-            vnf_dict, plugin=self, context=context, vnf=vnf_dict)
+            'mgmt_get_config', vnf_dict, plugin=self, context=context,
+            vnf=vnf_dict)
 
     def mgmt_url(self, context, vnf_dict):
         return self._invoke(
-            vnf_dict, plugin=self, context=context, vnf=vnf_dict)
+            'mgmt_url', vnf_dict, plugin=self, context=context,
+            vnf=vnf_dict)
 
     def mgmt_call(self, context, vnf_dict, kwargs):
         return self._invoke(
-            vnf_dict, plugin=self, context=context, vnf=vnf_dict,
-            kwargs=kwargs)
+            'mgmt_call', vnf_dict, plugin=self, context=context,
+            vnf=vnf_dict, kwargs=kwargs)
 
 #VNFM插件定义
 class VNFMPlugin(vnfm_db.VNFMPluginDb, VNFMMgmtMixin):
@@ -130,7 +147,16 @@ class VNFMPlugin(vnfm_db.VNFMPluginDb, VNFMMgmtMixin):
     ]
     cfg.CONF.register_opts(OPTS_POLICY_ACTION, 'tacker')
 
+    OPTS_BULK = [
+        cfg.IntOpt(
+            'create_vnf_bulk_concurrency', default=10, min=1,
+            help=_('Maximum number of VNF instances of a bulk request '
+                   'created in parallel')),
+    ]
+    cfg.CONF.register_opts(OPTS_BULK, 'tacker')
+
     supported_extension_aliases = ['vnfm']
+    __native_bulk_support = True
 
     def __init__(self):
         super(VNFMPlugin, self).__init__()
@@ -146,6 +172,7 @@ class VNFMPlugin(vnfm_db.VNFMPluginDb, VNFMMgmtMixin):
             cfg.CONF.tacker.policy_action)
         #vnf的几种监控驱动
         self._vnf_monitor = monitor.VNFMonitor(self.boot_wait)
+        self._vnf_monitor.start_loading(self._load_monitored_vnfs)
         self._vnf_alarm_monitor = monitor.VNFAlarmMonitor()
         self._vnf_app_monitor = monitor.VNFAppMonitor()
 
@@ -222,37 +249,62 @@ class VNFMPlugin(vnfm_db.VNFMPluginDb, VNFMMgmtMixin):
 
         vnfd_dict['mgmt_driver'] = toscautils.get_mgmt_driver(
             tosca)
+        # keep the parsed template to not parse it again for every vnf
+        vnfd_dict['model'] = vnfd_model.dumps(vnfd_model.build(tosca))
         LOG.debug('vnfd %s', vnfd)
 
+    def _to_hosting_vnf(self, context, vnf_dict, partial=False):
+        """Build the monitor entry of a vnf.
+
+        A partial vnf_dict only holds the fields needed for monitoring, the
+        whole vnf is then loaded when a policy action is first run. The
+        actions of a partial entry run with their own admin context, as
+        the entries restored together run in different probe workers.
+        """
+        def action_cb(action):
+            LOG.debug('policy action: %s', action)
+            action_context = (t_context.get_admin_context() if partial
+                              else context)
+            if hosting_vnf.pop('partial', False):
+                hosting_vnf['vnf'] = self.get_vnf(action_context,
+                                                  hosting_vnf['id'])
+            self._vnf_action.invoke(
+                action, 'execute_action', plugin=self,
+                context=action_context, vnf_dict=hosting_vnf['vnf'], args={})
+
+        hosting_vnf = self._vnf_monitor.to_hosting_vnf(vnf_dict, action_cb)
+        if partial:
+            hosting_vnf['partial'] = True
+        return hosting_vnf
+
     def add_vnf_to_monitor(self, context, vnf_dict):
         dev_attrs = vnf_dict['attributes']
         mgmt_url = vnf_dict['mgmt_url']
         if 'monitoring_policy' in dev_attrs and mgmt_url:
-            def action_cb(action):
-                LOG.debug('policy action: %s', action)
-                self._vnf_action.invoke(
-                    action, 'execute_action', plugin=self, context=context,
-                    vnf_dict=hosting_vnf['vnf'], args={})
-
-            hosting_vnf = self._vnf_monitor.to_hosting_vnf(
-                vnf_dict, action_cb)
+            hosting_vnf = self._to_hosting_vnf(context, vnf_dict)
             LOG.debug('hosting_vnf: %s', hosting_vnf)
             self._vnf_monitor.add_hosting_vnf(hosting_vnf)
 
+    def _load_monitored_vnfs(self, owns):
+        """Monitor the ACTIVE vnfs owned by this server, e.g. on restart."""
+        context = t_context.get_admin_context()
+        hosting_vnfs = (
+            self._to_hosting_vnf(context, vnf_dict, partial=True)
+            for vnf_dict in self.get_monitored_vnfs(
+                context, cfg.CONF.monitor.restore_page_size)
+            if (owns(vnf_dict['id']) and
+                not self._vnf_monitor.is_monitored(vnf_dict['id'])))
+        self._vnf_monitor.restore_hosting_vnfs(hosting_vnfs)
+
     def add_alarm_url_to_vnf(self, context, vnf_dict):
-        vnfd_yaml = vnf_dict['vnfd']['attributes'].get('vnfd', '')
-        vnfd_dict = yaml.safe_load(vnfd_yaml)
-        if vnfd_dict and vnfd_dict.get('tosca_definitions_version'):
-            polices = vnfd_dict['topology_template'].get('policies', [])
-            for policy_dict in polices:
-                name, policy = list(policy_dict.items())[0]
-                if policy['type'] in constants.POLICY_ALARMING:
-                    alarm_url =\
-                        self._vnf_alarm_monitor.update_vnf_with_alarm(
-                            self, context, vnf_dict, policy)
-                    vnf_dict['attributes']['alarming_policy'] = vnf_dict['id']
-                    vnf_dict['attributes'].update(alarm_url)
-                    break
+        for name, policy in vnfd_model.get_policies(vnf_dict['vnfd']):
+            if policy['type'] in constants.POLICY_ALARMING:
+                alarm_url =\
+                    self._vnf_alarm_monitor.update_vnf_with_alarm(
+                        self, context, vnf_dict, policy)
+                vnf_dict['attributes']['alarming_policy'] = vnf_dict['id']
+                vnf_dict['attributes'].update(alarm_url)
+                break
 
     def add_vnf_to_appmonitor(self, context, vnf_dict):
         appmonitor = self._vnf_app_monitor.create_app_dict(context, vnf_dict)
@@ -362,16 +414,13 @@ class VNFMPlugin(vnfm_db.VNFMPluginDb, VNFMMgmtMixin):
         vnf_dict['instance_id'] = instance_id
         return vnf_dict
 
-    #创建对应的vnf
-    def create_vnf(self, context, vnf):
-        vnf_info = vnf['vnf']
-        name = vnf_info['name']
-
+    def _create_inline_vnfd(self, context, vnf_info):
         # if vnfd_template specified, create vnfd from template
         # create template dictionary structure same as needed in create_vnfd()
         if vnf_info.get('vnfd_template'):
             #生成vnf名称
-            vnfd_name = utils.generate_resource_name(name, 'inline')
+            vnfd_name = utils.generate_resource_name(vnf_info['name'],
+                                                     'inline')
             vnfd = {'vnfd': {'attributes': {'vnfd': vnf_info['vnfd_template']},
                              'name': vnfd_name,
                              'template_source': 'inline',
@@ -379,8 +428,7 @@ class VNFMPlugin(vnfm_db.VNFMPluginDb, VNFMMgmtMixin):
             #将vnfd存入数据库，并返回其相应的id号
             vnf_info['vnfd_id'] = self.create_vnfd(context, vnfd).get('id')
 
-        #找此vnf对应的vim,及对应vim的认证方式
-        infra_driver, vim_auth = self._get_infra_driver(context, vnf_info)
+    def _check_infra_driver(self, infra_driver):
         if infra_driver not in self._vnf_manager:
             #对应的vim不存在
             LOG.debug('unknown vim driver '
@@ -389,7 +437,7 @@ class VNFMPlugin(vnfm_db.VNFMPluginDb, VNFMMgmtMixin):
                        'drivers': cfg.CONF.tacker.infra_driver})
             raise vnfm.InvalidInfraDriver(vim_name=infra_driver)
 
-        vnf_attributes = vnf_info['attributes']
+    def _dump_vnf_attributes(self, vnf_attributes):
         if vnf_attributes.get('param_values'):
             param = vnf_attributes['param_values']
             if isinstance(param, dict):
@@ -409,8 +457,8 @@ class VNFMPlugin(vnfm_db.VNFMPluginDb, VNFMMgmtMixin):
             else:
                 self._report_deprecated_yaml_str()
 
-        vnf_dict = self._create_vnf(context, vnf_info, vim_auth, infra_driver)
-
+    def _spawn_create_vnf_wait(self, context, vnf_dict, vim_auth,
+                               infra_driver):
         def create_vnf_wait():
             self._create_vnf_wait(context, vnf_dict, vim_auth, infra_driver)
 
@@ -421,8 +469,96 @@ class VNFMPlugin(vnfm_db.VNFMPluginDb, VNFMMgmtMixin):
                 self.add_vnf_to_monitor(context, vnf_dict)
             self.config_vnf(context, vnf_dict)
         self.spawn_n(create_vnf_wait)
+
+    #创建对应的vnf
+    def create_vnf(self, context, vnf):
+        vnf_info = vnf['vnf']
+        self._create_inline_vnfd(context, vnf_info)
+
+        #找此vnf对应的vim,及对应vim的认证方式
+        infra_driver, vim_auth = self._get_infra_driver(context, vnf_info)
+        self._check_infra_driver(infra_driver)
+        self._dump_vnf_attributes(vnf_info['attributes'])
+
+        vnf_dict = self._create_vnf(context, vnf_info, vim_auth, infra_driver)
+        self._spawn_create_vnf_wait(context, vnf_dict, vim_auth,
+                                    infra_driver)
         return vnf_dict
 
+    def create_vnf_bulk(self, context, vnf):
+        """Create the VNFs of a bulk request.
+
+        The VIM of the VNFs and its credentials are fetched once per VIM
+        and region, and the VNFs are inserted in one transaction. Their
+        instances are then created in parallel, by at most
+        create_vnf_bulk_concurrency green threads, once the first VNF of
+        every VNFD has been created and its translated template cached.
+        A VNF whose instance fails to be created is deleted and returned
+        in ERROR status with the reason, the others are created anyway.
+        """
+        vnf_infos = [item['vnf'] for item in vnf['vnfs']]
+        vims = {}
+        vnf_vims = []
+        for vnf_info in vnf_infos:
+            self._create_inline_vnfd(context, vnf_info)
+            region_name = vnf_info.setdefault('placement_attr', {}).get(
+                'region_name', None)
+            key = (vnf_info.get('vim_id'), region_name)
+            vim_res = vims.get(key)
+            if vim_res is None:
+                vim_res = vims[key] = self.get_vim(context, vnf_info)
+                self._check_infra_driver(vim_res['vim_type'])
+            else:
+                vnf_info['placement_attr']['vim_name'] = vim_res['vim_name']
+                vnf_info['vim_id'] = vim_res['vim_id']
+            vnf_vims.append(vim_res)
+            self._dump_vnf_attributes(vnf_info['attributes'])
+
+        vnf_dicts = self._create_vnfs_pre(context, vnf_infos)
+
+        def create_vnf(index):
+            # a database session is not shared by green threads
+            item_context = t_context.Context(
+                context.user_id, context.tenant_id, is_admin=context.is_admin,
+                roles=context.roles, timestamp=context.timestamp,
+                request_id=context.request_id,
+                tenant_name=context.tenant_name,
+                user_name=context.user_name, overwrite=False,
+                auth_token=context.auth_token)
+            vnf_dict = vnf_dicts[index]
+            infra_driver = vnf_vims[index]['vim_type']
+            vim_auth = dict(vnf_vims[index]['vim_auth'])
+            try:
+                created = self._create_vnf(item_context, vnf_dict, vim_auth,
+                                           infra_driver)
+            except Exception as e:
+                LOG.warning('Failed to create vnf %(vnf)s: %(error)s',
+                            {'vnf': vnf_dict['id'], 'error': e})
+                vnf_dict['status'] = constants.ERROR
+                vnf_dict['error_reason'] = six.text_type(e)
+                return vnf_dict
+            if created is None:
+                vnf_dict['status'] = constants.ERROR
+                return vnf_dict
+            self._spawn_create_vnf_wait(item_context, created, vim_auth,
+                                        infra_driver)
+            return created
+
+        # the first vnf of every vnfd is created before the others, which
+        # then reuse its translated template
+        first = {}
+        for index, vnf_dict in enumerate(vnf_dicts):
+            first.setdefault(vnf_dict['vnfd_id'], index)
+        leaders = sorted(first.values())
+        others = [index for index in range(len(vnf_dicts))
+                  if index not in leaders]
+        pool = eventlet.GreenPool(
+            cfg.CONF.tacker.create_vnf_bulk_concurrency)
+        results = {}
+        for indexes in (leaders, others):
+            results.update(zip(indexes, pool.imap(create_vnf, indexes)))
+        return [results[index] for index in range(len(vnf_dicts))]
+
     # not for wsgi, but for service to create hosting vnf
     # the vnf is NOT added to monitor.
     def create_vnf_sync(self, context, vnf):
@@ -698,29 +834,18 @@ class VNFMPlugin(vnfm_db.VNFMPluginDb, VNFMMgmtMixin):
     def get_vnf_policies(
             self, context, vnf_id, filters=None, fields=None):
         vnf = self.get_vnf(context, vnf_id)
-        vnfd_tmpl = yaml.safe_load(vnf['vnfd']['attributes']['vnfd'])
         policy_list = []
 
-        polices = vnfd_tmpl['topology_template'].get('policies', [])
-        for policy_dict in polices:
-            for name, policy in policy_dict.items():
-                def _add(policy):
-                    p = self._make_policy_dict(vnf, name, policy)
-                    p['name'] = name
-                    policy_list.append(p)
-
-                # Check for filters
-                if filters.get('name') or filters.get('type'):
-                    if name == filters.get('name'):
-                        _add(policy)
-                        break
-                    elif policy['type'] == filters.get('type'):
-                        _add(policy)
-                        break
-                    else:
-                        continue
-
-                _add(policy)
+        for name, policy in vnfd_model.get_policies(vnf['vnfd']):
+            # Check for filters
+            if filters.get('name') or filters.get('type'):
+                if (name != filters.get('name') and
+                        policy['type'] != filters.get('type')):
+                    continue
+
+            p = self._make_policy_dict(vnf, name, policy)
+            p['name'] = name
+            policy_list.append(p)
 
         return policy_list
 
@@ -873,10 +998,10 @@ class VNFMPlugin(vnfm_db.VNFMPluginDb, VNFMMgmtMixin):
         self._handle_vnf_monitoring(context, trigger_)
         return trigger['trigger']
 
-    def get_vnf_resources(self, context, vnf_id, fields=None, filters=None):
-        vnf_info = self.get_vnf(context, vnf_id)
-        infra_driver, vim_auth = self._get_infra_driver(context, vnf_info)
-        if vnf_info['status'] == constants.ACTIVE:
+    def _get_resources(self, context, vnf_info, infra_driver, vim_auth):
+        resources = resource_cache.get(vnf_info['id'],
+                                       vnf_info['instance_id'])
+        if resources is None:
             vnf_details = self._vnf_manager.invoke(infra_driver,
                                                    'get_resource_info',
                                                    plugin=self,
@@ -887,8 +1012,45 @@ class VNFMPlugin(vnfm_db.VNFMPluginDb, VNFMMgmtMixin):
                           'type': info.get('type'),
                           'id': info.get('id')}
                         for name, info in vnf_details.items()]
-            return resources
+            resource_cache.put(vnf_info['id'], vnf_info['instance_id'],
+                               resources)
+        return resources
+
+    def get_vnf_resources(self, context, vnf_id, fields=None, filters=None):
+        vnf_info = self.get_vnf(context, vnf_id)
+        if vnf_info['status'] == constants.ACTIVE:
+            resources = resource_cache.get(vnf_id, vnf_info['instance_id'])
+            if resources is not None:
+                return resources
+            infra_driver, vim_auth = self._get_infra_driver(context, vnf_info)
+            return self._get_resources(context, vnf_info, infra_driver,
+                                       vim_auth)
         # Raise exception when VNF.status != ACTIVE
         else:
             raise vnfm.VNFInactive(vnf_id=vnf_id,
                                    message=_(' Cannot fetch details'))
+
+    def get_vnfs_resources(self, context, vnf_ids):
+        """Return the resources of several VNFs by their id.
+
+        The VNFs are read in one query and their VIM is fetched once per
+        VIM and region. VNFs which are not ACTIVE are left out.
+        """
+        vnf_infos = self.get_vnfs(context, filters={'id': list(vnf_ids)})
+        vims = {}
+        vnfs_resources = {}
+        for vnf_info in vnf_infos:
+            if vnf_info['status'] != constants.ACTIVE:
+                continue
+            resources = resource_cache.get(vnf_info['id'],
+                                           vnf_info['instance_id'])
+            if resources is None:
+                key = (vnf_info['vim_id'], vnf_info.get(
+                    'placement_attr', {}).get('region_name'))
+                if key not in vims:
+                    vims[key] = self.get_vim(context, vnf_info)
+                resources = self._get_resources(
+                    context, vnf_info, vims[key]['vim_type'],
+                    vims[key]['vim_auth'])
+            vnfs_resources[vnf_info['id']] = resources
+        return vnfs_resources
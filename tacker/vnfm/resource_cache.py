@@ -0,0 +1,74 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Cache of the resources of VNFs as listed by their infra driver.
+
+A snapshot is kept per VNF and infra instance for a bounded time. It is
+dropped by the VNFM database whenever the status of the VNF changes,
+and is not used once the VNF has another infra instance, e.g. after a
+respawn done by another process.
+"""
+
+import copy
+import threading
+import time
+
+from oslo_config import cfg
+
+
+OPTS = [
+    cfg.IntOpt('vnf_resources_cache_ttl',
+               default=60, min=0,
+               help=_("Number of seconds the resources of an ACTIVE VNF "
+                      "listed by its infra driver are kept, 0 disables "
+                      "the cache")),
+]
+cfg.CONF.register_opts(OPTS, group='tacker')
+
+_snapshots = {}
+_snapshots_lock = threading.Lock()
+
+
+def config_opts():
+    return [('tacker', OPTS)]
+
+
+def get(vnf_id, instance_id):
+    """Return the cached resources of an infra instance of a VNF."""
+    with _snapshots_lock:
+        snapshot = _snapshots.get(vnf_id)
+        if snapshot is None:
+            return None
+        expiry, cached_instance_id, resources = snapshot
+        if expiry <= time.time() or cached_instance_id != instance_id:
+            del _snapshots[vnf_id]
+            return None
+    return copy.deepcopy(resources)
+
+
+def put(vnf_id, instance_id, resources):
+    ttl = cfg.CONF.tacker.vnf_resources_cache_ttl
+    if not ttl:
+        return
+    now = time.time()
+    with _snapshots_lock:
+        # drop the snapshots of the VNFs no longer looked up
+        for expired_id in [key for key, snapshot in _snapshots.items()
+                           if snapshot[0] <= now]:
+            del _snapshots[expired_id]
+        _snapshots[vnf_id] = (now + ttl, instance_id,
+                              copy.deepcopy(resources))
+
+
+def invalidate(vnf_id):
+    with _snapshots_lock:
+        _snapshots.pop(vnf_id, None)
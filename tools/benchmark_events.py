@@ -0,0 +1,163 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark the queries of the event history on a synthetic SQLite table.
+
+The events table is filled with synthetic events, then the usual queries
+of ``tacker event-list`` are timed, first without and then with the
+indexes of the events table, and a deep page is read both with OFFSET and
+after a (timestamp, id) marker.
+
+    python tools/benchmark_events.py --events 1000000
+"""
+
+from __future__ import print_function
+
+import argparse
+import datetime
+import os
+import random
+import tempfile
+import time
+import uuid
+
+import sqlalchemy as sa
+from sqlalchemy import orm
+
+from tacker.db.common_services import common_services_db
+from tacker.db import sqlalchemyutils
+
+Event = common_services_db.Event
+RESOURCE_TYPES = ('vnf', 'vnfd', 'vim', 'ns')
+EVENT_TYPES = ('CREATE', 'UPDATE', 'DELETE', 'MONITOR', 'SCALE')
+PAGE_SIZE = 50
+SORTS = [('timestamp', True), ('id', True)]
+
+
+def populate(engine, count, resources, batch_size=10000):
+    Event.__table__.create(engine)
+    for index in Event.__table__.indexes:
+        index.drop(engine)
+    resource_ids = [str(uuid.uuid4()) for _i in range(resources)]
+    timestamp = datetime.datetime(2018, 1, 1)
+    rows = []
+    for _i in range(count):
+        timestamp += datetime.timedelta(milliseconds=random.randint(1, 500))
+        rows.append({'resource_id': random.choice(resource_ids),
+                     'resource_type': random.choice(RESOURCE_TYPES),
+                     'resource_state': 'ACTIVE',
+                     'event_type': random.choice(EVENT_TYPES),
+                     'timestamp': timestamp,
+                     'event_details': ''})
+        if len(rows) == batch_size:
+            engine.execute(Event.__table__.insert(), rows)
+            rows = []
+    if rows:
+        engine.execute(Event.__table__.insert(), rows)
+    return resource_ids
+
+
+def timed(func, repeat):
+    start = time.time()
+    for _i in range(repeat):
+        func()
+    return (time.time() - start) / repeat * 1000
+
+
+def queries(session, resource_id, count):
+    since = session.query(sa.func.min(Event.timestamp)).scalar()
+    half = session.query(Event).order_by(Event.timestamp, Event.id).offset(
+        count // 2).first()
+
+    def by_resource():
+        return sqlalchemyutils.paginate_query(
+            session.query(Event).filter(Event.resource_id == resource_id),
+            Event, PAGE_SIZE, SORTS).all()
+
+    def by_type_since():
+        return sqlalchemyutils.paginate_query(
+            session.query(Event).filter(
+                Event.resource_type == 'vnf',
+                Event.event_type == 'MONITOR',
+                Event.timestamp >= since + datetime.timedelta(hours=12)),
+            Event, PAGE_SIZE, SORTS).all()
+
+    def deep_page_offset():
+        return session.query(Event).order_by(
+            Event.timestamp, Event.id).offset(count // 2).limit(
+                PAGE_SIZE).all()
+
+    def deep_page_keyset():
+        return sqlalchemyutils.paginate_query(
+            session.query(Event), Event, PAGE_SIZE, SORTS,
+            marker_obj=half).all()
+
+    return [('events of a resource', by_resource),
+            ('events of a type since a time', by_type_since),
+            ('middle page by offset', deep_page_offset),
+            ('middle page after a marker', deep_page_keyset)]
+
+
+def run(session, resource_id, count, repeat):
+    results = []
+    for name, query in queries(session, resource_id, count):
+        session.expunge_all()
+        results.append((name, timed(query, repeat)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--events', type=int, default=1000000,
+                        help='number of synthetic events')
+    parser.add_argument('--resources', type=int, default=10000,
+                        help='number of distinct resources of the events')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='number of runs of each query')
+    parser.add_argument('--db', help='SQLite file of the events table, '
+                                     'a temporary file by default')
+    parser.add_argument('--force', action='store_true',
+                        help='overwrite the file given by --db if it exists')
+    args = parser.parse_args()
+    if args.db and os.path.exists(args.db) and not args.force:
+        parser.error('%s exists, use --force to overwrite it' % args.db)
+
+    path = args.db or tempfile.mkstemp(suffix='.sqlite')[1]
+    if os.path.exists(path):
+        os.remove(path)
+    engine = sa.create_engine('sqlite:///%s' % path)
+    try:
+        start = time.time()
+        resource_ids = populate(engine, args.events, args.resources)
+        print('%d events inserted in %.1fs' %
+              (args.events, time.time() - start))
+        session = orm.sessionmaker(bind=engine)()
+        resource_id = random.choice(resource_ids)
+
+        without_indexes = run(session, resource_id, args.events,
+                              args.repeat)
+        for index in Event.__table__.indexes:
+            index.create(engine)
+        with_indexes = run(session, resource_id, args.events, args.repeat)
+
+        print('%-32s %14s %14s' % ('query (ms)', 'no indexes', 'indexes'))
+        for (name, before), (_name, after) in zip(without_indexes,
+                                                  with_indexes):
+            print('%-32s %14.2f %14.2f' % (name, before, after))
+    finally:
+        engine.dispose()
+        if not args.db:
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    main()